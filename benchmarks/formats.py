@@ -0,0 +1,44 @@
+"""
+Time the date and time parsers against dateutil.
+
+    python -m benchmarks.formats --number 100000
+"""
+
+import timeit
+from typing import Final
+
+import click
+
+from sqlalchemy_to_json_schema.utils.format import (
+    parse_date,
+    parse_date_with_dateutil,
+    parse_time,
+    parse_time_with_dateutil,
+)
+
+DATES: Final = ("2021-01-01", "20210101", "2021-02-29")
+TIMES: Final = ("12:34", "12:34:56.789", "12:34:56Z", "12:34:56.789+03:00", "12:34:56.789Z-03")
+
+
+@click.command()
+@click.option("--number", type=click.IntRange(min=1), default=10000)
+@click.option("--repeat", type=click.IntRange(min=1), default=5)
+def main(number: int, repeat: int) -> None:
+    cases = [
+        *((value, parse_date, parse_date_with_dateutil) for value in DATES),
+        *((value, parse_time, parse_time_with_dateutil) for value in TIMES),
+    ]
+
+    for value, parse, parse_with_dateutil in cases:
+        fast, slow = (
+            min(timeit.repeat(lambda: function(value), number=number, repeat=repeat)) / number
+            for function in (parse, parse_with_dateutil)
+        )
+
+        click.echo(
+            f"{value:<20} {fast * 1e6:8.2f} us {slow * 1e6:8.2f} us (dateutil) {slow / fast:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
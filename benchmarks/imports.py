@@ -0,0 +1,59 @@
+"""
+Time the CLI startup and list the heavy modules it loads.
+
+    python -m benchmarks.imports --repeat 10
+"""
+
+import statistics
+import subprocess  # nosec B404
+import sys
+import time
+from typing import Final
+
+import click
+
+HEAVY_MODULES: Final = ("sqlalchemy", "yaml", "orjson", "loguru", "dateutil", "cProfile")
+
+COMMANDS: Final = {
+    "import": ["-c", "import sqlalchemy_to_json_schema.command.main"],
+    "help": ["-m", "sqlalchemy_to_json_schema.command.main", "--help"],
+}
+
+
+def loaded_modules(args: list[str], /) -> set[str]:
+    # -X importtime writes one line per imported module on stderr.
+    # Only the current interpreter is run, with the fixed commands above
+    result = subprocess.run(  # nosec B603
+        [sys.executable, "-X", "importtime", *args], capture_output=True, text=True, check=True
+    )
+
+    return {
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+def time_command(args: list[str], /, *, repeat: int) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        subprocess.run([sys.executable, *args], capture_output=True, check=True)  # nosec B603
+        timings.append(time.perf_counter() - started_at)
+
+    return statistics.median(timings)
+
+
+@click.command()
+@click.option("--repeat", type=click.IntRange(min=1), default=5)
+def main(repeat: int) -> None:
+    for name, args in COMMANDS.items():
+        seconds = time_command(args, repeat=repeat)
+        heavy = sorted(set(HEAVY_MODULES) & loaded_modules(args))
+
+        click.echo(f"{name:<8} {seconds * 1000:10.1f} ms  heavy: {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compare the throughput of the serializer plans and a serializer inspecting each instance.
+
+    python -m benchmarks.instances --groups 100 --number 20
+"""
+
+import enum
+import timeit
+from datetime import date, datetime, time
+from typing import Any
+
+import click
+import sqlalchemy as sa
+import sqlalchemy.orm as orm
+from sqlalchemy.orm import declarative_base
+
+from sqlalchemy_to_json_schema.codegen import resolve_pointer
+from sqlalchemy_to_json_schema.schema_factory import Schema, SchemaFactory
+from sqlalchemy_to_json_schema.serialization import InstanceSerializer
+from sqlalchemy_to_json_schema.walkers import StructuralWalker
+
+Base = declarative_base()
+
+
+class Group(Base):
+    __tablename__ = "group"
+
+    pk = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(255), nullable=False)
+    color = sa.Column(sa.Enum("red", "green", "yellow", "blue"))
+    created_at = sa.Column(sa.DateTime)
+
+
+class User(Base):
+    __tablename__ = "user"
+
+    pk = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(255), nullable=False)
+    created_at = sa.Column(sa.DateTime)
+    group_id = sa.Column(sa.Integer, sa.ForeignKey(Group.pk))
+    group = orm.relationship(Group, backref="users")
+
+
+def make_groups(count: int, /) -> list[Group]:
+    return [
+        Group(
+            pk=index,
+            name=f"group {index}",
+            color="blue",
+            created_at=datetime(2021, 1, 1),
+            users=[
+                User(pk=index * 10 + user, name=f"user {user}", created_at=datetime(2021, 1, 2))
+                for user in range(10)
+            ],
+        )
+        for index in range(count)
+    ]
+
+
+def naive_serialize(instance: Any, schema: Schema, root: Schema) -> dict[str, Any]:
+    # Inspects the mapper and walks the schema again for each instance
+    mapper = sa.inspect(type(instance))
+    columns = {
+        str(column.name): prop.key for prop in mapper.column_attrs for column in prop.columns
+    }
+    data = {}
+
+    for name, subschema in schema["properties"].items():
+        value = getattr(instance, columns.get(name, name))
+        if value is None:
+            continue
+        elif "$ref" in subschema:
+            value = naive_serialize(value, resolve_pointer(root, subschema["$ref"]), root)
+        elif "$ref" in subschema.get("items", {}):
+            target = resolve_pointer(root, subschema["items"]["$ref"])
+            value = [naive_serialize(each, target, root) for each in value]
+        elif isinstance(value, (date, datetime, time)):
+            value = value.isoformat()
+        elif isinstance(value, enum.Enum):
+            value = value.name
+        data[name] = value
+
+    return data
+
+
+@click.command()
+@click.option("--groups", type=click.IntRange(min=1), default=100)
+@click.option("--number", type=click.IntRange(min=1), default=20)
+@click.option("--repeat", type=click.IntRange(min=1), default=5)
+def main(groups: int, number: int, repeat: int) -> None:
+    schema_factory = SchemaFactory(StructuralWalker)
+    serializer = InstanceSerializer(schema_factory)
+    schema = serializer.schema_factory(Group)
+    instances = make_groups(groups)
+
+    if serializer.serialize_many(instances) != [
+        naive_serialize(instance, schema, schema) for instance in instances
+    ]:
+        raise click.ClickException("The plans serialize the instances differently")
+
+    slow, fast = (
+        min(timeit.repeat(function, number=number, repeat=repeat)) / number
+        for function in (
+            lambda: [naive_serialize(instance, schema, schema) for instance in instances],
+            lambda: serializer.serialize_many(instances),
+        )
+    )
+
+    click.echo(
+        f"{groups} groups {fast * 1e3:8.2f} ms {slow * 1e3:8.2f} ms (naive) {slow / fast:6.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Synthetic declarative models for the benchmarks.
+
+The tables are linked by many-to-one relationships to the previous tables, each one
+with a one-to-many back reference when cycles are requested.
+"""
+
+import random
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Final
+
+import sqlalchemy as sa
+from sqlalchemy.ext.declarative import DeclarativeMeta
+from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+TYPE_FACTORIES: Final[Mapping[str, Callable[[], TypeEngine]]] = {
+    "integer": sa.Integer,
+    "biginteger": sa.BigInteger,
+    "string": lambda: sa.String(255),
+    "text": sa.Text,
+    "boolean": sa.Boolean,
+    "float": sa.Float,
+    "numeric": lambda: sa.Numeric(10, 2),
+    "date": sa.Date,
+    "datetime": sa.DateTime,
+    "time": sa.Time,
+    "enum": lambda: sa.Enum("red", "green", "blue", name="color"),
+    "json": sa.JSON,
+}
+
+DEFAULT_TYPE_MIX: Final = ("integer", "string", "boolean", "datetime", "numeric", "enum")
+
+
+@dataclass(frozen=True)
+class ModelGraph:
+    tables: int = 20
+    columns: int = 10
+    type_mix: Sequence[str] = DEFAULT_TYPE_MIX
+    decorator_depth: int = 0
+    fanout: int = 2
+    cycles: bool = True
+    seed: int = 0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "tables": self.tables,
+            "columns": self.columns,
+            "type_mix": list(self.type_mix),
+            "decorator_depth": self.decorator_depth,
+            "fanout": self.fanout,
+            "cycles": self.cycles,
+            "seed": self.seed,
+        }
+
+
+def make_decorated_type(type_factory: Callable[[], TypeEngine], depth: int, /) -> TypeEngine:
+    impl: TypeEngine | type[TypeEngine] = type_factory()
+
+    # Each level wraps the previous one, the classifier has to follow the whole chain
+    for level in range(depth):
+        impl = type(f"Decorated{level}", (TypeDecorator,), {"impl": impl, "cache_ok": True})
+
+    return impl() if isinstance(impl, type) else impl
+
+
+def generate_models(graph: ModelGraph, /) -> list[DeclarativeMeta]:
+    if unknown := set(graph.type_mix) - set(TYPE_FACTORIES):
+        raise ValueError(f"Unknown types: {sorted(unknown)}")
+
+    # Seeded for reproducible graphs, not for security
+    rng = random.Random(graph.seed)  # nosec B311
+    Base = declarative_base()
+    models = []
+
+    for index in range(graph.tables):
+        name = f"Table{index}"
+        attrs: dict[str, object] = {
+            "__tablename__": f"table{index}",
+            "pk": sa.Column(sa.Integer, primary_key=True, doc="primary key"),
+        }
+
+        for column in range(graph.columns):
+            type_factory = TYPE_FACTORIES[rng.choice(graph.type_mix)]
+            attrs[f"column{column}"] = sa.Column(
+                make_decorated_type(type_factory, graph.decorator_depth),
+                nullable=rng.random() < 0.5,
+            )
+
+        targets = rng.sample(range(index), min(graph.fanout, index))
+
+        for target in targets:
+            attrs[f"table{target}_id"] = sa.Column(
+                sa.Integer, sa.ForeignKey(f"table{target}.pk"), nullable=rng.random() < 0.5
+            )
+            attrs[f"table{target}"] = relationship(
+                f"Table{target}",
+                foreign_keys=f"{name}.table{target}_id",
+                backref=f"table{index}_set" if graph.cycles else None,
+            )
+
+        models.append(type(name, (Base,), attrs))
+
+    sa.orm.configure_mappers()
+
+    return models
+
+
+def generate_module(graph: ModelGraph, /, *, name: str = "synthetic_models") -> ModuleType:
+    module = ModuleType(name)
+
+    for model in generate_models(graph):
+        setattr(module, model.__name__, model)
+
+    return module
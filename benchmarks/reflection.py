@@ -0,0 +1,88 @@
+"""
+Compare the bulk reflection with automap on a SQLite database of many tables.
+
+    python -m benchmarks.reflection --tables 2000
+"""
+
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+import sqlalchemy as sa
+from sqlalchemy.ext.automap import automap_base
+
+from sqlalchemy_to_json_schema.reflection import reflect_schemas
+from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.tables import StructuralTableWalker, TableSchemaFactory
+from sqlalchemy_to_json_schema.walkers import StructuralWalker
+
+
+def create_database(engine: sa.Engine, tables: int, /) -> None:
+    # A tree of tables, automap reflects the referenced tables recursively and a long chain
+    # of foreign keys would exceed the recursion limit
+    with engine.begin() as connection:
+        for index in range(tables):
+            parent = f", parent_id INTEGER REFERENCES t{(index - 1) // 3} (id)" if index else ""
+            connection.exec_driver_sql(
+                f"CREATE TABLE t{index} (id INTEGER PRIMARY KEY, name VARCHAR(20) NOT NULL,"
+                f" created_at DATETIME{parent})"
+            )
+
+
+def automap_schemas(engine: sa.Engine, depth: int) -> dict[str, Any]:
+    Base = automap_base()
+    Base.prepare(autoload_with=engine)
+    schema_factory = SchemaFactory(StructuralWalker)
+
+    return {model.__table__.name: schema_factory(model, depth=depth) for model in Base.classes}
+
+
+def bulk_schemas(engine: sa.Engine, depth: int) -> dict[str, Any]:
+    return reflect_schemas(engine, TableSchemaFactory(StructuralTableWalker), depth=depth)
+
+
+def run(engine: sa.Engine, function: Callable[..., dict[str, Any]], depth: int) -> Any:
+    statements = 0
+
+    def count(*args: Any) -> None:
+        nonlocal statements
+        statements += 1
+
+    # A new engine each time, the dialect caches nothing between the runs
+    engine.dispose()
+    sa.event.listen(engine, "before_cursor_execute", count)
+    try:
+        start = time.perf_counter()
+        schemas = function(engine, depth)
+        elapsed = time.perf_counter() - start
+    finally:
+        sa.event.remove(engine, "before_cursor_execute", count)
+
+    return schemas, elapsed, statements
+
+
+@click.command()
+@click.option("--tables", type=click.IntRange(min=1), default=2000)
+@click.option("--depth", type=click.IntRange(min=0), default=2)
+def main(tables: int, depth: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = sa.create_engine(f"sqlite:///{Path(directory) / 'tables.db'}")
+        create_database(engine, tables)
+
+        automap, slow, slow_statements = run(engine, automap_schemas, depth)
+        bulk, fast, fast_statements = run(engine, bulk_schemas, depth)
+        engine.dispose()
+
+    if bulk != automap:
+        raise click.ClickException("The bulk reflection builds different schemas")
+
+    click.echo(f"{tables} tables")
+    click.echo(f"automap {slow:8.2f} s {slow_statements:8d} statements")
+    click.echo(f"bulk    {fast:8.2f} s {fast_statements:8d} statements {slow / fast:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
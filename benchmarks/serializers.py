@@ -0,0 +1,50 @@
+"""
+Time every serializer backend and style on a synthetic bundle.
+
+    python -m benchmarks.serializers --definitions 5000
+"""
+
+import timeit
+from typing import Any
+
+import click
+from loguru import logger
+
+from benchmarks.models import ModelGraph, generate_module
+from sqlalchemy_to_json_schema.command.serializers import SERIALIZER_MAP
+from sqlalchemy_to_json_schema.command.transformer import OpenAPI3Transformer
+from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.types import Backend, Style
+from sqlalchemy_to_json_schema.walkers import StructuralWalker
+
+
+def make_bundle(definitions: int, /) -> dict[str, Any]:
+    transformer = OpenAPI3Transformer(SchemaFactory(StructuralWalker))
+
+    return transformer.transform([generate_module(ModelGraph(tables=definitions))], 1)
+
+
+@click.command()
+@click.option("--definitions", type=click.IntRange(min=1), default=1000)
+@click.option("--repeat", type=click.IntRange(min=1), default=5)
+def main(definitions: int, repeat: int) -> None:
+    logger.remove()
+
+    bundle = make_bundle(definitions)
+
+    for backend in Backend:
+        serializer_factory = SERIALIZER_MAP[backend]
+
+        if not serializer_factory.is_available():
+            click.echo(f"{backend.value:<8} not available")
+            continue
+
+        for style in Style:
+            serializer = serializer_factory(style=style)
+            best = min(timeit.repeat(lambda: serializer.dumps(bundle), number=1, repeat=repeat))
+
+            click.echo(f"{backend.value:<8} {style.value:<8} {best * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
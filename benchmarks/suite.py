@@ -0,0 +1,230 @@
+"""
+Time and measure the peak memory of every walker, decision, layout and depth on a
+synthetic model graph, the results are written as JSON.
+
+    python -m benchmarks.suite --tables 100 --out results.json
+"""
+
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Optional
+
+import click
+import sqlalchemy
+from loguru import logger
+
+from benchmarks.models import (
+    DEFAULT_TYPE_MIX,
+    TYPE_FACTORIES,
+    ModelGraph,
+    generate_module,
+)
+from sqlalchemy_to_json_schema.command.driver import (
+    DECISION_MAP,
+    TRANSFORMER_MAP,
+    WALKER_MAP,
+)
+from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.types import Decision, Layout, Walker
+
+RESULTS_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Case:
+    walker: Walker
+    decision: Decision
+    layout: Layout
+    depth: Optional[int]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "walker": self.walker.value,
+            "decision": self.decision.value,
+            "layout": self.layout.value,
+            "depth": self.depth,
+        }
+
+
+def iter_cases(
+    walkers: Sequence[Walker],
+    decisions: Sequence[Decision],
+    layouts: Sequence[Layout],
+    depths: Sequence[Optional[int]],
+    /,
+) -> Iterator[Case]:
+    for walker in walkers:
+        for decision in decisions:
+            for layout in layouts:
+                for depth in depths:
+                    yield Case(walker, decision, layout, depth)
+
+
+def measure_peak_memory(fn: Callable[[], object], /) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def run_case(case: Case, module: ModuleType, /, *, repeat: int) -> dict[str, Any]:
+    def transform() -> object:
+        # A new factory for each run, only the mapper plans are shared between the runs
+        schema_factory = SchemaFactory(
+            WALKER_MAP[case.walker], relation_decision=DECISION_MAP[case.decision]()
+        )
+        transformer = TRANSFORMER_MAP[case.layout](schema_factory)
+
+        return transformer.transform([module], case.depth)
+
+    timings = timeit.repeat(transform, number=1, repeat=repeat)
+
+    return {
+        **case.as_dict(),
+        "seconds": {
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "max": max(timings),
+        },
+        "peak_memory_bytes": measure_peak_memory(transform),
+    }
+
+
+def get_version(package: str, /) -> Optional[str]:
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return None
+
+
+def run_suite(
+    graph: ModelGraph,
+    cases: Sequence[Case],
+    /,
+    *,
+    repeat: int = 3,
+) -> dict[str, Any]:
+    module = generate_module(graph)
+    results = []
+
+    for case in cases:
+        started_at = time.perf_counter()
+        results.append(run_case(case, module, repeat=repeat))
+        logger.info(
+            "{case} done in {elapsed:.2f}s",
+            case=case.as_dict(),
+            elapsed=time.perf_counter() - started_at,
+        )
+
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "sqlalchemy_to_json_schema": get_version("sqlalchemy-to-json-schema"),
+        },
+        "graph": graph.as_dict(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+@click.command()
+@click.option("--tables", type=click.IntRange(min=1), default=20)
+@click.option("--columns", type=click.IntRange(min=0), default=10)
+@click.option(
+    "--type",
+    "type_mix",
+    type=click.Choice(list(TYPE_FACTORIES)),
+    multiple=True,
+    default=DEFAULT_TYPE_MIX,
+)
+@click.option("--decorator-depth", type=click.IntRange(min=0), default=0)
+@click.option("--fanout", type=click.IntRange(min=0), default=2)
+@click.option("--cycles/--no-cycles", default=True)
+@click.option("--seed", type=int, default=0)
+@click.option(
+    "--walker", "walkers", type=click.Choice([walker.value for walker in Walker]), multiple=True
+)
+@click.option(
+    "--decision",
+    "decisions",
+    type=click.Choice([decision.value for decision in Decision]),
+    multiple=True,
+)
+@click.option(
+    "--layout", "layouts", type=click.Choice([layout.value for layout in Layout]), multiple=True
+)
+@click.option("--depth", "depths", type=click.IntRange(min=0), multiple=True)
+@click.option("--repeat", type=click.IntRange(min=1), default=3)
+@click.option(
+    "--out",
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=Path),
+)
+def main(
+    tables: int,
+    columns: int,
+    type_mix: Sequence[str],
+    decorator_depth: int,
+    fanout: int,
+    cycles: bool,
+    seed: int,
+    walkers: Sequence[str],
+    decisions: Sequence[str],
+    layouts: Sequence[str],
+    depths: Sequence[int],
+    repeat: int,
+    out: Optional[Path] = None,
+) -> None:
+    # The schema factory logs every walked model, it would be timed as well
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    graph = ModelGraph(
+        tables=tables,
+        columns=columns,
+        type_mix=tuple(type_mix),
+        decorator_depth=decorator_depth,
+        fanout=fanout,
+        cycles=cycles,
+        seed=seed,
+    )
+    cases = list(
+        iter_cases(
+            [Walker(walker) for walker in walkers] or list(Walker),
+            [Decision(decision) for decision in decisions] or list(Decision),
+            [Layout(layout) for layout in layouts] or list(Layout),
+            list(depths) or [None, 1, 2],
+        )
+    )
+
+    report = run_suite(graph, cases, repeat=repeat)
+
+    if out is None:
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with out.open("w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare the throughput of the jsonschema and the generated validators.
+
+    python -m benchmarks.validators --number 10000
+"""
+
+import timeit
+from typing import Any, Final
+
+import click
+import sqlalchemy as sa
+import sqlalchemy.orm as orm
+from jsonschema import Draft7Validator
+from sqlalchemy.orm import declarative_base
+
+from sqlalchemy_to_json_schema.codegen import compile_validators
+from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.validation import make_format_checker
+from sqlalchemy_to_json_schema.walkers import StructuralWalker
+
+Base = declarative_base()
+
+
+class Group(Base):
+    __tablename__ = "group"
+
+    pk = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(255), nullable=False)
+    color = sa.Column(sa.Enum("red", "green", "yellow", "blue"))
+    created_at = sa.Column(sa.DateTime)
+
+
+class User(Base):
+    __tablename__ = "user"
+
+    pk = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(255), nullable=False)
+    group_id = sa.Column(sa.Integer, sa.ForeignKey(Group.pk))
+    group = orm.relationship(Group, backref="users")
+
+
+PAYLOADS: Final[dict[str, Any]] = {
+    "valid": {
+        "pk": 1,
+        "name": "ravenclaw",
+        "color": "blue",
+        "users": [{"pk": index, "name": f"user {index}"} for index in range(10)],
+    },
+    "invalid": {"pk": "1", "color": "black", "users": [{"pk": 1, "name": 1}]},
+}
+
+
+@click.command()
+@click.option("--number", type=click.IntRange(min=1), default=10000)
+@click.option("--repeat", type=click.IntRange(min=1), default=5)
+def main(number: int, repeat: int) -> None:
+    schema = SchemaFactory(StructuralWalker)(Group)
+    jsonschema_validator = Draft7Validator(schema, format_checker=make_format_checker())
+    compiled_validator = compile_validators({"Group": schema})["Group"]
+
+    for name, payload in PAYLOADS.items():
+        slow, fast = (
+            min(timeit.repeat(lambda: function(payload), number=number, repeat=repeat)) / number
+            for function in (
+                lambda p: list(jsonschema_validator.iter_errors(p)),
+                compiled_validator,
+            )
+        )
+
+        click.echo(
+            f"{name:<8} {fast * 1e6:8.2f} us {slow * 1e6:8.2f} us (jsonschema) {slow / fast:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from contextlib import suppress
+from copy import deepcopy
+from hashlib import sha256
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Final
+
+from loguru import logger
+from sqlalchemy.ext.declarative import DeclarativeMeta
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import Mapper
+
+from sqlalchemy_to_json_schema.plans import get_mapper_plan
+from sqlalchemy_to_json_schema.schema_factory import Schema, SchemaFactory, pop_marker
+
+# Bump when the generated schemas change for the same models and options
+SCHEMA_CACHE_VERSION: Final = 1
+DEFAULT_SCHEMA_CACHE_SIZE: Final = 128
+DEFAULT_SCHEMA_CACHE_FILES: Final = 1024
+# The modification times of the files lag behind time.time(), down to 2 seconds on FAT
+MTIME_RESOLUTION: Final = 2.0
+
+
+def qualified_name(obj: Any, /) -> str:
+    cls = obj if isinstance(obj, type) else obj.__class__
+    name = getattr(obj, "__qualname__", cls.__qualname__)
+    module = getattr(obj, "__module__", cls.__module__)
+
+    return f"{module}.{name}"
+
+
+def iter_related_mappers(mapper: Mapper, /) -> Iterator[Mapper]:
+    seen = {mapper}
+    pending = [mapper]
+
+    while pending:
+        current = pending.pop()
+        yield current
+
+        for prop in get_mapper_plan(current).relationships:
+            if prop.mapper not in seen:
+                seen.add(prop.mapper)
+                pending.append(prop.mapper)
+
+
+class SchemaCache:
+    def __init__(
+        self,
+        *,
+        maxsize: int = DEFAULT_SCHEMA_CACHE_SIZE,
+        directory: Path | None = None,
+        max_files: int | None = DEFAULT_SCHEMA_CACHE_FILES,
+    ) -> None:
+        self.maxsize = maxsize
+        self.directory = directory
+        self.max_files = max_files
+        self._schemas: OrderedDict[str, Schema] = OrderedDict()
+        # The files read or written since then, also by the workers of the run, are not pruned
+        self._created_at = time.time() - MTIME_RESOLUTION
+
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def fingerprint(
+        self,
+        schema_factory: SchemaFactory,
+        model: DeclarativeMeta,
+        /,
+        *,
+        includes: Sequence[str] | None = None,
+        excludes: Sequence[str] | None = None,
+        overrides: dict | None = None,
+        depth: int | None = None,
+    ) -> str:
+        def default(value: Any) -> str:
+            return "<pop_marker>" if value is pop_marker else repr(value)
+
+        mapper = inspect(model).mapper
+        mappers = sorted(get_mapper_plan(m).fingerprint for m in iter_related_mappers(mapper))
+        classifier = schema_factory.classifier
+        restrictions = schema_factory.restrictions
+        description = (
+            SCHEMA_CACHE_VERSION,
+            qualified_name(mapper.class_),
+            mappers,
+            qualified_name(schema_factory.walker),
+            qualified_name(schema_factory.relation_decision),
+            qualified_name(schema_factory.child_factory),
+            schema_factory.child_factory.splitter,
+            (schema_factory.references.prefix, schema_factory.references.container),
+            (classifier.see_mro, classifier.see_impl),
+            sorted((qualified_name(k), v) for k, v in classifier.mapping.items()),
+            [
+                (qualified_name(k), qualified_name(v))
+                for restriction_dict in restrictions.restriction_set
+                for k, v in restriction_dict.items()
+            ],
+            None if includes is None else sorted(includes),
+            None if excludes is None else sorted(excludes),
+            json.dumps(overrides or {}, sort_keys=True, default=default),
+            depth,
+        )
+
+        return sha256(repr(description).encode()).hexdigest()
+
+    def get(self, key: str, /) -> Schema | None:
+        schema = self._schemas.get(key)
+
+        if schema is not None:
+            self._schemas.move_to_end(key)
+        else:
+            schema = self._load(key)
+            if schema is not None:
+                self._store(key, schema)
+
+        # Copy on read, the cached schema must not be changed by the callers
+        return None if schema is None else deepcopy(schema)
+
+    def set(self, key: str, schema: Schema, /) -> None:
+        self._store(key, deepcopy(schema))
+        self._dump(key, schema)
+
+    def clear(self) -> None:
+        self._schemas.clear()
+
+        if self.directory is not None:
+            for path in self.directory.glob("*.json"):
+                path.unlink()
+
+    def prune(self, *, max_files: int | None = None) -> None:
+        # Called once the schemas of a run are built. The least recently used files beyond
+        # the limit are removed, but not the ones of this run even if they are more
+        max_files = self.max_files if max_files is None else max_files
+        if self.directory is None or max_files is None:
+            return
+
+        used = 0
+        entries = []
+        for path in self.directory.glob("*.json"):
+            with suppress(FileNotFoundError):
+                mtime = path.stat().st_mtime
+                if mtime >= self._created_at:
+                    used += 1
+                else:
+                    entries.append((mtime, path))
+        entries.sort(reverse=True)
+
+        keep = max(max_files - used, 0)
+        for _, path in entries[keep:]:
+            with suppress(FileNotFoundError):
+                path.unlink()
+
+    def _store(self, key: str, schema: Schema, /) -> None:
+        self._schemas[key] = schema
+        self._schemas.move_to_end(key)
+
+        while len(self._schemas) > self.maxsize:
+            self._schemas.popitem(last=False)
+
+    def _load(self, key: str, /) -> Schema | None:
+        if self.directory is None:
+            return None
+
+        path = self.directory / f"{key}.json"
+        try:
+            with path.open() as f:
+                schema = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning("Ignoring the corrupted cache entry {key}", key=key)
+            return None
+
+        # The modification time orders the files by their last use for the pruning
+        with suppress(OSError):
+            path.touch()
+
+        return schema  # type: ignore[no-any-return]
+
+    def _dump(self, key: str, schema: Schema, /) -> None:
+        if self.directory is None:
+            return
+
+        try:
+            content = json.dumps(schema)
+        except (TypeError, ValueError):
+            logger.debug("Schema {key} is not JSON serializable, not written to disk", key=key)
+            return
+
+        # A schema which doesn't survive the round trip (i.e. tuples) must be rebuilt
+        # every time, otherwise the output would differ from a full build
+        if json.loads(content) != schema:
+            logger.debug("Schema {key} changes when loaded back, not written to disk", key=key)
+            return
+
+        # Written to a temporary file first so readers never see a partial entry
+        with NamedTemporaryFile("w", dir=self.directory, suffix=".tmp", delete=False) as f:
+            f.write(content)
+        os.replace(f.name, self.directory / f"{key}.json")
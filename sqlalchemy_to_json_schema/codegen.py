@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Final
+
+from jsonschema import Draft7Validator, FormatChecker
+from jsonschema.exceptions import ValidationError
+from sqlalchemy.ext.declarative import DeclarativeMeta
+
+from sqlalchemy_to_json_schema.schema_factory import Schema
+from sqlalchemy_to_json_schema.validation import ValidatorRegistry
+
+# (path, keyword, instance, expected) of a failed check
+Error = tuple[tuple[Any, ...], str, Any, Any]
+ValidateFunction = Callable[[Any], list[Error]]
+
+SUPPORTED_KEYWORDS: Final = frozenset(
+    {"$ref", "type", "properties", "required", "items", "maxLength", "enum", "format"}
+)
+# The other keywords (annotations, "relation") are ignored, like jsonschema does
+UNSUPPORTED_KEYWORDS: Final = frozenset(Draft7Validator.VALIDATORS) - SUPPORTED_KEYWORDS
+
+# Same semantics as the Draft 7 type checker
+TYPE_CHECKS: Final = {
+    "string": "isinstance({value}, str)",
+    "integer": (
+        "(isinstance({value}, int) and not isinstance({value}, bool)"
+        " or isinstance({value}, float) and {value}.is_integer())"
+    ),
+    "number": "(isinstance({value}, Number) and not isinstance({value}, bool))",
+    "boolean": "isinstance({value}, bool)",
+    "object": "isinstance({value}, dict)",
+    "array": "isinstance({value}, list)",
+    "null": "{value} is None",
+}
+
+HEADER: Final = """\
+# Generated by sqlalchemy_to_json_schema.codegen, do not edit
+from numbers import Number
+
+from sqlalchemy_to_json_schema.validation import make_format_checker
+
+# Replaced by the registry with its own format checker
+_FORMAT_CHECKER = make_format_checker()
+
+
+def _in_enum(value, enums):
+    # Same equality as jsonschema, booleans are not equal to 0 and 1
+    for each in enums:
+        if isinstance(value, str) or isinstance(each, str):
+            if value == each:
+                return True
+        elif isinstance(value, bool) == isinstance(each, bool) and value == each:
+            return True
+    return False
+"""
+
+
+def resolve_pointer(root: Schema, ref: str, /) -> Schema:
+    if not ref.startswith("#/"):
+        raise ValueError(f"Only local references are supported, got {ref}")
+
+    node: Any = root
+    for part in ref[2:].split("/"):
+        part = part.replace("~1", "/").replace("~0", "~")
+        if not isinstance(node, dict) or part not in node:
+            raise ValueError(f"Unresolvable reference {ref}")
+        node = node[part]
+
+    return node  # type: ignore[no-any-return]
+
+
+class SchemaCompiler:
+    def __init__(self) -> None:
+        self.constants: list[str] = []
+        self.functions: list[str] = []
+        self.entrypoints: list[str] = []
+        self._names: dict[str, str] = {}
+        self._pending: list[tuple[str, Schema, Schema]] = []
+        self._counter = 0
+
+    def add(self, name: str, schema: Schema, /, *, root: Schema | None = None) -> str:
+        function = f"validate_{name}"
+        if not function.isidentifier():
+            raise ValueError(f"Invalid validator name {name!r}")
+
+        check = self._check_function(schema, schema if root is None else root)
+
+        while self._pending:
+            self._compile_function(*self._pending.pop())
+
+        self.entrypoints.append(
+            f"def {function}(data):\n"
+            f"    errors = []\n"
+            f"    {check}(data, (), errors)\n"
+            f"    return errors\n"
+        )
+
+        return function
+
+    def source(self) -> str:
+        constants = "\n".join(self.constants) + "\n" if self.constants else ""
+        parts = [HEADER, constants, *self.functions, *self.entrypoints]
+
+        return "\n\n".join(part for part in parts if part)
+
+    def _check_function(self, schema: Schema, root: Schema, /) -> str:
+        # The same schema is compiled once, the references can be recursive
+        key = json.dumps([schema, root], sort_keys=True, default=repr)
+        if key not in self._names:
+            self._names[key] = f"_check_{len(self._names)}"
+            self._pending.append((self._names[key], schema, root))
+
+        return self._names[key]
+
+    def _compile_function(self, name: str, schema: Schema, root: Schema, /) -> None:
+        lines: list[str] = []
+        self._compile(lines, schema, root, "value", ["*path"], 1)
+
+        body = "\n".join(lines) if lines else "    pass"
+        self.functions.append(f"def {name}(value, path, errors):\n{body}\n")
+
+    def _constant(self, expression: str, /) -> str:
+        name = f"_CONSTANT_{len(self.constants)}"
+        self.constants.append(f"{name} = {expression}")
+
+        return name
+
+    def _variable(self, prefix: str, /) -> str:
+        self._counter += 1
+
+        return f"{prefix}_{self._counter}"
+
+    def _compile(
+        self,
+        lines: list[str],
+        schema: Schema,
+        root: Schema,
+        value: str,
+        path: list[str],
+        level: int,
+        /,
+    ) -> None:
+        indent = "    " * level
+        path_expression = "path" if path == ["*path"] else f"({', '.join(path)})"
+
+        def error(keyword: str, instance: str, expected: str) -> str:
+            return f"errors.append(({path_expression}, {keyword!r}, {instance}, {expected}))"
+
+        unsupported = UNSUPPORTED_KEYWORDS.intersection(schema) - {"$ref"}
+        if "$ref" in schema:
+            # The other keywords next to a reference are ignored in Draft 7
+            target = resolve_pointer(root, schema["$ref"])
+            function = self._check_function(target, root)
+            lines.append(f"{indent}{function}({value}, {path_expression}, errors)")
+            return
+        elif unsupported:
+            raise ValueError(f"Unsupported keywords {sorted(unsupported)}")
+
+        if "type" in schema:
+            types = [schema["type"]] if isinstance(schema["type"], str) else schema["type"]
+            condition = " or ".join(TYPE_CHECKS[type_].format(value=value) for type_ in types)
+            lines.append(f"{indent}if not ({condition}):")
+            lines.append(f"{indent}    {error('type', value, repr(schema['type']))}")
+
+        if "maxLength" in schema:
+            max_length = schema["maxLength"]
+            lines.append(f"{indent}if isinstance({value}, str) and len({value}) > {max_length!r}:")
+            lines.append(f"{indent}    {error('maxLength', value, repr(max_length))}")
+
+        if "enum" in schema:
+            enums = schema["enum"]
+            if all(isinstance(each, str) for each in enums):
+                # Only a string can be equal to a string, a set lookup is enough
+                members = self._constant(f"frozenset({sorted(enums)!r})")
+                condition = f"isinstance({value}, str) and {value} in {members}"
+            else:
+                condition = f"_in_enum({value}, {self._constant(repr(list(enums)))})"
+            lines.append(f"{indent}if not ({condition}):")
+            lines.append(f"{indent}    {error('enum', value, repr(enums))}")
+
+        if "format" in schema:
+            format = schema["format"]
+            lines.append(f"{indent}if not _FORMAT_CHECKER.conforms({value}, {format!r}):")
+            lines.append(f"{indent}    {error('format', value, repr(format))}")
+
+        if "required" in schema or "properties" in schema:
+            object_lines: list[str] = []
+
+            for name in schema.get("required", []):
+                object_lines.append(f"{indent}    if {name!r} not in {value}:")
+                object_lines.append(f"{indent}        {error('required', value, repr(name))}")
+
+            for name, subschema in schema.get("properties", {}).items():
+                property_value = self._variable("value")
+                property_lines: list[str] = []
+                self._compile(
+                    property_lines, subschema, root, property_value, [*path, repr(name)], level + 2
+                )
+
+                if property_lines:
+                    object_lines.append(f"{indent}    if {name!r} in {value}:")
+                    object_lines.append(f"{indent}        {property_value} = {value}[{name!r}]")
+                    object_lines.extend(property_lines)
+
+            if object_lines:
+                lines.append(f"{indent}if isinstance({value}, dict):")
+                lines.extend(object_lines)
+
+        if "items" in schema:
+            if not isinstance(schema["items"], dict):
+                raise ValueError("Only a single schema is supported for items")
+
+            index = self._variable("index")
+            item_value = self._variable("value")
+            item_lines: list[str] = []
+            self._compile(item_lines, schema["items"], root, item_value, [*path, index], level + 2)
+
+            if item_lines:
+                lines.append(f"{indent}if isinstance({value}, list):")
+                lines.append(f"{indent}    for {index}, {item_value} in enumerate({value}):")
+                lines.extend(item_lines)
+
+
+def generate_source(schemas: Mapping[str, Schema], /, *, root: Schema | None = None) -> str:
+    compiler = SchemaCompiler()
+
+    for name, schema in schemas.items():
+        compiler.add(name, schema, root=root)
+
+    return compiler.source()
+
+
+def load_module(
+    source: str,
+    /,
+    *,
+    name: str = "generated_validators",
+    format_checker: FormatChecker | None = None,
+) -> ModuleType:
+    module = ModuleType(name)
+    # The source is generated from the schemas' values with repr(), not from the user's input
+    code = compile(source, f"<{name}>", "exec")
+    exec(code, module.__dict__)  # nosec B102
+
+    if format_checker is not None:
+        module.__dict__["_FORMAT_CHECKER"] = format_checker
+
+    return module
+
+
+def error_message(keyword: str, instance: Any, expected: Any, /) -> str:
+    # The messages of jsonschema
+    if keyword == "type":
+        types = [expected] if isinstance(expected, str) else expected
+        return f"{instance!r} is not of type {', '.join(repr(type_) for type_ in types)}"
+    elif keyword == "maxLength":
+        return f"{instance!r} is too long"
+    elif keyword == "enum":
+        return f"{instance!r} is not one of {expected!r}"
+    elif keyword == "required":
+        return f"{expected!r} is a required property"
+    else:
+        return f"{instance!r} is not a {expected!r}"
+
+
+class CompiledValidator:
+    def __init__(self, schema: Schema, function: ValidateFunction, /) -> None:
+        self.schema = schema
+        self.function = function
+
+    def iter_errors(self, instance: Any, /) -> Iterator[ValidationError]:
+        for path, keyword, value, expected in self.function(instance):
+            yield ValidationError(
+                error_message(keyword, value, expected),
+                validator=keyword,
+                path=path,
+                instance=value,
+                validator_value=expected,
+            )
+
+    def validate(self, instance: Any, /) -> None:
+        for error in self.iter_errors(instance):
+            raise error
+
+
+class CompiledValidatorRegistry(ValidatorRegistry):
+    def build_validator(self, schema: Schema, /) -> CompiledValidator:
+        module = load_module(
+            generate_source({"schema": schema}), format_checker=self.format_checker
+        )
+
+        return CompiledValidator(schema, module.validate_schema)
+
+    def write_module(
+        self, filename: Path, models: Iterable[DeclarativeMeta], /, *, depth: int | None = None
+    ) -> None:
+        # One validate_<model> function for each model, the module only needs this package
+        schemas = {model.__name__: self.schema_factory(model, depth=depth) for model in models}
+
+        filename.write_text(generate_source(schemas))
+
+
+def compile_validators(
+    schemas: Mapping[str, Schema],
+    /,
+    *,
+    root: Schema | None = None,
+    format_checker: FormatChecker | None = None,
+) -> dict[str, ValidateFunction]:
+    module = load_module(generate_source(schemas, root=root), format_checker=format_checker)
+
+    return {name: getattr(module, f"validate_{name}") for name in schemas}
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import math
+import numbers
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from typing import Any, Final
+
+import numpy as np
+from jsonschema import Draft7Validator, FormatChecker
+from numpy.typing import NDArray
+
+from sqlalchemy_to_json_schema.validation import make_format_checker
+
+Batch = Mapping[str, "NDArray[Any] | Sequence[Any]"]
+Predicate = Callable[[Any], bool]
+
+SUPPORTED_KEYWORDS: Final = frozenset({"type", "maxLength", "enum", "format"})
+# The other keywords (annotations, "relation") are ignored, like jsonschema does
+UNSUPPORTED_KEYWORDS: Final = frozenset(Draft7Validator.VALIDATORS) - SUPPORTED_KEYWORDS
+
+
+def is_null(value: Any, /) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def as_array(values: NDArray[Any] | Sequence[Any], /) -> NDArray[Any]:
+    # Sequences are kept as Python objects, NumPy would coerce a mixed [1, "a"] to strings
+    array = values if isinstance(values, np.ndarray) else np.array(values, dtype=object)
+
+    # The dates are checked as the ISO strings a JSON payload would have
+    if array.dtype.kind == "M":
+        nat = np.isnat(array)
+        strings = np.datetime_as_string(array)
+        if not nat.any():
+            return strings
+
+        nullable = strings.astype(object)
+        nullable[nat] = None
+        return nullable
+
+    return array
+
+
+def null_mask(values: NDArray[Any], /) -> NDArray[np.bool_]:
+    mask: NDArray[np.bool_]
+
+    if values.dtype.kind == "f":
+        mask = np.isnan(values)
+    elif values.dtype.kind == "O":
+        mask = np.frompyfunc(is_null, 1, 1)(values).astype(bool)
+    else:
+        mask = np.zeros(len(values), dtype=bool)
+
+    return mask
+
+
+def map_unique(values: NDArray[Any], predicate: Predicate, /) -> NDArray[np.bool_]:
+    # The predicate is called once for each distinct value
+    if values.dtype.kind == "O":
+        return map_unique_objects(values, predicate)
+
+    unique, inverse = np.unique(values, return_inverse=True)
+    matches = np.fromiter(map(predicate, unique.tolist()), dtype=bool, count=len(unique))
+    mask: NDArray[np.bool_] = matches[inverse.reshape(-1)]
+
+    return mask
+
+
+def map_unique_objects(values: NDArray[Any], predicate: Predicate, /) -> NDArray[np.bool_]:
+    # The objects can't be sorted by np.unique, the results are memoized instead. The type
+    # is part of the key, 1, 1.0 and True are equal but they aren't the same JSON value
+    results: dict[tuple[type, Any], bool] = {}
+
+    def memoized(value: Any) -> bool:
+        key = type(value), value
+        try:
+            return results[key]
+        except KeyError:
+            result = results[key] = bool(predicate(value))
+            return result
+        except TypeError:
+            # An unhashable value (a list or a dict) is checked every time
+            return bool(predicate(value))
+
+    return np.fromiter(map(memoized, values.tolist()), dtype=bool, count=len(values))
+
+
+def is_enum_member(value: Any, enums: Sequence[Any], /) -> bool:
+    # Same equality as jsonschema, booleans are not equal to 0 and 1
+    return any(
+        (
+            value == each
+            if isinstance(value, str) or isinstance(each, str)
+            else isinstance(value, bool) == isinstance(each, bool) and value == each
+        )
+        for each in enums
+    )
+
+
+TYPE_PREDICATES: Final[dict[str, Predicate]] = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: not isinstance(value, bool)
+    and (isinstance(value, int) or (isinstance(value, float) and value.is_integer())),
+    "number": lambda value: not isinstance(value, bool) and isinstance(value, numbers.Number),
+    "boolean": lambda value: isinstance(value, bool),
+}
+
+# The types of all the values of an array, given its dtype kind
+KIND_TYPES: Final = {
+    "U": {"string"},
+    "i": {"integer", "number"},
+    "u": {"integer", "number"},
+    "b": {"boolean"},
+    "S": set(),
+}
+
+
+def type_mask(values: NDArray[Any], types: Sequence[str], /) -> NDArray[np.bool_]:
+    kind = values.dtype.kind
+
+    if kind in KIND_TYPES:
+        matches = bool(KIND_TYPES[kind].intersection(types))
+        return np.full(len(values), matches, dtype=bool)
+    elif kind == "f":
+        mask = np.full(len(values), "number" in types, dtype=bool)
+        if "integer" in types:
+            mask |= np.isfinite(values) & (values == np.floor(values))
+        return mask
+    else:
+        predicates = [TYPE_PREDICATES[type_] for type_ in types]
+        return map_unique(values, lambda value: any(predicate(value) for predicate in predicates))
+
+
+def max_length_mask(values: NDArray[Any], max_length: int, /) -> NDArray[np.bool_]:
+    if values.dtype.kind == "U":
+        return np.char.str_len(values) <= max_length
+    elif values.dtype.kind == "O":
+        return map_unique(
+            values, lambda value: not isinstance(value, str) or len(value) <= max_length
+        )
+    else:
+        return np.ones(len(values), dtype=bool)
+
+
+class ColumnarValidator:
+    def __init__(
+        self, schema: Mapping[str, Any], /, *, format_checker: FormatChecker | None = None
+    ) -> None:
+        self.format_checker = make_format_checker() if format_checker is None else format_checker
+        self.required = list(schema.get("required", []))
+        self.properties: dict[str, Mapping[str, Any]] = {}
+
+        for name, subschema in schema.get("properties", {}).items():
+            # The batches are flat, the relationships are not validated
+            if "$ref" in subschema or subschema.get("type") in ("object", "array"):
+                continue
+
+            unsupported = UNSUPPORTED_KEYWORDS.intersection(subschema)
+            if unsupported:
+                raise ValueError(f"Unsupported keywords for {name}: {sorted(unsupported)}")
+
+            self.properties[name] = subschema
+
+    def validate(self, batch: Batch, /) -> dict[tuple[str, str], NDArray[np.intp]]:
+        columns = {name: as_array(values) for name, values in batch.items()}
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Expected columns of the same length, got {sorted(lengths)}")
+        size = lengths.pop() if lengths else 0
+
+        errors: dict[tuple[str, str], NDArray[np.intp]] = {}
+
+        def add(name: str, keyword: str, indexes: NDArray[np.intp]) -> None:
+            if len(indexes):
+                errors[name, keyword] = indexes
+
+        # A null is a missing property, like in the rows of `iter_violations()`
+        for name in self.required:
+            if name not in columns:
+                add(name, "required", np.arange(size, dtype=np.intp))
+            else:
+                add(name, "required", np.flatnonzero(null_mask(columns[name])))
+
+        for name, subschema in self.properties.items():
+            if name not in columns:
+                continue
+
+            values = columns[name]
+            indexes = np.flatnonzero(~null_mask(values))
+            values = values[indexes]
+
+            for keyword, mask in self._iter_masks(values, subschema):
+                add(name, keyword, indexes[~mask])
+
+        return errors
+
+    def _iter_masks(
+        self, values: NDArray[Any], subschema: Mapping[str, Any], /
+    ) -> Iterator[tuple[str, NDArray[np.bool_]]]:
+        if "type" in subschema:
+            types = subschema["type"]
+            yield "type", type_mask(values, [types] if isinstance(types, str) else types)
+
+        if "maxLength" in subschema:
+            yield "maxLength", max_length_mask(values, subschema["maxLength"])
+
+        if "enum" in subschema:
+            enums = subschema["enum"]
+            yield "enum", map_unique(values, lambda value: is_enum_member(value, enums))
+
+        if "format" in subschema:
+            format = subschema["format"]
+            yield "format", map_unique(
+                values, lambda value: self.format_checker.conforms(value, format)
+            )
+
+
+def iter_batch_rows(batch: Batch, /) -> Iterator[dict[str, Any]]:
+    # The rows as validated by ColumnarValidator, the nulls are missing properties
+    columns = {name: as_array(values).tolist() for name, values in batch.items()}
+
+    for row in zip(*columns.values()):
+        yield {name: value for name, value in zip(columns, row) if not is_null(value)}
@@ -1,14 +1,21 @@
 import inspect
-import json
 import sys
-from collections.abc import Iterable, Iterator, Mapping, Sequence
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from pathlib import Path
+from tempfile import TemporaryFile
+from textwrap import indent
 from types import ModuleType
-from typing import Any, Callable, Optional, Union, cast
+from typing import Any, Optional, TextIO, Union, cast
 
-import yaml
+from loguru import logger
 from sqlalchemy.ext.declarative import DeclarativeMeta
+from sqlalchemy.orm import configure_mappers
 
+from sqlalchemy_to_json_schema.command.serializers import (
+    AbstractJSONSerializer,
+    AbstractSerializer,
+    get_serializer,
+)
 from sqlalchemy_to_json_schema.command.transformer import (
     AbstractTransformer,
     AsyncAPI2Transformer,
@@ -21,8 +28,16 @@ from sqlalchemy_to_json_schema.decisions import (
     RelationDecision,
     UseForeignKeyIfPossibleDecision,
 )
+from sqlalchemy_to_json_schema.profiling import Profiler, get_profiler
 from sqlalchemy_to_json_schema.schema_factory import Schema, SchemaFactory
-from sqlalchemy_to_json_schema.types import Decision, Format, Layout, Walker
+from sqlalchemy_to_json_schema.types import (
+    Backend,
+    Decision,
+    Format,
+    Layout,
+    Style,
+    Walker,
+)
 from sqlalchemy_to_json_schema.utils.imports import load_module_or_symbol
 from sqlalchemy_to_json_schema.walkers import (
     AbstractWalker,
@@ -52,18 +67,43 @@ DECISION_MAP: Mapping[Decision, type[AbstractDecision]] = {
 
 
 class Driver:
-    def __init__(self, walker: Walker, decision: Decision, layout: Layout, /):
-        self.transformer = self.build_transformer(walker, decision, layout)
+    def __init__(
+        self,
+        walker: Walker,
+        decision: Decision,
+        layout: Layout,
+        /,
+        *,
+        cache_dir: Optional[Path] = None,
+        jobs: int = 1,
+    ):
+        if cache_dir is None:
+            self.cache = None
+        else:
+            from sqlalchemy_to_json_schema.cache import SchemaCache
+
+            self.cache = SchemaCache(directory=cache_dir)
+        self.jobs = jobs
+        # The transformer of the layout, its definitions are streamed without the bundle
+        self.layout_transformer = self.build_layout_transformer(walker, decision, layout)
+        self.transformer = self.layout_transformer.transform
 
     def build_transformer(
         self, walker: Walker, decision: Decision, layout: Layout, /
     ) -> Callable[[Iterable[Union[ModuleType, DeclarativeMeta]], Optional[int]], Schema]:
+        return self.build_layout_transformer(walker, decision, layout).transform
+
+    def build_layout_transformer(
+        self, walker: Walker, decision: Decision, layout: Layout, /
+    ) -> AbstractTransformer:
         walker_factory = WALKER_MAP[walker]
         relation_decision = DECISION_MAP[decision]()
-        schema_factory = SchemaFactory(walker_factory, relation_decision=relation_decision)
+        schema_factory = SchemaFactory(
+            walker_factory, relation_decision=relation_decision, cache=self.cache
+        )
         transformer_factory = TRANSFORMER_MAP[layout]
 
-        return transformer_factory(schema_factory).transform
+        return transformer_factory(schema_factory, jobs=self.jobs)
 
     def run(
         self,
@@ -73,19 +113,75 @@ class Driver:
         filename: Optional[Path] = None,
         format: Optional[Format] = None,
         depth: Optional[int] = None,
+        stream: bool = False,
+        backend: Optional[Backend] = None,
+        style: Style = Style.DEFAULT,
+        profiler: Optional[Profiler] = None,
+    ) -> None:
+        # Fails before building the schemas if the backend can't be used
+        serializer = get_serializer(format, backend, style)
+
+        if profiler is None:
+            self._run(
+                targets, filename=filename, depth=depth, stream=stream, serializer=serializer
+            )
+            return
+
+        with profiler.activate():
+            self._run(
+                targets, filename=filename, depth=depth, stream=stream, serializer=serializer
+            )
+
+    def _run(
+        self,
+        targets: Sequence[str],
+        /,
+        *,
+        filename: Optional[Path],
+        depth: Optional[int],
+        stream: bool,
+        serializer: AbstractSerializer,
     ) -> None:
-        modules_and_types = (load_module_or_symbol(target) for target in targets)
+        profiler = get_profiler()
+
+        with profiler.phase("import"):
+            modules_and_types = [load_module_or_symbol(target) for target in targets]
+
         modules_and_models = cast(
-            Iterator[Union[ModuleType, DeclarativeMeta]],
-            (
+            list[Union[ModuleType, DeclarativeMeta]],
+            [
                 item
                 for item in modules_and_types
                 if inspect.ismodule(item) or isinstance(item, DeclarativeMeta)
-            ),
+            ],
         )
 
-        result = self.transformer(modules_and_models, depth)
-        self.dump(result, filename=filename, format=format)
+        if isinstance(profiler, Profiler):
+            # Otherwise the mappers are configured while the first schemas are built
+            with profiler.phase("configure"):
+                configure_mappers()
+
+        if stream:
+            definitions = self.layout_transformer.iter_definitions(modules_and_models, depth)
+
+            # The definitions are built while they are written
+            with profiler.phase("stream"):
+                self.dump_stream(
+                    definitions,
+                    self.layout_transformer.definitions_path,
+                    filename=filename,
+                    serializer=serializer,
+                )
+        else:
+            with profiler.phase("transform"):
+                result = self.transformer(modules_and_models, depth)
+
+            with profiler.phase("dump"):
+                self.dump(result, filename=filename, serializer=serializer)
+
+        # Once per run, the files of the schemas of this run are kept
+        if self.cache is not None:
+            self.cache.prune()
 
     def dump(
         self,
@@ -94,12 +190,141 @@ class Driver:
         *,
         filename: Optional[Path] = None,
         format: Optional[Format] = None,
+        serializer: Optional[AbstractSerializer] = None,
+    ) -> None:
+        if serializer is None:
+            serializer = get_serializer(format)
+
+        if filename is None:
+            output_stream = sys.stdout
+        else:
+            output_stream = filename.open("w")
+
+        serializer.dump(data, output_stream)
+
+    def dump_stream(
+        self,
+        definitions: Iterable[tuple[str, Schema]],
+        path: Sequence[str],
+        /,
+        *,
+        filename: Optional[Path] = None,
+        format: Optional[Format] = None,
+        serializer: Optional[AbstractSerializer] = None,
     ) -> None:
-        dump_function = yaml.dump if format == Format.YAML else json.dump
+        if serializer is None:
+            serializer = get_serializer(format)
 
         if filename is None:
             output_stream = sys.stdout
         else:
             output_stream = filename.open("w")
 
-        dump_function(data, output_stream)
+        if isinstance(serializer, AbstractJSONSerializer):
+            write_json_definitions(definitions, path, output_stream, serializer)
+        else:
+            write_yaml_definitions(definitions, path, output_stream, serializer)
+
+
+def iter_serialized_definitions(
+    definitions: Iterable[tuple[str, Schema]], dumps: Callable[[str, Schema], str], /
+) -> Iterator[str]:
+    # Like in a bundle, the last definition with a given name wins at the position of the
+    # first one. The definitions are serialized as soon as they are built and kept in a
+    # temporary file until the last one is known, only their names stay in memory
+    offsets: dict[str, tuple[int, int]] = {}
+
+    with TemporaryFile() as buffer:
+        for name, definition in definitions:
+            if name in offsets:
+                logger.debug("Definition {name} defined again, replaced", name=name)
+
+            content = dumps(name, definition).encode()
+            offsets[name] = buffer.tell(), len(content)
+            buffer.write(content)
+
+        for offset, size in offsets.values():
+            buffer.seek(offset)
+            yield buffer.read(size).decode()
+
+
+def write_json_definitions(
+    definitions: Iterable[tuple[str, Schema]],
+    path: Sequence[str],
+    output_stream: TextIO,
+    serializer: AbstractJSONSerializer,
+    /,
+) -> None:
+    # Same separators as the serializer, with the default style the output is the same as
+    # the one of a bundle
+    item_separator, key_separator = serializer.separators
+
+    for key in path:
+        output_stream.write(f"{{{serializer.dumps(key)}{key_separator}")
+    output_stream.write("{")
+
+    items = iter_serialized_definitions(
+        definitions,
+        lambda name, definition: (
+            f"{serializer.dumps(name)}{key_separator}{serializer.dumps(definition)}"
+        ),
+    )
+
+    for index, item in enumerate(items):
+        if index:
+            output_stream.write(item_separator)
+
+        output_stream.write(item)
+
+    output_stream.write("}" * (len(path) + 1))
+
+
+def write_yaml_definitions(
+    definitions: Iterable[tuple[str, Schema]],
+    path: Sequence[str],
+    output_stream: TextIO,
+    serializer: AbstractSerializer,
+    /,
+) -> None:
+    if serializer.style == Style.COMPACT:
+        # Flow style, each definition is an item of the innermost mapping
+        for key in path:
+            output_stream.write(f"{{{key}: ")
+        output_stream.write("{")
+
+        items = iter_serialized_definitions(
+            definitions,
+            lambda name, definition: serializer.dumps({name: definition}).strip()[1:-1],
+        )
+
+        for index, item in enumerate(items):
+            if index:
+                output_stream.write(", ")
+
+            output_stream.write(item)
+
+        output_stream.write("}" * (len(path) + 1) + "\n")
+        return
+
+    prefix = "  " * len(path)
+    is_empty = True
+
+    items = iter_serialized_definitions(
+        definitions,
+        lambda name, definition: indent(serializer.dumps({name: definition}), prefix),
+    )
+
+    for item in items:
+        if is_empty:
+            for level, key in enumerate(path):
+                output_stream.write(f"{'  ' * level}{key}:\n")
+            is_empty = False
+
+        output_stream.write(item)
+
+    if is_empty:
+        bundle: dict[str, Any] = {}
+        for key in reversed(path):
+            bundle = {key: bundle}
+
+        serializer.dump(bundle, output_stream)
@@ -4,12 +4,22 @@ from typing import Final, Optional
 
 import click
 
-from sqlalchemy_to_json_schema.command.driver import Driver
-from sqlalchemy_to_json_schema.types import Decision, Format, Layout, Walker
+from sqlalchemy_to_json_schema.exceptions import InvalidSerializer
+from sqlalchemy_to_json_schema.types import (
+    Backend,
+    Decision,
+    Format,
+    Layout,
+    Style,
+    Walker,
+)
 
 DEFAULT_WALKER: Final = Walker.STRUCTURAL
 DEFAULT_DECISION: Final = Decision.DEFAULT
 DEFAULT_LAYOUT: Final = Layout.SWAGGER_2
+DEFAULT_JOBS: Final = 1
+DEFAULT_STYLE: Final = Style.DEFAULT
+DEFAULT_PROFILE_TOP: Final = 10
 
 
 @click.command()
@@ -35,6 +45,33 @@ DEFAULT_LAYOUT: Final = Layout.SWAGGER_2
         file_okay=True, dir_okay=False, resolve_path=True, writable=True, path_type=Path
     ),
 )
+@click.option(
+    "--cache-dir",
+    type=click.Path(
+        file_okay=False, dir_okay=True, resolve_path=True, writable=True, path_type=Path
+    ),
+)
+@click.option("--jobs", type=click.IntRange(min=1), default=DEFAULT_JOBS)
+@click.option("--stream", is_flag=True, default=False)
+@click.option(
+    "--backend",
+    type=click.Choice([backend.value for backend in Backend]),
+)
+@click.option(
+    "--style",
+    type=click.Choice([style.value for style in Style]),
+    default=DEFAULT_STYLE.value,
+)
+@click.option("--profile", is_flag=True, default=False)
+@click.option("--profile-top", type=click.IntRange(min=0), default=DEFAULT_PROFILE_TOP)
+@click.option(
+    "--profile-stats",
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=Path),
+)
+@click.option(
+    "--profile-report",
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, path_type=Path),
+)
 @click.argument("targets", type=str, nargs=-1)
 def main(
     targets: Sequence[str],
@@ -43,9 +80,50 @@ def main(
     layout: str,
     out: Optional[Path] = None,
     format: Optional[str] = None,
+    cache_dir: Optional[Path] = None,
+    jobs: int = DEFAULT_JOBS,
+    stream: bool = False,
+    backend: Optional[str] = None,
+    style: str = DEFAULT_STYLE.value,
+    profile: bool = False,
+    profile_top: int = DEFAULT_PROFILE_TOP,
+    profile_stats: Optional[Path] = None,
+    profile_report: Optional[Path] = None,
 ) -> None:
-    driver = Driver(Walker(walker), Decision(decision), Layout(layout))
-    driver.run(targets, filename=out, format=None if format is None else Format(format))
+    # Imported here, the options are parsed and the help is shown without loading
+    # SQLAlchemy and the serializers
+    from sqlalchemy_to_json_schema.command.driver import Driver
+    from sqlalchemy_to_json_schema.profiling import Profiler
+
+    # Writing a profile implies profiling
+    if profile or profile_stats is not None or profile_report is not None:
+        profiler = Profiler(cprofile=profile_stats is not None)
+    else:
+        profiler = None
+
+    driver = Driver(
+        Walker(walker), Decision(decision), Layout(layout), cache_dir=cache_dir, jobs=jobs
+    )
+    try:
+        driver.run(
+            targets,
+            filename=out,
+            format=None if format is None else Format(format),
+            stream=stream,
+            backend=None if backend is None else Backend(backend),
+            style=Style(style),
+            profiler=profiler,
+        )
+    except InvalidSerializer as error:
+        raise click.UsageError(str(error)) from error
+
+    if profiler is not None:
+        click.echo(profiler.format_top(profile_top), err=True)
+
+        if profile_stats is not None:
+            profiler.dump_stats(profile_stats)
+        if profile_report is not None:
+            profiler.dump_report(profile_report)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,145 @@
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from importlib import import_module
+from io import StringIO
+from types import ModuleType
+from typing import Any, ClassVar, Optional, TextIO
+
+from sqlalchemy_to_json_schema.exceptions import InvalidSerializer
+from sqlalchemy_to_json_schema.types import Backend, Format, Style
+
+
+def import_optional(name: str, /) -> Optional[ModuleType]:
+    # The backends are imported only when they are used
+    try:
+        return import_module(name)
+    except ImportError:
+        return None
+
+
+class AbstractSerializer(ABC):
+    format: ClassVar[Format]
+
+    def __init__(self, *, style: Style = Style.DEFAULT):
+        self.style = style
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @abstractmethod
+    def dump(self, data: Any, output_stream: TextIO, /) -> None: ...
+
+    def dumps(self, data: Any, /) -> str:
+        output_stream = StringIO()
+        self.dump(data, output_stream)
+
+        return output_stream.getvalue()
+
+
+class AbstractJSONSerializer(AbstractSerializer):
+    format = Format.JSON
+
+    @property
+    @abstractmethod
+    def separators(self) -> tuple[str, str]: ...
+
+
+class JSONSerializer(AbstractJSONSerializer):
+    @property
+    def separators(self) -> tuple[str, str]:
+        if self.style == Style.DEFAULT:
+            return ", ", ": "
+        elif self.style == Style.COMPACT:
+            return ",", ":"
+        else:
+            return ",", ": "
+
+    def dump(self, data: Any, output_stream: TextIO, /) -> None:
+        indent = 2 if self.style == Style.PRETTY else None
+
+        json.dump(data, output_stream, indent=indent, separators=self.separators)
+
+
+class ORJSONSerializer(AbstractJSONSerializer):
+    @classmethod
+    def is_available(cls) -> bool:
+        return import_optional("orjson") is not None
+
+    @property
+    def separators(self) -> tuple[str, str]:
+        return (",", ": ") if self.style == Style.PRETTY else (",", ":")
+
+    def dump(self, data: Any, output_stream: TextIO, /) -> None:
+        output_stream.write(self.dumps(data))
+
+    def dumps(self, data: Any, /) -> str:
+        import orjson
+
+        # orjson has no separators option, the default style is the compact one
+        option = orjson.OPT_INDENT_2 if self.style == Style.PRETTY else 0
+
+        return orjson.dumps(data, option=option).decode()
+
+
+class PyYAMLSerializer(AbstractSerializer):
+    format = Format.YAML
+    dumper_name: ClassVar[str] = "Dumper"
+
+    @classmethod
+    def get_dumper(cls) -> Optional[type]:
+        yaml = import_optional("yaml")
+
+        return None if yaml is None else getattr(yaml, cls.dumper_name, None)
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return cls.get_dumper() is not None
+
+    def dump(self, data: Any, output_stream: TextIO, /) -> None:
+        import yaml
+
+        # The block style is already the pretty one
+        default_flow_style = True if self.style == Style.COMPACT else False
+
+        yaml.dump(
+            data, output_stream, Dumper=self.get_dumper(), default_flow_style=default_flow_style
+        )
+
+
+class LibYAMLSerializer(PyYAMLSerializer):
+    # Only available when PyYAML is built with libyaml
+    dumper_name = "CSafeDumper"
+
+
+SERIALIZER_MAP: Mapping[Backend, type[AbstractSerializer]] = {
+    Backend.JSON: JSONSerializer,
+    Backend.ORJSON: ORJSONSerializer,
+    Backend.PYYAML: PyYAMLSerializer,
+    Backend.LIBYAML: LibYAMLSerializer,
+}
+
+DEFAULT_BACKEND_MAP: Mapping[Format, Backend] = {
+    Format.JSON: Backend.JSON,
+    Format.YAML: Backend.PYYAML,
+}
+
+
+def get_serializer(
+    format: Optional[Format] = None,
+    backend: Optional[Backend] = None,
+    style: Style = Style.DEFAULT,
+) -> AbstractSerializer:
+    if backend is None:
+        backend = DEFAULT_BACKEND_MAP[format or Format.JSON]
+
+    serializer_factory = SERIALIZER_MAP[backend]
+
+    if not serializer_factory.is_available():
+        raise InvalidSerializer(f"Backend {backend.value} is not available")
+
+    if format is not None and format != serializer_factory.format:
+        raise InvalidSerializer(f"Backend {backend.value} doesn't write the {format.value} format")
+
+    return serializer_factory(style=style)
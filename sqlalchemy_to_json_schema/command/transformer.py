@@ -1,6 +1,9 @@
 import inspect
 from abc import ABC, abstractmethod
-from collections.abc import Iterable, Iterator
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from copy import deepcopy
+from itertools import repeat
 from types import ModuleType
 from typing import Optional, Union
 
@@ -8,121 +11,174 @@ from loguru import logger
 from sqlalchemy.ext.declarative import DeclarativeMeta
 from typing_extensions import TypeGuard
 
-from sqlalchemy_to_json_schema.schema_factory import Schema, SchemaFactory
+from sqlalchemy_to_json_schema import tracing
+from sqlalchemy_to_json_schema.schema_factory import (
+    COMPONENTS_REFERENCES,
+    DEFINITIONS_REFERENCES,
+    References,
+    Schema,
+    SchemaFactory,
+)
 
 
 class AbstractTransformer(ABC):
-    def __init__(self, schema_factory: SchemaFactory, /):
-        self.schema_factory = schema_factory
+    # Keys of the bundle under which the definitions are written
+    definitions_path: tuple[str, ...] = ("definitions",)
+    # The references are generated with the bundle's prefix while the schemas are built
+    references: References = DEFINITIONS_REFERENCES
+
+    def __init__(self, schema_factory: SchemaFactory, /, *, jobs: int = 1):
+        if jobs < 1:
+            raise ValueError(f"Expected at least 1 job, got {jobs}")
+
+        self.schema_factory = schema_factory.with_references(self.references)
+        self.jobs = jobs
 
     @abstractmethod
     def transform(
         self, rawtargets: Iterable[Union[ModuleType, DeclarativeMeta]], depth: Optional[int], /
     ) -> Schema: ...
 
-
-class JSONSchemaTransformer(AbstractTransformer):
-    def transform(
+    def iter_definitions(
         self, rawtargets: Iterable[Union[ModuleType, DeclarativeMeta]], depth: Optional[int], /
-    ) -> Schema:
-        definitions = {}
+    ) -> Iterator[tuple[str, Schema]]:
+        targets = list(rawtargets)
+        schemas = self.build_schemas(targets, depth)
 
-        for item in rawtargets:
-            if inspect.isclass(item) and isinstance(item, DeclarativeMeta):
-                partial_definitions = self.transform_by_model(item, depth)
-            elif inspect.ismodule(item):
-                partial_definitions = self.transform_by_module(item, depth)
+        for target in targets:
+            if inspect.isclass(target) and isinstance(target, DeclarativeMeta):
+                schema = self.next_schema(target, depth, schemas)
+                yield from schema.pop(self.references.container, {}).items()
+                yield schema["title"], schema
+            elif inspect.ismodule(target):
+                yield from self.iter_module_definitions(target, depth, schemas=schemas)
             else:
-                TypeError(f"Expected a class or module, got {item}")
+                raise TypeError(f"Expected a class or module, got {target}")
 
-            definitions.update(partial_definitions)
+    def iter_module_definitions(
+        self,
+        module: ModuleType,
+        depth: Optional[int],
+        /,
+        *,
+        schemas: Optional[Iterator[Schema]] = None,
+    ) -> Iterator[tuple[str, Schema]]:
+        for basemodel in collect_models(module):
+            schema = self.next_schema(basemodel, depth, schemas)
+            schema.pop(self.references.container, None)
 
-        return definitions
+            yield schema["title"], schema
 
-    def transform_by_model(self, model: DeclarativeMeta, depth: Optional[int], /) -> Schema:
-        return self.schema_factory(model, depth=depth)
+    def build_schemas(
+        self, targets: Iterable[Union[ModuleType, DeclarativeMeta]], depth: Optional[int], /
+    ) -> Iterator[Schema]:
+        models = list(iter_target_models(targets))
 
-    def transform_by_module(self, module: ModuleType, depth: Optional[int], /) -> Schema:
-        subdefinitions = {}
-        definitions = {}
-        for basemodel in collect_models(module):
-            schema = self.schema_factory(basemodel, depth=depth)
-            if "definitions" in schema:
-                subdefinitions.update(schema.pop("definitions"))
-            definitions[schema["title"]] = schema
-        d = {}
-        d.update(subdefinitions)
-        d.update(definitions)
-        return {"definitions": definitions}
+        if self.jobs == 1 or len(set(models)) < 2:
+            return (self.schema_factory(model, depth=depth) for model in models)
 
+        return build_schemas_in_parallel(self.schema_factory, models, depth, jobs=self.jobs)
 
-class OpenAPI2Transformer(AbstractTransformer):
-    def transform(
-        self, rawtargets: Iterable[Union[ModuleType, DeclarativeMeta]], depth: Optional[int], /
+    def next_schema(
+        self, model: DeclarativeMeta, depth: Optional[int], schemas: Optional[Iterator[Schema]], /
     ) -> Schema:
-        definitions = {}
+        if schemas is None:
+            return self.schema_factory(model, depth=depth)
 
-        for target in rawtargets:
-            if inspect.isclass(target) and isinstance(target, DeclarativeMeta):
-                partial_definitions = self.transform_by_model(target, depth)
-            elif inspect.ismodule(target):
-                partial_definitions = self.transform_by_module(target, depth)
-            else:
-                raise TypeError(f"Expected a class or module, got {target}")
+        return next(schemas)
 
-            definitions.update(partial_definitions)
 
-        return {"definitions": definitions}
+class JSONSchemaTransformer(AbstractTransformer):
+    # The schemas of the targets are merged at the top of the bundle, its keys are streamed
+    definitions_path = ()
 
-    def transform_by_model(self, model: DeclarativeMeta, depth: Optional[int], /) -> Schema:
-        definitions = {}
-        schema = self.schema_factory(model, depth=depth)
+    def transform(
+        self, rawtargets: Iterable[Union[ModuleType, DeclarativeMeta]], depth: Optional[int], /
+    ) -> Schema:
+        return dict(self.iter_definitions(rawtargets, depth))
 
-        if "definitions" in schema:
-            definitions.update(schema.pop("definitions"))
+    def iter_definitions(
+        self, rawtargets: Iterable[Union[ModuleType, DeclarativeMeta]], depth: Optional[int], /
+    ) -> Iterator[tuple[str, Schema]]:
+        targets = list(rawtargets)
+        schemas = self.build_schemas(targets, depth)
 
-        definitions[schema["title"]] = schema
+        for item in targets:
+            if inspect.isclass(item) and isinstance(item, DeclarativeMeta):
+                partial_definitions = self.transform_by_model(item, depth, schemas=schemas)
+            elif inspect.ismodule(item):
+                partial_definitions = self.transform_by_module(item, depth, schemas=schemas)
+            else:
+                raise TypeError(f"Expected a class or module, got {item}")
 
-        return definitions
+            yield from partial_definitions.items()
 
-    def transform_by_module(self, module: ModuleType, depth: Optional[int], /) -> Schema:
-        subdefinitions = {}
-        definitions = {}
+    def transform_by_model(
+        self,
+        model: DeclarativeMeta,
+        depth: Optional[int],
+        /,
+        *,
+        schemas: Optional[Iterator[Schema]] = None,
+    ) -> Schema:
+        return self.next_schema(model, depth, schemas)
+
+    def transform_by_module(
+        self,
+        module: ModuleType,
+        depth: Optional[int],
+        /,
+        *,
+        schemas: Optional[Iterator[Schema]] = None,
+    ) -> Schema:
+        return {"definitions": dict(self.iter_module_definitions(module, depth, schemas=schemas))}
 
-        for basemodel in collect_models(module):
-            schema = self.schema_factory(basemodel, depth=depth)
 
-            if "definitions" in schema:
-                subdefinitions.update(schema.pop("definitions"))
+class OpenAPI2Transformer(AbstractTransformer):
+    def transform(
+        self, rawtargets: Iterable[Union[ModuleType, DeclarativeMeta]], depth: Optional[int], /
+    ) -> Schema:
+        # The definitions are merged in order, the last one with a given name wins
+        return {"definitions": dict(self.iter_definitions(rawtargets, depth))}
+
+    def transform_by_model(
+        self,
+        model: DeclarativeMeta,
+        depth: Optional[int],
+        /,
+        *,
+        schemas: Optional[Iterator[Schema]] = None,
+    ) -> Schema:
+        definitions = {}
+        schema = self.next_schema(model, depth, schemas)
 
-            definitions[schema["title"]] = schema
+        if self.references.container in schema:
+            definitions.update(schema.pop(self.references.container))
 
-        d = {}
-        d.update(subdefinitions)
-        d.update(definitions)
+        definitions[schema["title"]] = schema
 
         return definitions
 
+    def transform_by_module(
+        self,
+        module: ModuleType,
+        depth: Optional[int],
+        /,
+        *,
+        schemas: Optional[Iterator[Schema]] = None,
+    ) -> Schema:
+        return dict(self.iter_module_definitions(module, depth, schemas=schemas))
+
 
 class OpenAPI3Transformer(OpenAPI2Transformer):
-    def replace_ref(self, d: Union[dict, list], old_prefix: str, new_prefix: str, /) -> None:
-        if isinstance(d, dict):
-            for k, v in d.items():
-                if k == "$ref":
-                    d[k] = v.replace(old_prefix, new_prefix)
-                else:
-                    self.replace_ref(v, old_prefix, new_prefix)
-        elif isinstance(d, list):
-            for item in d:
-                self.replace_ref(item, old_prefix, new_prefix)
+    definitions_path = ("components", "schemas")
+    references = COMPONENTS_REFERENCES
 
     def transform(
         self, rawtargets: Iterable[Union[ModuleType, DeclarativeMeta]], depth: Optional[int], /
     ) -> Schema:
         definitions = super().transform(rawtargets, depth)
 
-        self.replace_ref(definitions, "#/definitions/", "#/components/schemas/")
-
         if "components" not in definitions:
             definitions["components"] = {}
         if "schemas" not in definitions["components"]:
@@ -139,7 +195,8 @@ def collect_models(module: ModuleType, /) -> Iterator[DeclarativeMeta]:
         if not (hasattr(maybe_model, "__table__") or hasattr(maybe_model, "__tablename__")):
             return False
 
-        logger.debug("{maybe_model} is a SQLAlchemy model", maybe_model=maybe_model)
+        if tracing.enabled:
+            logger.debug("{maybe_model} is a SQLAlchemy model", maybe_model=maybe_model)
 
         return True
 
@@ -157,5 +214,75 @@ def collect_models(module: ModuleType, /) -> Iterator[DeclarativeMeta]:
     return models
 
 
+def iter_target_models(
+    targets: Iterable[Union[ModuleType, DeclarativeMeta]], /
+) -> Iterator[DeclarativeMeta]:
+    for target in targets:
+        if inspect.isclass(target) and isinstance(target, DeclarativeMeta):
+            yield target
+        elif inspect.ismodule(target):
+            yield from collect_models(target)
+
+
+# State of the worker processes, set once by the pool initializer
+_worker_schema_factory: Optional[SchemaFactory] = None
+_worker_models: Sequence[DeclarativeMeta] = ()
+
+
+def _init_worker(schema_factory: SchemaFactory, models: Sequence[DeclarativeMeta], /) -> None:
+    global _worker_schema_factory, _worker_models
+
+    _worker_schema_factory = schema_factory
+    _worker_models = models
+
+
+def _build_worker_schema(index: int, depth: Optional[int], /) -> Schema:
+    if _worker_schema_factory is None:
+        raise RuntimeError("worker not initialized")
+
+    return _worker_schema_factory(_worker_models[index], depth=depth)
+
+
+def build_schemas_in_parallel(
+    schema_factory: SchemaFactory,
+    models: Sequence[DeclarativeMeta],
+    depth: Optional[int],
+    /,
+    *,
+    jobs: int,
+) -> Iterator[Schema]:
+    from concurrent.futures import ProcessPoolExecutor
+
+    unique_models = list(dict.fromkeys(models))
+    chunksize = max(1, len(unique_models) // (jobs * 4))
+
+    logger.debug(
+        "Building {count} models with {jobs} processes", count=len(unique_models), jobs=jobs
+    )
+
+    # The models are sent once to each worker, the tasks are indexes into them
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(schema_factory, unique_models)
+    ) as executor:
+        schemas = dict(
+            zip(
+                unique_models,
+                executor.map(
+                    _build_worker_schema,
+                    range(len(unique_models)),
+                    repeat(depth),
+                    chunksize=chunksize,
+                ),
+            )
+        )
+
+    # Results are returned in the same order as the serial build, a model used more
+    # than once gets copies because the transformers change the schemas
+    remaining = Counter(models)
+    for model in models:
+        remaining[model] -= 1
+        yield deepcopy(schemas[model]) if remaining[model] else schemas[model]
+
+
 class AsyncAPI2Transformer(OpenAPI3Transformer):
     pass
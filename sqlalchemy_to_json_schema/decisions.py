@@ -37,7 +37,7 @@ class RelationDecision(AbstractDecision):
         *,
         toplevel: bool = False,
     ) -> Iterator[DecisionResult]:
-        if hasattr(prop, "mapper"):
+        if prop in walker.plan.directions:
             yield ColumnPropertyType.RELATIONSHIP, prop, {}
         elif hasattr(prop, "columns"):
             yield ColumnPropertyType.FOREIGNKEY, prop, {}
@@ -54,21 +54,25 @@ class UseForeignKeyIfPossibleDecision(AbstractDecision):
         *,
         toplevel: bool = False,
     ) -> Iterator[DecisionResult]:
-        if hasattr(prop, "mapper"):
-            if prop.direction == MANYTOONE:
+        direction = walker.plan.directions.get(prop)
+
+        if direction is not None:
+            if direction == MANYTOONE:
+                column_index = walker.plan.column_index
+
                 if toplevel:
                     for c in prop.local_columns:
-                        yield ColumnPropertyType.FOREIGNKEY, walker.mapper._props[c.name], {
+                        yield ColumnPropertyType.FOREIGNKEY, column_index[c.name], {
                             "relation": prop.key
                         }
                 else:
                     rp = walker.history[0]
                     if prop.local_columns != rp.remote_side:
                         for c in prop.local_columns:
-                            yield ColumnPropertyType.FOREIGNKEY, walker.mapper._props[c.name], {
+                            yield ColumnPropertyType.FOREIGNKEY, column_index[c.name], {
                                 "relation": prop.key
                             }
-            elif prop.direction == MANYTOMANY:
+            elif direction == MANYTOMANY:
                 # logger.warning("skip mapper=%s, prop=%s is many to many.", walker.mapper, prop)
                 # fixme: this must return a ColumnPropertyType member
                 yield (
@@ -10,6 +10,10 @@ class InvalidStatus(Exception):
     pass
 
 
+class InvalidSerializer(ValueError):
+    pass
+
+
 class ConversionError(Exception):
     def __init__(self, name: str, message: str, /):
         self.name = name
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+
+def freeze(value: Any, /) -> Any:
+    if isinstance(value, PathTrie):
+        return value.frozen
+    elif isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    elif isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    else:
+        return value
+
+
+class PathTrie:
+    def __init__(self, *, splitter: str = ".") -> None:
+        self.splitter = splitter
+        self.children: dict[str, PathTrie] = {}
+        self.terminal = False
+        self.value: Any = None
+        self.used = False
+        self._frozen: Any = None
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[str], /, *, splitter: str = ".") -> PathTrie:
+        trie = cls(splitter=splitter)
+
+        for path in paths:
+            trie.insert(path)
+
+        return trie
+
+    @classmethod
+    def from_mapping(cls, params: Mapping[str, Any], /, *, splitter: str = ".") -> PathTrie:
+        trie = cls(splitter=splitter)
+
+        for path, value in params.items():
+            trie.insert(path, value)
+
+        return trie
+
+    def insert(self, path: str, value: Any = None, /) -> None:
+        node = self
+
+        for name in path.split(self.splitter):
+            child = node.children.get(name)
+            if child is None:
+                child = node.children[name] = self.__class__(splitter=self.splitter)
+            node = child
+
+        node.terminal = True
+        node.value = value
+
+    def child(self, name: str, /) -> PathTrie:
+        try:
+            return self.children[name]
+        except KeyError:
+            return self.__class__(splitter=self.splitter)
+
+    def extended(self, names: Iterable[str], /) -> PathTrie:
+        names = [name for name in names if name not in self]
+
+        if not names:
+            return self
+
+        # The children are shared with this trie, the extended ones are copied
+        trie = self.__class__(splitter=self.splitter)
+        trie.children = dict(self.children)
+        for name in names:
+            child = self.__class__(splitter=self.splitter)
+            if name in self.children:
+                child.children = self.children[name].children
+            child.terminal = True
+            trie.children[name] = child
+
+        return trie
+
+    def __contains__(self, name: object, /) -> bool:
+        child = self.children.get(name)  # type: ignore[call-overload]
+
+        return child is not None and child.terminal
+
+    def __iter__(self) -> Iterator[str]:
+        for path, _ in self.iter_terminals():
+            yield path
+
+    def __bool__(self) -> bool:
+        # Every branch of the trie ends with a terminal node
+        return bool(self.children)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.iter_terminals())
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    def iter_terminals(self, prefix: str = "", /) -> Iterator[tuple[str, PathTrie]]:
+        for name, child in self.children.items():
+            path = f"{prefix}{name}"
+            if child.terminal:
+                yield path, child
+            yield from child.iter_terminals(f"{path}{self.splitter}")
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        for path, node in self.iter_terminals():
+            yield path, node.value
+
+    def used_paths(self) -> frozenset[str]:
+        return frozenset(path for path, node in self.iter_terminals() if node.used)
+
+    def not_used_paths(self) -> set[str]:
+        return {path for path, node in self.iter_terminals() if not node.used}
+
+    def mark_used(self, paths: Iterable[str], /) -> None:
+        for path in paths:
+            node = self
+
+            for name in path.split(self.splitter):
+                node = node.children[name]
+
+            node.used = True
+
+    @property
+    def frozen(self) -> Any:
+        # Computed once, the content of a trie is not changed after it is built
+        if self._frozen is None:
+            self._frozen = tuple(sorted((path, freeze(value)) for path, value in self.items()))
+
+        return self._frozen
+
+
+def as_path_trie(paths: Iterable[str] | PathTrie, /, *, splitter: str = ".") -> PathTrie:
+    if isinstance(paths, PathTrie):
+        return paths
+
+    return PathTrie.from_paths(paths, splitter=splitter)
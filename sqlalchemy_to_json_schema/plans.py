@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cached_property
+from hashlib import sha256
+from types import MappingProxyType
+from typing import Any, Final
+
+from sqlalchemy.orm import (
+    Mapper,
+    MapperProperty,
+    RelationshipDirection,
+    configure_mappers,
+)
+from sqlalchemy.orm.properties import ColumnProperty
+from sqlalchemy.orm.relationships import RelationshipProperty
+
+DEFAULT_PLAN_CACHE_SIZE: Final = 1024
+
+
+@dataclass(frozen=True)
+class MapperPlan:
+    mapper: Mapper
+    # `mapper.attrs` is memoized by SQLAlchemy until the mapper's properties change,
+    # its identity tells if the plan is still up to date
+    attrs: Any
+    column_properties: tuple[MapperProperty, ...]
+    relationships: tuple[RelationshipProperty, ...]
+    column_index: Mapping[str, MapperProperty]
+    foreign_key_properties: frozenset[MapperProperty]
+    directions: Mapping[MapperProperty, RelationshipDirection]
+
+    @property
+    def properties(self) -> tuple[MapperProperty, ...]:
+        return self.column_properties + self.relationships
+
+    @cached_property
+    def fingerprint(self) -> str:
+        class_ = self.mapper.class_
+        columns = [
+            (
+                prop.key,
+                [
+                    (
+                        getattr(column, "name", None),
+                        getattr(column, "key", None),
+                        repr(column.type),
+                        getattr(column, "nullable", None),
+                        getattr(column, "primary_key", None),
+                        getattr(column, "doc", None),
+                        sorted(fk.target_fullname for fk in getattr(column, "foreign_keys", ())),
+                    )
+                    for column in getattr(prop, "columns", ())
+                ],
+            )
+            for prop in self.column_properties
+        ]
+        relationships = [
+            (
+                prop.key,
+                prop.direction.name,
+                f"{prop.mapper.class_.__module__}.{prop.mapper.class_.__qualname__}",
+                prop.back_populates,
+                None if prop.backref is None else prop.backref[0],
+                sorted(str(column) for column in prop.local_columns),
+                sorted(str(column) for column in prop.remote_side),
+            )
+            for prop in self.relationships
+        ]
+        description = (
+            f"{class_.__module__}.{class_.__qualname__}",
+            class_.__doc__,
+            [str(table) for table in self.mapper.tables],
+            columns,
+            relationships,
+        )
+
+        return sha256(repr(description).encode()).hexdigest()
+
+    @classmethod
+    def from_mapper(cls, mapper: Mapper, /) -> MapperPlan:
+        attrs = mapper.attrs
+
+        properties_by_column_name: dict[str, list[MapperProperty]] = {}
+        for prop in mapper.iterate_properties:
+            if isinstance(prop, ColumnProperty):
+                for name in {column.name for column in prop.columns}:
+                    properties_by_column_name.setdefault(name, []).append(prop)
+
+        # mapper.column_attrs and mapper.attrs are not ordered by the table's columns,
+        # follow the order of `local_table.columns` instead
+        column_properties: list[MapperProperty] = []
+        column_index: dict[str, MapperProperty] = {}
+        for c in mapper.local_table.columns:
+            if c.name in mapper._props:
+                props = [mapper._props[c.name]]
+            else:
+                props = properties_by_column_name.get(c.name, [])
+
+            column_properties.extend(props)
+            if props:
+                column_index.setdefault(c.name, props[0])
+
+        relationships = tuple(mapper.relationships)
+
+        foreign_key_properties = frozenset(
+            prop
+            for prop in column_properties
+            if any(c.foreign_keys for c in getattr(prop, "columns", {}))
+        )
+        directions: dict[MapperProperty, RelationshipDirection] = {
+            prop: prop.direction for prop in relationships
+        }
+
+        return cls(
+            mapper=mapper,
+            attrs=attrs,
+            column_properties=tuple(column_properties),
+            relationships=relationships,
+            column_index=MappingProxyType(column_index),
+            foreign_key_properties=foreign_key_properties,
+            directions=MappingProxyType(directions),
+        )
+
+
+class MapperPlanCache:
+    def __init__(self, *, maxsize: int = DEFAULT_PLAN_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._plans: OrderedDict[Mapper, MapperPlan] = OrderedDict()
+
+    def __getitem__(self, mapper: Mapper, /) -> MapperPlan:
+        # configure the pending mappers first, they can add backrefs to this mapper
+        configure_mappers()
+
+        plan = self._plans.get(mapper)
+
+        if plan is None or plan.attrs is not mapper.attrs:
+            plan = self._plans[mapper] = MapperPlan.from_mapper(mapper)
+
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        else:
+            self._plans.move_to_end(mapper)
+
+        return plan
+
+    def clear(self) -> None:
+        self._plans.clear()
+
+
+mapper_plans = MapperPlanCache()
+
+
+def get_mapper_plan(mapper: Mapper, /) -> MapperPlan:
+    return mapper_plans[mapper]
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import cProfile
+
+PROFILE_REPORT_VERSION = 1
+
+
+@dataclass
+class Timing:
+    calls: int = 0
+    seconds: float = 0.0
+    # Net number of memory blocks allocated by the phase
+    allocated_blocks: int = 0
+
+    def add(self, seconds: float, allocated_blocks: int, /) -> None:
+        self.calls += 1
+        self.seconds += seconds
+        self.allocated_blocks += allocated_blocks
+
+
+class NullProfiler:
+    _context: AbstractContextManager[None] = nullcontext()
+
+    def phase(self, name: str, /, *, model: str | None = None) -> AbstractContextManager[None]:
+        return self._context
+
+
+class Profiler:
+    def __init__(self, *, cprofile: bool = False) -> None:
+        self.phases: defaultdict[str, Timing] = defaultdict(Timing)
+        self.models: defaultdict[str, defaultdict[str, Timing]] = defaultdict(
+            lambda: defaultdict(Timing)
+        )
+        self.cprofile: cProfile.Profile | None = None
+
+        if cprofile:
+            from cProfile import Profile
+
+            self.cprofile = Profile()
+
+    @contextmanager
+    def phase(self, name: str, /, *, model: str | None = None) -> Iterator[None]:
+        allocated_blocks = sys.getallocatedblocks()
+        started_at = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started_at
+            allocated_blocks = sys.getallocatedblocks() - allocated_blocks
+
+            self.phases[name].add(seconds, allocated_blocks)
+            if model is not None:
+                self.models[model][name].add(seconds, allocated_blocks)
+
+    @contextmanager
+    def activate(self) -> Iterator[Profiler]:
+        global _profiler
+
+        previous = _profiler
+        _profiler = self
+
+        if self.cprofile is not None:
+            self.cprofile.enable()
+
+        try:
+            yield self
+        finally:
+            if self.cprofile is not None:
+                self.cprofile.disable()
+
+            _profiler = previous
+
+    def model_seconds(self, model: str, /) -> float:
+        return sum(timing.seconds for timing in self.models[model].values())
+
+    def top_models(self, n: int, /) -> list[str]:
+        return sorted(self.models, key=self.model_seconds, reverse=True)[:n]
+
+    def format_top(self, n: int, /) -> str:
+        lines = [f"{'phase':<40} {'calls':>8} {'seconds':>10} {'blocks':>10}"]
+        lines.extend(
+            f"{name:<40} {timing.calls:>8} {timing.seconds:>10.4f} {timing.allocated_blocks:>10}"
+            for name, timing in self.phases.items()
+        )
+        lines.append("")
+        lines.append(f"{'model':<40} {'seconds':>10}")
+        lines.extend(
+            f"{model:<40} {self.model_seconds(model):>10.4f}" for model in self.top_models(n)
+        )
+
+        return "\n".join(lines)
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "version": PROFILE_REPORT_VERSION,
+            "phases": {name: asdict(timing) for name, timing in self.phases.items()},
+            "models": {
+                model: {
+                    "seconds": self.model_seconds(model),
+                    "phases": {name: asdict(timing) for name, timing in phases.items()},
+                }
+                for model, phases in self.models.items()
+            },
+        }
+
+    def dump_report(self, filename: Path, /) -> None:
+        with filename.open("w") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def dump_stats(self, filename: Path, /) -> None:
+        if self.cprofile is None:
+            raise ValueError("The profiler was created without cProfile")
+
+        self.cprofile.dump_stats(filename)
+
+
+_profiler: Profiler | NullProfiler = NullProfiler()
+
+
+def get_profiler() -> Profiler | NullProfiler:
+    return _profiler
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from sqlalchemy import Column, ForeignKeyConstraint, MetaData, Table
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.inspection import inspect
+
+from sqlalchemy_to_json_schema.schema_factory import Schema
+from sqlalchemy_to_json_schema.tables import TableSchemaFactory
+
+
+def reflect_tables(
+    bind: Engine | Connection,
+    /,
+    *,
+    schema: str | None = None,
+    filter_names: Sequence[str] | None = None,
+    metadata: MetaData | None = None,
+) -> MetaData:
+    # Only the columns, primary keys and foreign keys are needed by the schemas, each of them
+    # is fetched for all the tables at once instead of reflecting the tables one by one
+    inspector = inspect(bind)
+    columns = inspector.get_multi_columns(schema=schema, filter_names=filter_names)
+    primary_keys = inspector.get_multi_pk_constraint(schema=schema, filter_names=filter_names)
+    foreign_keys = inspector.get_multi_foreign_keys(schema=schema, filter_names=filter_names)
+
+    metadata = MetaData() if metadata is None else metadata
+    names = {key[1] for key in columns}
+
+    for key, reflected_columns in columns.items():
+        table_schema, name = key
+        pk_constraint = primary_keys.get(key)
+        primary_key = [] if pk_constraint is None else pk_constraint["constrained_columns"]
+
+        table = Table(
+            name,
+            metadata,
+            *(
+                Column(
+                    column["name"],
+                    column["type"],
+                    nullable=column["nullable"],
+                    primary_key=column["name"] in primary_key,
+                    comment=column.get("comment"),
+                )
+                for column in reflected_columns
+            ),
+            schema=table_schema,
+        )
+
+        for constraint in foreign_keys.get(key, []):
+            # The foreign keys to the tables not reflected can't be resolved, they are skipped
+            referred = constraint["referred_table"]
+            if constraint["referred_schema"] not in (None, schema) or referred not in names:
+                continue
+
+            prefix = referred if schema is None else f"{schema}.{referred}"
+            table.append_constraint(
+                ForeignKeyConstraint(
+                    constraint["constrained_columns"],
+                    [f"{prefix}.{column}" for column in constraint["referred_columns"]],
+                    name=constraint["name"],
+                )
+            )
+
+    return metadata
+
+
+def reflect_schemas(
+    bind: Engine | Connection,
+    table_schema_factory: TableSchemaFactory,
+    /,
+    *,
+    schema: str | None = None,
+    filter_names: Sequence[str] | None = None,
+    depth: int | None = None,
+) -> dict[str, Schema]:
+    metadata = reflect_tables(bind, schema=schema, filter_names=filter_names)
+
+    return table_schema_factory.schemas(metadata, depth=depth)
@@ -22,12 +22,14 @@ JSON Schema defines seven primitive types for JSON values:
 
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
-from typing import Any, Callable
+from collections.abc import Iterator, Mapping, Sequence
+from copy import copy
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Final
 
 import sqlalchemy.types as t
 from sqlalchemy import Enum
-from sqlalchemy.dialects import postgresql as postgresql_types
 from sqlalchemy.ext.declarative import DeclarativeMeta
 from sqlalchemy.orm import MapperProperty
 from sqlalchemy.orm.base import ONETOMANY
@@ -37,8 +39,13 @@ from sqlalchemy.sql.visitors import Visitable
 
 from sqlalchemy_to_json_schema.decisions import AbstractDecision, RelationDecision
 from sqlalchemy_to_json_schema.exceptions import InvalidStatus
+from sqlalchemy_to_json_schema.paths import PathTrie, as_path_trie, freeze
+from sqlalchemy_to_json_schema.profiling import get_profiler
 from sqlalchemy_to_json_schema.types import ColumnPropertyType
-from sqlalchemy_to_json_schema.walkers import AbstractWalker
+from sqlalchemy_to_json_schema.walkers import AbstractWalker, History
+
+if TYPE_CHECKING:
+    from sqlalchemy_to_json_schema.cache import SchemaCache
 
 Schema = dict[str, Any]
 
@@ -65,7 +72,8 @@ default_column_to_schema: DefaultColumnToSchemaDict = {
     t.Enum: "string",
     t.LargeBinary: "xxx",
     t.JSON: "object",
-    postgresql_types.UUID: "string",
+    # Also the PostgreSQL one, the dialect is not imported until a model needs it
+    t.UUID: "string",
 }
 
 
@@ -104,10 +112,13 @@ default_restriction_dict: RestrictionDict = {
     t.DateTime: datetime_format,
     t.Date: date_format,
     t.Time: time_format,
-    postgresql_types.UUID: uuid_format,
+    t.UUID: uuid_format,
 }
 
 
+DEFAULT_CLASSIFIER_CACHE_SIZE: Final = 1024
+
+
 class Classifier:
     def __init__(
         self,
@@ -116,14 +127,41 @@ class Classifier:
         *,
         see_mro: bool = True,
         see_impl: bool = True,
+        cache_size: int | None = DEFAULT_CLASSIFIER_CACHE_SIZE,
+        preload: bool = False,
     ) -> None:
         self.mapping = mapping
         self.see_mro = see_mro
         self.see_impl = see_impl
+        self.cache_size = cache_size
+
+        # Resolutions are cached per type class, including the "not found" ones
+        self._resolve = lru_cache(maxsize=cache_size)(self._resolve_uncached)
+
+        if preload:
+            self.preload()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The cache is rebuilt by the receiving process
+        state = self.__dict__.copy()
+        del state["_resolve"]
+
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._resolve = lru_cache(maxsize=self.cache_size)(self._resolve_uncached)
 
     def __getitem__(self, k: TypeEngine, /) -> tuple[type[TypeEngine], str]:
         cls = k.__class__
+        mapped = self._resolve(cls)  # type: ignore[arg-type]
+
+        if mapped is None:
+            raise InvalidStatus(f"notfound: {k}. (cls={cls})")
 
+        return cls, mapped
+
+    def _resolve_uncached(self, cls: type[TypeEngine], /) -> str | None:
         _, mapped = get_class_mapping(
             self.mapping,  # type: ignore[arg-type]
             cls,
@@ -131,10 +169,27 @@ class Classifier:
             see_impl=self.see_impl,
         )
 
-        if mapped is None:
-            raise InvalidStatus(f"notfound: {k}. (cls={cls})")
+        return mapped  # type: ignore[return-value]
+
+    def preload(self) -> None:
+        for cls in iter_type_subclasses(TypeEngine):
+            self._resolve(cls)  # type: ignore[arg-type]
+
+    def clear(self) -> None:
+        self._resolve.cache_clear()
 
-        return cls, mapped  # type: ignore[return-value]
+
+def iter_type_subclasses(base: type[TypeEngine], /) -> Iterator[type[TypeEngine]]:
+    seen: set[type[TypeEngine]] = set()
+    pending = [base]
+
+    while pending:
+        for subclass in pending.pop().__subclasses__():
+            if subclass not in seen:
+                seen.add(subclass)
+                pending.append(subclass)
+
+                yield subclass
 
 
 def get_class_mapping(
@@ -170,22 +225,65 @@ def get_class_mapping(
     return None, None
 
 
+class RestrictionTable:
+    def __init__(
+        self,
+        restriction_dict: RestrictionDict = default_restriction_dict,
+        /,
+        *,
+        see_mro: bool = True,
+        see_impl: bool = True,
+    ) -> None:
+        self.restriction_set = [{k: v} for k, v in restriction_dict.items()]
+        self.see_mro = see_mro
+        self.see_impl = see_impl
+
+        # Dispatch table from concrete type class to its restrictions, filled lazily
+        self._compiled: dict[type[TypeEngine], tuple[TypeFormatFn, ...]] = {}
+
+    def __getitem__(self, cls: type[TypeEngine], /) -> tuple[TypeFormatFn, ...]:
+        try:
+            return self._compiled[cls]
+        except KeyError:
+            fns = self._compiled[cls] = self._compile(cls)
+
+            return fns
+
+    def _compile(self, cls: type[TypeEngine], /) -> tuple[TypeFormatFn, ...]:
+        fns: list[TypeFormatFn] = []
+
+        for restriction_dict in self.restriction_set:
+            _, fn = get_class_mapping(
+                restriction_dict, cls, see_mro=self.see_mro, see_impl=self.see_impl
+            )
+            if fn is not None:
+                if isinstance(fn, (list, tuple)):
+                    fns.extend(fn)
+                else:
+                    fns.append(fn)
+
+        return tuple(fns)
+
+    def clear(self) -> None:
+        self._compiled.clear()
+
+
 DefaultClassfier = Classifier(default_column_to_schema)
 
 
 def get_children(
     name: str,
-    params: Sequence[str] | None,
+    params: Mapping[str, Any] | Sequence[str] | None,
     /,
     *,
     splitter: str = ".",
     default: list[str] | None = None,
-) -> list[str] | None:
-    prefix = name + splitter
+) -> dict[str, Any] | list[str] | None:
+    # Kept for the callers of the public helper, the children are resolved by PathTrie
     if isinstance(params, dict):
-        return {k.split(splitter, 1)[1]: v for k, v in params.items() if k.startswith(prefix)}
+        return dict(PathTrie.from_mapping(params, splitter=splitter).child(name).items())
     elif isinstance(params, (list, tuple)):
-        return [e.split(splitter, 1)[1] for e in params if e.startswith(prefix)]
+        return list(PathTrie.from_paths(params, splitter=splitter).child(name))
     else:
         return default
 
@@ -194,21 +292,103 @@ pop_marker = object()
 
 
 class CollectionForOverrides:
-    def __init__(self, params: dict[str, Any], /, *, pop_marker: object = pop_marker) -> None:
-        self.params = params or {}
-        self.not_used_keys = set(params.keys())
+    def __init__(
+        self,
+        params: Mapping[str, Any] | PathTrie | None,
+        /,
+        *,
+        pop_marker: object = pop_marker,
+        splitter: str = ".",
+    ) -> None:
+        if isinstance(params, PathTrie):
+            self.trie = params
+        else:
+            self.trie = PathTrie.from_mapping(params or {}, splitter=splitter)
         self.pop_marker = pop_marker
 
+    @property
+    def params(self) -> dict[str, Any]:
+        return dict(self.trie.items())
+
+    @property
+    def not_used_keys(self) -> set[str]:
+        return self.trie.not_used_paths()
+
     def __contains__(self, k: str, /) -> bool:
-        return k in self.params
+        return k in self.trie
 
-    def overrides(self, basedict: dict[str, Any], /) -> None:
-        for k, v in self.params.items():
+    def overrides(self, basedict: dict[str, Any], k: str | None = None, /) -> None:
+        # Without a key, every override is applied to basedict like before they were kept
+        # by path
+        values = self.params if k is None else self.trie.children[k].value
+
+        for name, v in values.items():
             if v == self.pop_marker:
-                basedict.pop(k, None)
+                basedict.pop(name, None)
             else:
-                basedict[k] = v
-            self.not_used_keys.remove(k)
+                basedict[name] = v
+
+        self.trie.mark_used(values if k is None else [k])
+
+
+@dataclass(frozen=True)
+class References:
+    # Prefix of the $ref values and key of the root schema which holds the definitions
+    prefix: str = "#/definitions/"
+    container: str = "definitions"
+
+    def ref(self, name: str, /) -> dict[str, str]:
+        return {"$ref": f"{self.prefix}{name}"}
+
+
+DEFINITIONS_REFERENCES: Final = References()
+COMPONENTS_REFERENCES: Final = References(prefix="#/components/schemas/")
+
+
+DefinitionKey = tuple[Any, ...]
+
+
+# The definition, the override paths it used and the definitions written while building it
+MemoizedDefinition = tuple[Schema, frozenset[str], dict[str, Schema]]
+
+
+class DefinitionsMemo(dict[DefinitionKey, MemoizedDefinition]):
+    def __init__(self) -> None:
+        super().__init__()
+        # The definitions written in the root schema in order, the last one of a name wins.
+        # A reused definition writes again the ones written while building it
+        self.writes: list[tuple[str, Schema]] = []
+
+    def definition(
+        self,
+        key: DefinitionKey,
+        name: str,
+        root_schema: Schema,
+        container: str,
+        overrides: CollectionForOverrides,
+        build: Callable[[], Schema],
+        /,
+    ) -> Schema:
+        """Build the definition written as `name` once per key, `build` writes it in the root
+        schema"""
+        memoized = self.get(key)
+
+        if memoized is None:
+            start_writes = len(self.writes)
+            definition = build()
+            self.writes.append((name, definition))
+            self[key] = (definition, overrides.trie.used_paths(), dict(self.writes[start_writes:]))
+
+            return definition
+
+        definition, used_paths, writes = memoized
+        # The reused definition used the overrides and wrote the definitions of its build, for
+        # this path too
+        overrides.trie.mark_used(used_paths)
+        root_schema.setdefault(container, {}).update(writes)
+        self.writes.extend(writes.items())
+
+        return definition
 
 
 class ChildFactory:
@@ -229,8 +409,7 @@ class ChildFactory:
         return excludes
 
     def child_overrides(self, prop: MapperProperty, overrides: Any, /) -> Any:
-        name = prop.key
-        children = get_children(name, overrides.params, splitter=self.splitter)
+        children = overrides.trie.child(prop.key)
         return overrides.__class__(children, pop_marker=overrides.pop_marker)
 
     def child_walker(
@@ -242,13 +421,16 @@ class ChildFactory:
         history: Any | None = None,
     ) -> AbstractWalker:
         name = prop.key
-        includes = get_children(name, walker.includes, splitter=self.splitter)
-        excludes = get_children(name, walker.includes, splitter=self.splitter, default=[])
-
-        if excludes is None:
-            excludes = self.default_excludes(prop)
-        else:
-            excludes.extend(self.default_excludes(prop))
+        includes = (
+            None
+            if walker.includes is None
+            else as_path_trie(walker.includes, splitter=self.splitter).child(name)
+        )
+        excludes = (
+            as_path_trie(walker.excludes or (), splitter=self.splitter)
+            .child(name)
+            .extended(self.default_excludes(prop))
+        )
 
         return walker.clone(
             name,
@@ -269,6 +451,8 @@ class ChildFactory:
         *,
         depth: int | None = None,
         history: Any | None = None,
+        memo: DefinitionsMemo | None = None,
+        required: set[str] | None = None,
     ) -> dict[str, Any]:
         subschema = schema_factory._build_properties(
             walker,
@@ -277,6 +461,8 @@ class ChildFactory:
             depth=(depth and depth - 1),
             history=history,
             toplevel=False,
+            memo=memo,
+            required=required,
         )
         if prop.direction == ONETOMANY:
             return {"type": "array", "items": subschema}
@@ -294,14 +480,29 @@ class SchemaFactory:
         restriction_dict: RestrictionDict = default_restriction_dict,
         child_factory: ChildFactory | None = None,
         relation_decision: AbstractDecision | None = None,
+        cache: SchemaCache | None = None,
+        references: References = DEFINITIONS_REFERENCES,
     ) -> None:
         self.classifier = classifier
         self.walker = walker  # class
-        self.restriction_set = [{k: v} for k, v in restriction_dict.items()]
+        self.restrictions = RestrictionTable(
+            restriction_dict, see_mro=classifier.see_mro, see_impl=classifier.see_impl
+        )
         self.child_factory = ChildFactory() if child_factory is None else child_factory
         self.relation_decision = (
             RelationDecision() if relation_decision is None else relation_decision
         )
+        self.cache = cache
+        self.references = references
+
+    def with_references(self, references: References, /) -> SchemaFactory:
+        if references == self.references:
+            return self
+
+        schema_factory = copy(self)
+        schema_factory.references = references
+
+        return schema_factory
 
     def __call__(
         self,
@@ -314,13 +515,66 @@ class SchemaFactory:
         depth: int | None = None,
         adjust_required: Callable[[MapperProperty, bool], bool] | None = None,
     ) -> Schema:
-        walker = self.walker(model, includes=includes, excludes=excludes)
-        overrides_manager = CollectionForOverrides(overrides or {})
+        # The adjust_required callback can't be fingerprinted, those schemas are not cached
+        if self.cache is None or adjust_required is not None:
+            return self._build_schema(
+                model,
+                includes=includes,
+                excludes=excludes,
+                overrides=overrides,
+                depth=depth,
+                adjust_required=adjust_required,
+            )
 
-        schema: dict[str, Any] = {"title": model.__name__, "type": "object"}
-        schema["properties"] = self._build_properties(
-            walker, schema, overrides_manager, depth=depth
+        key = self.cache.fingerprint(
+            self, model, includes=includes, excludes=excludes, overrides=overrides, depth=depth
+        )
+        schema = self.cache.get(key)
+
+        if schema is None:
+            schema = self._build_schema(
+                model, includes=includes, excludes=excludes, overrides=overrides, depth=depth
+            )
+            self.cache.set(key, schema)
+
+        return schema
+
+    def _build_schema(
+        self,
+        model: DeclarativeMeta,
+        /,
+        *,
+        includes: Sequence[str] | None = None,
+        excludes: Sequence[str] | None = None,
+        overrides: dict | None = None,
+        depth: int | None = None,
+        adjust_required: Callable[[MapperProperty, bool], bool] | None = None,
+    ) -> Schema:
+        splitter = self.child_factory.splitter
+        walker = self.walker(
+            model,
+            includes=(
+                None if includes is None else PathTrie.from_paths(includes, splitter=splitter)
+            ),
+            excludes=(
+                None if excludes is None else PathTrie.from_paths(excludes, splitter=splitter)
+            ),
         )
+        overrides_manager = CollectionForOverrides(overrides or {}, splitter=splitter)
+
+        required_set: set[str] = set()
+
+        schema: dict[str, Any] = {"title": model.__name__, "type": "object"}
+
+        with get_profiler().phase("build_properties", model=model.__name__):
+            schema["properties"] = self._build_properties(
+                walker,
+                schema,
+                overrides_manager,
+                depth=depth,
+                required=required_set,
+                adjust_required=adjust_required,
+            )
 
         if overrides_manager.not_used_keys:
             raise InvalidStatus(f"invalid overrides: {overrides_manager.not_used_keys}")
@@ -328,7 +582,7 @@ class SchemaFactory:
         if model.__doc__:
             schema["description"] = model.__doc__
 
-        required = self._detect_required(walker, adjust_required=adjust_required)
+        required = sort_required(required_set)
 
         if required:
             schema["required"] = required
@@ -347,19 +601,24 @@ class SchemaFactory:
     def _add_restriction_if_found(
         self, data: dict[str, Any], column: NamedColumn, itype: type[TypeEngine], /
     ) -> None:
-        for restriction_dict in self.restriction_set:
-            _, fn = get_class_mapping(
-                restriction_dict,
-                itype,
-                see_impl=self.classifier.see_impl,
-                see_mro=self.classifier.see_mro,
-            )
-            if fn is not None:
-                if isinstance(fn, (list, tuple)):
-                    for f in fn:
-                        f(column, data)
-                else:
-                    fn(column, data)
+        for fn in self.restrictions[itype]:
+            fn(column, data)
+
+    def column_schema(self, column: NamedColumn, /) -> Schema:
+        # Shared with `TableSchemaFactory`, the columns of a Table have the same schemas
+        if type(column.type) is Visitable:
+            raise NotImplementedError
+
+        sub: Schema = {}
+        itype, sub["type"] = self.classifier[column.type]
+
+        self._add_restriction_if_found(sub, column, itype)
+        self._add_items_if_array(sub, column, itype)
+
+        if column.doc:
+            sub["description"] = column.doc
+
+        return sub
 
     def _add_property_with_reference(
         self,
@@ -368,25 +627,80 @@ class SchemaFactory:
         current_schema: dict[str, Any],
         prop: MapperProperty,
         val: dict[str, Any],
+        required: list[str],
         /,
-    ) -> None:
+    ) -> Schema:
         clsname = prop.mapper.class_.__name__
-        if "definitions" not in root_schema:
-            root_schema["definitions"] = {}
+        container = self.references.container
+        if container not in root_schema:
+            root_schema[container] = {}
 
         if val["type"] == "object":
-            current_schema[prop.key] = {"$ref": f"#/definitions/{clsname}"}
-            val["required"] = self._detect_required(walker.from_child(prop.mapper))
-            root_schema["definitions"][clsname] = val
+            current_schema[prop.key] = self.references.ref(clsname)
+            val["required"] = required
+            root_schema[container][clsname] = val
         else:  # array
             current_schema[prop.key] = {
                 "type": "array",
-                "items": {"$ref": f"#/definitions/{clsname}"},
+                "items": self.references.ref(clsname),
             }
             val["type"] = "object"
             val["properties"] = val.pop("items")
-            val["required"] = self._detect_required(walker.from_child(prop.mapper))
-            root_schema["definitions"][clsname] = val
+            val["required"] = required
+            root_schema[container][clsname] = val
+
+        return val
+
+    def _build_definition(
+        self,
+        walker: AbstractWalker,
+        root_schema: Schema,
+        current_schema: dict[str, Any],
+        prop: MapperProperty,
+        subwalker: AbstractWalker,
+        suboverrides: CollectionForOverrides,
+        /,
+        *,
+        depth: int | None,
+        history: History,
+        memo: DefinitionsMemo,
+    ) -> Schema:
+        required: set[str] = set()
+        value = self.child_factory.child_schema(
+            prop,
+            self,
+            root_schema,
+            subwalker,
+            suboverrides,
+            depth=depth,
+            history=history,
+            memo=memo,
+            required=required,
+        )
+
+        return self._add_property_with_reference(
+            walker, root_schema, current_schema, prop, value, sort_required(required)
+        )
+
+    def _add_reference(
+        self,
+        root_schema: Schema,
+        current_schema: dict[str, Any],
+        prop: MapperProperty,
+        definition: Schema,
+        /,
+    ) -> None:
+        clsname = prop.mapper.class_.__name__
+
+        if prop.direction == ONETOMANY:
+            current_schema[prop.key] = {
+                "type": "array",
+                "items": self.references.ref(clsname),
+            }
+        else:
+            current_schema[prop.key] = self.references.ref(clsname)
+
+        root_schema[self.references.container][clsname] = definition
 
     def _build_properties(
         self,
@@ -396,18 +710,34 @@ class SchemaFactory:
         /,
         *,
         depth: int | None = None,
-        history: list[MapperProperty] | None = None,
+        history: History | None = None,
         toplevel: bool = True,
+        memo: DefinitionsMemo | None = None,
+        required: set[str] | None = None,
+        adjust_required: Callable[[MapperProperty, bool], bool] | None = None,
     ) -> dict[str, Any]:
         definitions: dict[str, Any] = {}
 
         if depth is not None and depth <= 0:
+            # The properties are not built but the required ones are still reported
+            if required is not None:
+                for walked_prop in walker.walk():
+                    self._add_required_if_found(
+                        required, walked_prop, adjust_required=adjust_required
+                    )
+
             return definitions
 
         if history is None:
-            history = []
+            history = History()
+
+        if memo is None:
+            memo = DefinitionsMemo()
 
         for walked_prop in walker.walk():
+            if required is not None:
+                self._add_required_if_found(required, walked_prop, adjust_required=adjust_required)
+
             for action, prop, opts in self.relation_decision.decision(
                 walker, walked_prop, toplevel=toplevel
             ):
@@ -415,72 +745,81 @@ class SchemaFactory:
                     history.append(prop)
                     subwalker = self.child_factory.child_walker(prop, walker, history=history)
                     suboverrides = self.child_factory.child_overrides(prop, overrides)
-                    value = self.child_factory.child_schema(
-                        prop,
-                        self,
+
+                    # Each related mapper's definition is built once per run for the same
+                    # includes, excludes, overrides and remaining depth. The history is not
+                    # part of the key: StructuralWalker skips the relationships already walked
+                    # and UseForeignKeyIfPossibleDecision compares with the first one, so with
+                    # them a reused definition keeps the relationships of the path it was first
+                    # built on and can differ from the one a full build makes for this path
+                    key = (
+                        prop.mapper,
+                        freeze(subwalker.includes),
+                        freeze(subwalker.excludes),
+                        freeze(suboverrides.params),
+                        depth,
+                    )
+                    definition = memo.definition(
+                        key,
+                        prop.mapper.class_.__name__,
                         root_schema,
-                        subwalker,
+                        self.references.container,
                         suboverrides,
-                        depth=depth,
-                        history=history,
-                    )
-                    self._add_property_with_reference(
-                        walker, root_schema, definitions, prop, value
+                        lambda: self._build_definition(
+                            walker,
+                            root_schema,
+                            definitions,
+                            prop,
+                            subwalker,
+                            suboverrides,
+                            depth=depth,
+                            history=history,
+                            memo=memo,
+                        ),
                     )
+                    self._add_reference(root_schema, definitions, prop, definition)
                     history.pop()
                 elif action == ColumnPropertyType.FOREIGNKEY:  # ColumnProperty
                     for column in prop.columns:
-                        sub = {}
-                        if type(column.type) is not Visitable:
-                            itype, sub["type"] = self.classifier[column.type]
-
-                            self._add_restriction_if_found(sub, column, itype)
-                            self._add_items_if_array(sub, column, itype)
+                        sub = self.column_schema(column)
 
-                            if column.doc:
-                                sub["description"] = column.doc
+                        if overrides is None:
+                            raise RuntimeError("overrides is None")
 
-                            if overrides is None:
-                                raise RuntimeError("overrides is None")
+                        if column.name in overrides:
+                            overrides.overrides(sub, column.name)
+                        if opts:
+                            sub.update(opts)
 
-                            if column.name in overrides:
-                                overrides.overrides(sub)
-                            if opts:
-                                sub.update(opts)
+                        # Ensure that the column name is a string object
+                        # It can be a quoted_name() instance
+                        column_name = str(column.name)
 
-                            # Ensure that the column name is a string object
-                            # It can be a quoted_name() instance
-                            column_name = str(column.name)
-
-                            definitions[column_name] = sub
-                        else:
-                            raise NotImplementedError
+                        definitions[column_name] = sub
                 else:  # immediate
                     definitions[prop.key] = action
         return definitions
 
-    def _detect_required(
+    def _add_required_if_found(
         self,
-        walker: AbstractWalker,
+        required: set[str],
+        prop: MapperProperty,
         /,
         *,
         adjust_required: Callable[[MapperProperty, bool], bool] | None = None,
-    ) -> list[str]:
-        required_properties_set = set()
-
-        for prop in walker.walk():
-            columns = getattr(prop, "columns", {})
+    ) -> None:
+        columns = getattr(prop, "columns", {})
 
-            for column in columns:
-                required = not column.nullable
+        for column in columns:
+            is_required = not column.nullable
 
-                if adjust_required is not None:
-                    required = adjust_required(prop, required)
-                if required:
-                    required_properties_set.add(column.key)
+            if adjust_required is not None:
+                is_required = adjust_required(prop, is_required)
+            if is_required:
+                required.add(column.key)
 
-        # Ensure that the column name is a string object
-        # It can be a quoted_name() instance
-        required_properties = sorted(str(item) for item in required_properties_set)
 
-        return required_properties
+def sort_required(required: set[str], /) -> list[str]:
+    # Ensure that the column name is a string object
+    # It can be a quoted_name() instance
+    return sorted(str(item) for item in required)
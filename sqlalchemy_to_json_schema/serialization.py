@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from operator import attrgetter
+from threading import Lock
+from typing import Any, Final, Union, cast
+
+from sqlalchemy.ext.declarative import DeclarativeMeta
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import Mapper
+
+from sqlalchemy_to_json_schema.codegen import resolve_pointer
+from sqlalchemy_to_json_schema.paths import freeze
+from sqlalchemy_to_json_schema.schema_factory import (
+    DEFINITIONS_REFERENCES,
+    Schema,
+    SchemaFactory,
+)
+from sqlalchemy_to_json_schema.validation import get_converter
+
+DEFAULT_SERIALIZER_CACHE_SIZE: Final = 128
+MISSING: Final = object()
+
+Transform = Callable[[Any], Any]
+
+
+# (property name, attribute, getter, transform, nested plan, array of the nested plan)
+Accessor = tuple[
+    str, str, Callable[[Any], Any], Union[Transform, None], Union["SerializerPlan", None], bool
+]
+
+
+class SerializerPlan:
+    def __init__(self, mapper: Mapper, /, *, depth: int | None = None) -> None:
+        self.mapper = mapper
+        # Levels of nested instances serialized, the same as the depth of the schema
+        self.depth = depth
+        # In the order of the schema's properties
+        self.accessors: tuple[Accessor, ...] = ()
+
+    @classmethod
+    def from_schema(
+        cls, mapper: Mapper, schema: Schema, /, *, depth: int | None = None
+    ) -> SerializerPlan:
+        plan = cls(mapper, depth=depth)
+        plan._compile(schema, schema, {})
+
+        return plan
+
+    def _compile(
+        self, definition: Schema, root: Schema, memo: dict[str, SerializerPlan], /
+    ) -> None:
+        mapper = self.mapper
+        # The properties are named after the table's columns, not the attributes
+        columns = {
+            str(column.name): (prop.key, column)
+            for prop in mapper.column_attrs
+            for column in prop.columns
+        }
+        accessors: list[Accessor] = []
+
+        def nested(ref: str, mapper: Mapper) -> SerializerPlan:
+            # The plans of the definitions are shared, a plan is memoized before it's compiled
+            # because the references can be recursive
+            if ref not in memo:
+                memo[ref] = self.__class__(mapper)
+                memo[ref]._compile(resolve_pointer(root, ref), root, memo)
+            return memo[ref]
+
+        for name, subschema in definition.get("properties", {}).items():
+            if name in mapper.relationships:
+                relationship = mapper.relationships[name]
+                items = subschema.get("items", {})
+                getter = attrgetter(name)
+
+                if "$ref" in subschema:
+                    plan = nested(subschema["$ref"], relationship.mapper)
+                    accessors.append((name, name, getter, None, plan, False))
+                elif "$ref" in items:
+                    plan = nested(items["$ref"], relationship.mapper)
+                    accessors.append((name, name, getter, None, plan, True))
+                else:
+                    # A many to many relationship skipped by the foreign key decision
+                    accessors.append(
+                        (name, name, getter, identities(relationship.mapper), None, False)
+                    )
+            elif name in columns:
+                key, column = columns[name]
+                converter = get_converter(column.type, schema_type=subschema.get("type"))
+                accessors.append((name, key, attrgetter(key), converter, None, False))
+            else:
+                raise ValueError(f"No attribute of {mapper.class_.__name__} for {name}")
+
+        self.accessors = tuple(accessors)
+
+    def __call__(self, instance: Any, /) -> dict[str, Any]:
+        return self._serialize(instance, self.depth, set())
+
+    def many(self, instances: Iterable[Any], /) -> list[dict[str, Any]]:
+        return [self(instance) for instance in instances]
+
+    def _serialize(
+        self, instance: Any, depth: int | None, ancestors: set[int], /
+    ) -> dict[str, Any]:
+        data = {}
+        # The loaded values are read without the instrumentation, the others are loaded
+        state = instance.__dict__
+        # The definitions can reference each other, the nested instances are serialized up
+        # to the depth and never inside themselves
+        nesting = depth is None or depth > 0
+        subdepth = depth and depth - 1
+        ancestors.add(id(instance))
+
+        # A NULL is an absent property, the output is valid against the schema
+        for name, key, getter, transform, plan, many in self.accessors:
+            value = state.get(key, MISSING)
+            if value is MISSING:
+                value = getter(instance)
+            if value is None:
+                continue
+
+            if plan is None:
+                data[name] = value if transform is None else transform(value)
+            elif not nesting:
+                continue
+            elif many:
+                data[name] = [
+                    plan._serialize(item, subdepth, ancestors)
+                    for item in value
+                    if id(item) not in ancestors
+                ]
+            elif id(value) not in ancestors:
+                data[name] = plan._serialize(value, subdepth, ancestors)
+
+        ancestors.discard(id(instance))
+
+        return data
+
+
+def identities(mapper: Mapper, /) -> Transform:
+    def transform(instances: Iterable[Any]) -> list[str]:
+        # The composite primary keys are joined with commas
+        return [
+            ",".join(str(value) for value in mapper.primary_key_from_instance(instance))
+            for instance in instances
+        ]
+
+    return transform
+
+
+class InstanceSerializer:
+    def __init__(
+        self,
+        schema_factory: SchemaFactory,
+        /,
+        *,
+        maxsize: int = DEFAULT_SERIALIZER_CACHE_SIZE,
+    ) -> None:
+        # The plans follow the references, they must be resolved in the schema itself
+        self.schema_factory = schema_factory.with_references(DEFINITIONS_REFERENCES)
+        self.maxsize = maxsize
+        self._plans: OrderedDict[Hashable, SerializerPlan] = OrderedDict()
+        self._lock = Lock()
+
+    def get_plan(
+        self,
+        model: DeclarativeMeta,
+        /,
+        *,
+        includes: Sequence[str] | None = None,
+        excludes: Sequence[str] | None = None,
+        overrides: dict | None = None,
+        depth: int | None = None,
+    ) -> SerializerPlan:
+        key = (model, freeze(includes), freeze(excludes), freeze(overrides), depth)
+
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return plan
+
+        schema = self.schema_factory(
+            model, includes=includes, excludes=excludes, overrides=overrides, depth=depth
+        )
+        plan = SerializerPlan.from_schema(inspect(model).mapper, schema, depth=depth)
+
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+
+        return plan
+
+    def serialize(
+        self,
+        instance: Any,
+        /,
+        *,
+        includes: Sequence[str] | None = None,
+        excludes: Sequence[str] | None = None,
+        overrides: dict | None = None,
+        depth: int | None = None,
+    ) -> dict[str, Any]:
+        plan = self.get_plan(
+            cast(DeclarativeMeta, type(instance)),
+            includes=includes,
+            excludes=excludes,
+            overrides=overrides,
+            depth=depth,
+        )
+
+        return plan(instance)
+
+    def serialize_many(
+        self,
+        instances: Iterable[Any],
+        /,
+        *,
+        includes: Sequence[str] | None = None,
+        excludes: Sequence[str] | None = None,
+        overrides: dict | None = None,
+        depth: int | None = None,
+    ) -> list[dict[str, Any]]:
+        plans: dict[type, SerializerPlan] = {}
+        data = []
+
+        # The plan is looked up once for each class of the instances
+        for instance in instances:
+            plan = plans.get(type(instance))
+            if plan is None:
+                plan = plans[type(instance)] = self.get_plan(
+                    cast(DeclarativeMeta, type(instance)),
+                    includes=includes,
+                    excludes=excludes,
+                    overrides=overrides,
+                    depth=depth,
+                )
+            data.append(plan(instance))
+
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from collections.abc import Collection, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Final, Union
+
+from sqlalchemy import Column, ForeignKeyConstraint, MetaData, Table
+from sqlalchemy.orm import RelationshipDirection
+from sqlalchemy.orm.base import MANYTOONE, ONETOMANY
+
+from sqlalchemy_to_json_schema.exceptions import InvalidStatus
+from sqlalchemy_to_json_schema.paths import PathTrie, as_path_trie, freeze
+from sqlalchemy_to_json_schema.schema_factory import (
+    CollectionForOverrides,
+    DefinitionsMemo,
+    Schema,
+    SchemaFactory,
+    sort_required,
+)
+from sqlalchemy_to_json_schema.walkers import ForeignKeyWalker, History
+
+DEFAULT_METADATA_CACHE_SIZE: Final = 16
+
+
+# A foreign key constraint seen from one of its tables, named like automap names the relationships
+@dataclass(frozen=True)
+class TableReference:
+    key: str
+    constraint: ForeignKeyConstraint
+    target: Table
+    direction: RelationshipDirection
+    # Name of the reference in the other direction, excluded from the target's definition
+    backref: str
+
+
+@dataclass(frozen=True)
+class TablePlan:
+    table: Table
+    columns: tuple[Column, ...]
+    foreign_key_columns: frozenset[Column]
+    references: tuple[TableReference, ...]
+
+
+def build_table_plans(metadata: MetaData, /) -> dict[Table, TablePlan]:
+    outgoing: dict[Table, list[TableReference]] = {}
+    incoming: dict[Table, list[TableReference]] = {}
+
+    # One pass over the constraints, the incoming references don't scan every table
+    for table in metadata.tables.values():
+        constraints = sorted(table.foreign_key_constraints, key=lambda c: tuple(c.column_keys))
+        targets = Counter(constraint.referred_table for constraint in constraints)
+
+        for constraint in constraints:
+            target = constraint.referred_table
+            scalar = target.name.lower()
+            collection = f"{table.name.lower()}_collection"
+            # The foreign keys to the same table are told apart by their columns,
+            # e.g. `created_by_user` and `doc_created_by_collection`
+            if targets[target] > 1:
+                columns = "_".join(str(column.name) for column in constraint.columns)
+                scalar = f"{columns}_{scalar}"
+                collection = f"{table.name.lower()}_{columns}_collection"
+
+            outgoing.setdefault(table, []).append(
+                TableReference(scalar, constraint, target, MANYTOONE, collection)
+            )
+            incoming.setdefault(target, []).append(
+                TableReference(collection, constraint, table, ONETOMANY, scalar)
+            )
+
+    plans = {}
+
+    for table in metadata.tables.values():
+        references = (*outgoing.get(table, ()), *incoming.get(table, ()))
+        keys = Counter(reference.key for reference in references)
+        collisions = sorted(key for key, count in keys.items() if count > 1)
+        if collisions:
+            raise InvalidStatus(f"Conflict references={collisions} of table={table.name}")
+
+        plans[table] = TablePlan(
+            table=table,
+            columns=tuple(table.columns),
+            foreign_key_columns=frozenset(
+                column for column in table.columns if column.foreign_keys
+            ),
+            references=references,
+        )
+
+    return plans
+
+
+class TablePlanCache:
+    def __init__(self, *, maxsize: int = DEFAULT_METADATA_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._plans: OrderedDict[MetaData, dict[Table, TablePlan]] = OrderedDict()
+
+    def __getitem__(self, table: Table, /) -> TablePlan:
+        metadata = table.metadata
+        plans = self._plans.get(metadata)
+
+        # The plans of a MetaData are rebuilt together once a table is added or removed
+        if plans is None or table not in plans or len(plans) != len(metadata.tables):
+            plans = self._plans[metadata] = build_table_plans(metadata)
+
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        else:
+            self._plans.move_to_end(metadata)
+
+        return plans[table]
+
+    def clear(self) -> None:
+        self._plans.clear()
+
+
+table_plans = TablePlanCache()
+
+
+def get_table_plan(table: Table, /) -> TablePlan:
+    return table_plans[table]
+
+
+TableProperty = Union[Column, TableReference]
+
+
+class AbstractTableWalker(ABC):
+    def __init__(
+        self,
+        table: Table,
+        /,
+        *,
+        includes: Collection[str] | None = None,
+        excludes: Collection[str] | None = None,
+        history: Iterable[TableReference] | None = None,
+    ) -> None:
+        self.plan = get_table_plan(table)
+        self.table = table
+        self.includes = includes
+        self.excludes = excludes
+        self.history: History[TableReference]
+        if history is None:
+            self.history = History()
+        elif isinstance(history, History):
+            self.history = history
+        else:
+            self.history = History(history)
+        if includes and excludes:
+            if set(includes).intersection(excludes):
+                raise InvalidStatus(f"Conflict includes={includes}, exclude={excludes}")
+
+    def clone(
+        self,
+        table: Table,
+        /,
+        *,
+        includes: Collection[str] | None = None,
+        excludes: Collection[str] | None = None,
+        history: Iterable[TableReference] | None = None,
+    ) -> AbstractTableWalker:
+        return self.__class__(table, includes=includes, excludes=excludes, history=history)
+
+    def is_selected(self, key: str, /) -> bool:
+        return (self.includes is None or key in self.includes) and (
+            self.excludes is None or key not in self.excludes
+        )
+
+    def walk_columns(self, *, foreign_keys: bool = True) -> Iterator[Column]:
+        for column in self.plan.columns:
+            if self.is_selected(column.key):
+                if foreign_keys or column not in self.plan.foreign_key_columns:
+                    yield column
+
+    @abstractmethod
+    def walk(self) -> Iterator[TableProperty]:
+        pass
+
+
+# Same properties as the ORM walkers of the same names, the foreign keys replace the relationships
+
+
+class ForeignKeyTableWalker(AbstractTableWalker):
+    def walk(self) -> Iterator[TableProperty]:
+        return self.walk_columns()
+
+
+class NoForeignKeyTableWalker(AbstractTableWalker):
+    def walk(self) -> Iterator[TableProperty]:
+        return self.walk_columns(foreign_keys=False)
+
+
+class StructuralTableWalker(AbstractTableWalker):
+    def walk(self) -> Iterator[TableProperty]:
+        yield from self.walk_columns(foreign_keys=False)
+
+        for reference in self.plan.references:
+            if self.is_selected(reference.key):
+                if reference not in self.history:
+                    yield reference
+
+
+class TableSchemaFactory:
+    def __init__(
+        self,
+        walker: type[AbstractTableWalker],
+        /,
+        *,
+        schema_factory: SchemaFactory | None = None,
+    ) -> None:
+        self.walker = walker  # class
+        # The column schemas, the splitter and the references are the ones of the ORM path
+        self.schema_factory = (
+            SchemaFactory(ForeignKeyWalker) if schema_factory is None else schema_factory
+        )
+
+    def __call__(
+        self,
+        table: Table,
+        /,
+        *,
+        includes: Sequence[str] | None = None,
+        excludes: Sequence[str] | None = None,
+        overrides: dict | None = None,
+        depth: int | None = None,
+    ) -> Schema:
+        splitter = self.schema_factory.child_factory.splitter
+        walker = self.walker(
+            table,
+            includes=(
+                None if includes is None else PathTrie.from_paths(includes, splitter=splitter)
+            ),
+            excludes=(
+                None if excludes is None else PathTrie.from_paths(excludes, splitter=splitter)
+            ),
+        )
+        overrides_manager = CollectionForOverrides(overrides or {}, splitter=splitter)
+
+        required: set[str] = set()
+        schema: Schema = {"title": str(table.name), "type": "object"}
+        schema["properties"] = self._build_properties(
+            walker,
+            schema,
+            overrides_manager,
+            depth=depth,
+            required=required,
+            memo=DefinitionsMemo(),
+        )
+
+        if overrides_manager.not_used_keys:
+            raise InvalidStatus(f"invalid overrides: {overrides_manager.not_used_keys}")
+
+        if required:
+            schema["required"] = sort_required(required)
+
+        return schema
+
+    def schemas(self, metadata: MetaData, /, *, depth: int | None = None) -> dict[str, Schema]:
+        return {str(table.name): self(table, depth=depth) for table in metadata.tables.values()}
+
+    def _build_definition(
+        self,
+        walker: AbstractTableWalker,
+        root_schema: Schema,
+        overrides: CollectionForOverrides,
+        name: str,
+        /,
+        *,
+        depth: int | None,
+        memo: DefinitionsMemo,
+    ) -> Schema:
+        required: set[str] = set()
+        properties = self._build_properties(
+            walker,
+            root_schema,
+            overrides,
+            depth=(depth and depth - 1),
+            required=required,
+            memo=memo,
+        )
+        definition: Schema = {
+            "type": "object",
+            "properties": properties,
+            "required": sort_required(required),
+        }
+        root_schema.setdefault(self.schema_factory.references.container, {})[name] = definition
+
+        return definition
+
+    def _build_properties(
+        self,
+        walker: AbstractTableWalker,
+        root_schema: Schema,
+        overrides: CollectionForOverrides,
+        /,
+        *,
+        depth: int | None,
+        required: set[str],
+        memo: DefinitionsMemo,
+    ) -> dict[str, Schema]:
+        properties: dict[str, Schema] = {}
+        references = self.schema_factory.references
+        history = walker.history
+
+        for prop in walker.walk():
+            if isinstance(prop, Column) and not prop.nullable:
+                required.add(prop.key)
+
+        # The properties are not built but the required ones are still reported
+        if depth is not None and depth <= 0:
+            return properties
+
+        for prop in walker.walk():
+            if isinstance(prop, TableReference):
+                splitter = self.schema_factory.child_factory.splitter
+                history.append(prop)
+                subwalker = walker.clone(
+                    prop.target,
+                    includes=(
+                        None
+                        if walker.includes is None
+                        else as_path_trie(walker.includes, splitter=splitter).child(prop.key)
+                    ),
+                    excludes=(
+                        as_path_trie(walker.excludes or (), splitter=splitter)
+                        .child(prop.key)
+                        .extended([prop.backref])
+                    ),
+                    history=history,
+                )
+                suboverrides = CollectionForOverrides(
+                    overrides.trie.child(prop.key), pop_marker=overrides.pop_marker
+                )
+                name = str(prop.target.name)
+
+                # Each target's definition is built once for the same options, whatever the
+                # history, like the definitions of the models
+                key = (
+                    prop.target,
+                    freeze(subwalker.includes),
+                    freeze(subwalker.excludes),
+                    freeze(suboverrides.params),
+                    depth,
+                )
+                memo.definition(
+                    key,
+                    name,
+                    root_schema,
+                    references.container,
+                    suboverrides,
+                    lambda: self._build_definition(
+                        subwalker,
+                        root_schema,
+                        suboverrides,
+                        name,
+                        depth=depth,
+                        memo=memo,
+                    ),
+                )
+                history.pop()
+
+                if prop.direction == ONETOMANY:
+                    properties[prop.key] = {"type": "array", "items": references.ref(name)}
+                else:
+                    properties[prop.key] = references.ref(name)
+            else:
+                sub = self.schema_factory.column_schema(prop)
+
+                if prop.name in overrides:
+                    overrides.overrides(sub, prop.name)
+
+                properties[str(prop.name)] = sub
+
+        return properties
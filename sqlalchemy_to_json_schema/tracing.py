@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Final
+
+TRACING_ENV_VAR: Final = "SQLALCHEMY_TO_JSON_SCHEMA_TRACE"
+
+# The debug logs of the hot paths (walkers, model collection) are only emitted when
+# enabled, loguru builds a record for every call even when its level is filtered out
+enabled: bool = os.environ.get(TRACING_ENV_VAR, "") not in ("", "0")
+
+
+def set_tracing(value: bool, /) -> None:
+    global enabled
+
+    enabled = value
+
+
+@contextmanager
+def traced(value: bool = True, /) -> Iterator[None]:
+    previous = enabled
+    set_tracing(value)
+
+    try:
+        yield
+    finally:
+        set_tracing(previous)
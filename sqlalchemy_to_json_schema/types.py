@@ -33,3 +33,18 @@ class Walker(Enum):
 class Decision(Enum):
     DEFAULT = "default"
     USE_FOREIGN_KEY = "useforeignkey"
+
+
+@unique
+class Backend(Enum):
+    JSON = "json"
+    ORJSON = "orjson"
+    PYYAML = "pyyaml"
+    LIBYAML = "libyaml"
+
+
+@unique
+class Style(Enum):
+    DEFAULT = "default"
+    COMPACT = "compact"
+    PRETTY = "pretty"
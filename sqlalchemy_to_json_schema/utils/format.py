@@ -1,11 +1,22 @@
-from datetime import date, time
-from typing import Optional
+import re
+from datetime import date, datetime, time
+from typing import Final, Optional
 
-from dateutil import parser
+from dateutil import parser, tz
 from dateutil.parser import ParserError
 
+# The strict ISO 8601 shapes are parsed without dateutil, anything else falls back to it
+DATE_PATTERN: Final = re.compile(
+    r"(?P<year>[0-9]{4})(?P<separator>-?)(?P<month>[0-9]{2})(?P=separator)(?P<day>[0-9]{2})"
+)
+TIME_PATTERN: Final = re.compile(
+    r"(?P<hour>[0-9]{2}):(?P<minute>[0-9]{2})"
+    r"(?::(?P<second>[0-9]{2})(?:\.(?P<fraction>[0-9]{1,6}))?)?"
+    r"(?:(?P<utc>Z)|(?P<sign>[+-])(?P<offset_hour>[0-9]{2})(?::?(?P<offset_minute>[0-9]{2}))?)?"
+)
 
-def parse_date(date_string: str, /) -> Optional[date]:
+
+def parse_date_with_dateutil(date_string: str, /) -> Optional[date]:
     try:
         timestamp = parser.isoparse(date_string)
     except ValueError:
@@ -14,11 +25,35 @@ def parse_date(date_string: str, /) -> Optional[date]:
     return timestamp.date()
 
 
+def parse_date(date_string: str, /) -> Optional[date]:
+    match = DATE_PATTERN.fullmatch(date_string)
+
+    # Built from the groups, date.fromisoformat() reads the basic format from Python 3.11 only
+    if match is not None:
+        try:
+            return date(int(match["year"]), int(match["month"]), int(match["day"]))
+        except ValueError:
+            pass
+
+    return parse_date_with_dateutil(date_string)
+
+
 def validate_date(date_string: str, /) -> bool:
     return parse_date(date_string) is not None
 
 
-def parse_time(time_string: str, /) -> Optional[time]:
+def parse_datetime(datetime_string: str, /) -> Optional[datetime]:
+    try:
+        return parser.isoparse(datetime_string)
+    except ValueError:
+        return None
+
+
+def validate_datetime(datetime_string: str, /) -> bool:
+    return parse_datetime(datetime_string) is not None
+
+
+def parse_time_with_dateutil(time_string: str, /) -> Optional[time]:
     try:
         timestamp = parser.parse(time_string)
     except ParserError:
@@ -30,5 +65,32 @@ def parse_time(time_string: str, /) -> Optional[time]:
     return time_value
 
 
+def parse_time(time_string: str, /) -> Optional[time]:
+    match = TIME_PATTERN.fullmatch(time_string)
+
+    if match is not None:
+        offset = int(match["offset_hour"] or 0) * 3600 + int(match["offset_minute"] or 0) * 60
+        if match["sign"] == "-":
+            offset = -offset
+
+        # Same time zones as dateutil, except that a zero offset is always UTC
+        # where dateutil returns tzlocal() if the local time zone is UTC
+        tzinfo = tz.UTC if match["utc"] or match["sign"] else None
+
+        # Out of range values are left to dateutil, which has its own errors
+        try:
+            return time(
+                int(match["hour"]),
+                int(match["minute"]),
+                int(match["second"] or 0),
+                int((match["fraction"] or "0").ljust(6, "0")),
+                tzinfo=tz.tzoffset(None, offset) if offset else tzinfo,
+            )
+        except ValueError:
+            pass
+
+    return parse_time_with_dateutil(time_string)
+
+
 def validate_time(time_string: str, /) -> bool:
     return parse_time(time_string) is not None
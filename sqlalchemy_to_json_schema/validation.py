@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import enum
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date, time
+from operator import attrgetter
+from threading import Lock
+from typing import Any, Final, Protocol
+
+import sqlalchemy.types as t
+from jsonschema import Draft7Validator, FormatChecker
+from jsonschema.exceptions import ValidationError
+from sqlalchemy import Select
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.declarative import DeclarativeMeta
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import Mapper, Session
+
+from sqlalchemy_to_json_schema.paths import freeze
+from sqlalchemy_to_json_schema.schema_factory import (
+    DEFINITIONS_REFERENCES,
+    SchemaFactory,
+)
+from sqlalchemy_to_json_schema.utils.format import (
+    validate_date,
+    validate_datetime,
+    validate_time,
+)
+
+DEFAULT_VALIDATOR_CACHE_SIZE: Final = 128
+DEFAULT_CHUNK_SIZE: Final = 1000
+
+Converter = Callable[[Any], Any]
+
+
+def make_format_checker() -> FormatChecker:
+    format_checker = FormatChecker()
+
+    # The formats only apply to strings, other types are checked by "type"
+    @format_checker.checks("date")
+    def check_date(instance: object) -> bool:
+        return not isinstance(instance, str) or validate_date(instance)
+
+    @format_checker.checks("time")
+    def check_time(instance: object) -> bool:
+        return not isinstance(instance, str) or validate_time(instance)
+
+    @format_checker.checks("date-time")
+    def check_datetime(instance: object) -> bool:
+        return not isinstance(instance, str) or validate_datetime(instance)
+
+    return format_checker
+
+
+def isoformat(value: date | time) -> str:
+    return value.isoformat()
+
+
+def enum_name(value: Any) -> Any:
+    # The schemas list the names of the Python enums
+    return value.name if isinstance(value, enum.Enum) else value
+
+
+def get_converter(column_type: t.TypeEngine, /, *, schema_type: Any = None) -> Converter | None:
+    # The schemas of the decorated types are the ones of their implementations
+    while isinstance(column_type, t.TypeDecorator):
+        column_type = column_type.impl_instance
+
+    if isinstance(column_type, (t.Date, t.DateTime, t.Time)):
+        return isoformat
+    elif isinstance(column_type, t.Enum):
+        return enum_name
+    elif isinstance(column_type, t.Uuid):
+        return str
+    # The values follow the type of the column's schema, e.g. a BigInteger is a "string"
+    # and a Numeric's Decimal is an "integer"
+    elif schema_type == "string" and not isinstance(column_type, t.String):
+        return str
+    elif schema_type == "integer" and isinstance(column_type, t.Numeric):
+        return int
+    elif schema_type == "number" and isinstance(column_type, t.Numeric):
+        return float
+    else:
+        return None
+
+
+@dataclass(frozen=True)
+class RowConverter:
+    getters: tuple[tuple[str, Callable[[Any], Any], Converter | None], ...]
+
+    @classmethod
+    def from_schema(cls, mapper: Mapper, schema: dict[str, Any], /) -> RowConverter:
+        # Only the columns are converted, loading the relationships would query each row.
+        # The properties are named after the table's columns, not the attributes
+        properties = schema.get("properties", {})
+        getters = tuple(
+            (
+                str(column.name),
+                attrgetter(prop.key),
+                get_converter(column.type, schema_type=properties[str(column.name)].get("type")),
+            )
+            for prop in mapper.column_attrs
+            for column in prop.columns
+            if str(column.name) in properties
+        )
+
+        return cls(getters)
+
+    def __call__(self, instance: Any, /) -> dict[str, Any]:
+        payload = {}
+
+        # A NULL is an absent property, NOT NULL columns are reported by "required"
+        for key, getter, converter in self.getters:
+            value = getter(instance)
+            if value is not None:
+                payload[key] = value if converter is None else converter(value)
+
+        return payload
+
+
+# Implemented by the jsonschema validators and the generated ones, see `codegen`
+class Validator(Protocol):
+    schema: Any
+
+    def iter_errors(self, instance: Any, /) -> Iterator[ValidationError]: ...
+
+    def validate(self, instance: Any, /) -> None: ...
+
+
+@dataclass(frozen=True)
+class Violation:
+    identity: tuple[Any, ...]
+    payload: dict[str, Any]
+    errors: list[ValidationError]
+
+
+class ValidatorRegistry:
+    def __init__(
+        self,
+        schema_factory: SchemaFactory,
+        /,
+        *,
+        format_checker: FormatChecker | None = None,
+        maxsize: int = DEFAULT_VALIDATOR_CACHE_SIZE,
+    ) -> None:
+        # The schemas must be self-contained for the references to be resolved
+        self.schema_factory = schema_factory.with_references(DEFINITIONS_REFERENCES)
+        self.format_checker = make_format_checker() if format_checker is None else format_checker
+        self.maxsize = maxsize
+        self._validators: OrderedDict[Hashable, Validator] = OrderedDict()
+        self._lock = Lock()
+
+    def get_validator(
+        self,
+        model: DeclarativeMeta,
+        /,
+        *,
+        includes: Sequence[str] | None = None,
+        excludes: Sequence[str] | None = None,
+        overrides: dict | None = None,
+        depth: int | None = None,
+    ) -> Validator:
+        key = (model, freeze(includes), freeze(excludes), freeze(overrides), depth)
+
+        with self._lock:
+            validator = self._validators.get(key)
+            if validator is not None:
+                self._validators.move_to_end(key)
+                return validator
+
+        schema = self.schema_factory(
+            model, includes=includes, excludes=excludes, overrides=overrides, depth=depth
+        )
+        validator = self.build_validator(schema)
+
+        with self._lock:
+            self._validators[key] = validator
+            while len(self._validators) > self.maxsize:
+                self._validators.popitem(last=False)
+
+        return validator
+
+    def build_validator(self, schema: dict[str, Any], /) -> Validator:
+        return Draft7Validator(schema, format_checker=self.format_checker)
+
+    def iter_errors(
+        self,
+        model: DeclarativeMeta,
+        payload: Any,
+        /,
+        *,
+        includes: Sequence[str] | None = None,
+        excludes: Sequence[str] | None = None,
+        overrides: dict | None = None,
+        depth: int | None = None,
+    ) -> Iterator[ValidationError]:
+        validator = self.get_validator(
+            model, includes=includes, excludes=excludes, overrides=overrides, depth=depth
+        )
+
+        return validator.iter_errors(payload)
+
+    def validate(
+        self,
+        model: DeclarativeMeta,
+        payload: Any,
+        /,
+        *,
+        includes: Sequence[str] | None = None,
+        excludes: Sequence[str] | None = None,
+        overrides: dict | None = None,
+        depth: int | None = None,
+    ) -> None:
+        validator = self.get_validator(
+            model, includes=includes, excludes=excludes, overrides=overrides, depth=depth
+        )
+
+        validator.validate(payload)
+
+    def iter_violations(
+        self,
+        model: DeclarativeMeta,
+        source: Select | Result,
+        /,
+        *,
+        session: Session | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        includes: Sequence[str] | None = None,
+        excludes: Sequence[str] | None = None,
+        overrides: dict | None = None,
+        depth: int | None = None,
+    ) -> Iterator[Violation]:
+        if isinstance(source, Select):
+            if session is None:
+                raise ValueError("A session is required to execute a select")
+
+            source = session.execute(source.execution_options(yield_per=chunk_size))
+
+        mapper = inspect(model).mapper
+        validator = self.get_validator(
+            model, includes=includes, excludes=excludes, overrides=overrides, depth=depth
+        )
+        convert = RowConverter.from_schema(mapper, validator.schema)
+
+        # The rows are fetched in chunks, only the violations are kept
+        for partition in source.scalars().partitions(chunk_size):
+            for instance in partition:
+                payload = convert(instance)
+                errors = list(validator.iter_errors(payload))
+
+                if errors:
+                    identity = tuple(mapper.primary_key_from_instance(instance))
+                    yield Violation(identity, payload, errors)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._validators.clear()
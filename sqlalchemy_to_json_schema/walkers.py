@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Iterator, Sequence
-from typing import Any
+from collections.abc import Collection, Hashable, Iterable, Iterator, Sequence
+from typing import Any, TypeVar, overload
 
 from loguru import logger
 from sqlalchemy.ext.declarative import DeclarativeMeta
@@ -11,7 +11,57 @@ from sqlalchemy.orm import Mapper, MapperProperty
 from sqlalchemy.orm.properties import ColumnProperty
 from sqlalchemy.orm.relationships import RelationshipProperty
 
+from sqlalchemy_to_json_schema import tracing
 from sqlalchemy_to_json_schema.exceptions import InvalidStatus
+from sqlalchemy_to_json_schema.plans import get_mapper_plan
+
+# The walked relationships, or the foreign keys of the table walkers
+P = TypeVar("P", bound=Hashable)
+
+
+# Stack of the walked relationships, the counts make membership tests O(1)
+class History(Sequence[P]):
+    def __init__(self, props: Iterable[P] = (), /) -> None:
+        self._stack: list[P] = []
+        self._counts: dict[P, int] = {}
+
+        for prop in props:
+            self.append(prop)
+
+    def __contains__(self, prop: object, /) -> bool:
+        return prop in self._counts
+
+    @overload
+    def __getitem__(self, index: int, /) -> P: ...
+
+    @overload
+    def __getitem__(self, index: slice, /) -> Sequence[P]: ...
+
+    def __getitem__(self, index: int | slice, /) -> P | Sequence[P]:
+        return self._stack[index]
+
+    def __iter__(self) -> Iterator[P]:
+        return iter(self._stack)
+
+    def __len__(self) -> int:
+        return len(self._stack)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._stack!r})"
+
+    def append(self, prop: P, /) -> None:
+        self._stack.append(prop)
+        self._counts[prop] = self._counts.get(prop, 0) + 1
+
+    def pop(self) -> P:
+        prop = self._stack.pop()
+
+        if self._counts[prop] == 1:
+            del self._counts[prop]
+        else:
+            self._counts[prop] -= 1
+
+        return prop
 
 
 class AbstractWalker(ABC):
@@ -20,16 +70,25 @@ class AbstractWalker(ABC):
         model: DeclarativeMeta | Mapper,
         /,
         *,
-        includes: Sequence[str] | None = None,
-        excludes: Sequence[str] | None = None,
+        includes: Collection[str] | None = None,
+        excludes: Collection[str] | None = None,
         history: Any | None = None,
     ) -> None:
-        logger.debug("Walking model {model}, {type}", model=model, type=type(model))
+        if tracing.enabled:
+            logger.debug("Walking model {model}, {type}", model=model, type=type(model))
 
-        self.mapper = inspect(model).mapper
+        mapper = model if isinstance(model, Mapper) else inspect(model).mapper
+        self.plan = get_mapper_plan(mapper)
+        self.mapper = mapper
         self.includes = includes
         self.excludes = excludes
-        self.history = history or []
+        self.history: History[MapperProperty]
+        if history is None:
+            self.history = History()
+        elif isinstance(history, History):
+            self.history = history
+        else:
+            self.history = History(history)
         if includes and excludes:
             if set(includes).intersection(excludes):
                 raise InvalidStatus(f"Conflict includes={includes}, exclude={excludes}")
@@ -40,8 +99,8 @@ class AbstractWalker(ABC):
         mapper: Mapper,
         /,
         *,
-        includes: Sequence[str] | None = None,
-        excludes: Sequence[str] | None = None,
+        includes: Collection[str] | None = None,
+        excludes: Collection[str] | None = None,
         history: Any | None = None,
     ) -> AbstractWalker:
         return self.__class__(mapper, includes=includes, excludes=excludes, history=history)
@@ -54,21 +113,12 @@ class AbstractWalker(ABC):
         pass
 
 
-# mapper.column_attrs and mapper.attrs is not ordered. define our custom iterate function `iterate'
+# the properties are ordered by the mapper's plan, see `MapperPlan.from_mapper()`
 
 
 class ForeignKeyWalker(AbstractWalker):
     def iterate(self) -> Iterator[MapperProperty]:
-        for c in self.mapper.local_table.columns:
-            if c.name not in self.mapper._props:
-                for prop in self.mapper.iterate_properties:
-                    if isinstance(prop, ColumnProperty):
-                        columns = {column.name for column in prop.columns}
-
-                        if c.name in columns:
-                            yield prop  # danger!! not immutable
-            else:
-                yield self.mapper._props[c.name]  # danger!! not immutable
+        return iter(self.plan.column_properties)  # danger!! not immutable
 
     def walk(self) -> Iterator[MapperProperty]:
         for prop in self.iterate():
@@ -79,39 +129,19 @@ class ForeignKeyWalker(AbstractWalker):
 
 class NoForeignKeyWalker(AbstractWalker):
     def iterate(self) -> Iterator[MapperProperty]:
-        for c in self.mapper.local_table.columns:
-            if c.name not in self.mapper._props:
-                for prop in self.mapper.iterate_properties:
-                    if isinstance(prop, ColumnProperty):
-                        columns = {column.name for column in prop.columns}
-
-                        if c.name in columns:
-                            yield prop  # danger!! not immutable
-            else:
-                yield self.mapper._props[c.name]  # danger!! not immutable
+        return iter(self.plan.column_properties)  # danger!! not immutable
 
     def walk(self) -> Iterator[MapperProperty]:
         for prop in self.iterate():
             if self.includes is None or prop.key in self.includes:
                 if self.excludes is None or prop.key not in self.excludes:
-                    if not any(c.foreign_keys for c in getattr(prop, "columns", {})):
+                    if prop not in self.plan.foreign_key_properties:
                         yield prop
 
 
 class StructuralWalker(AbstractWalker):
     def iterate(self) -> Iterator[MapperProperty]:
-        for c in self.mapper.local_table.columns:
-            if c.name not in self.mapper._props:
-                for prop in self.mapper.iterate_properties:
-                    if isinstance(prop, ColumnProperty):
-                        columns = {column.name for column in prop.columns}
-
-                        if c.name in columns:
-                            yield prop  # danger!! not immutable
-            else:
-                yield self.mapper._props[c.name]  # danger!! not immutable
-        for prop in self.mapper.relationships:
-            yield prop
+        return iter(self.plan.properties)  # danger!! not immutable
 
     def walk(self) -> Iterator[MapperProperty]:
         for prop in self.iterate():
@@ -119,5 +149,5 @@ class StructuralWalker(AbstractWalker):
                 if self.includes is None or prop.key in self.includes:
                     if self.excludes is None or prop.key not in self.excludes:
                         if prop not in self.history:
-                            if not any(c.foreign_keys for c in getattr(prop, "columns", {})):
+                            if prop not in self.plan.foreign_key_properties:
                                 yield prop
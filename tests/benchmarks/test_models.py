@@ -0,0 +1,65 @@
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import ONETOMANY
+
+from benchmarks.models import ModelGraph, generate_models, make_decorated_type
+from sqlalchemy_to_json_schema.schema_factory import Classifier, SchemaFactory
+from sqlalchemy_to_json_schema.walkers import (
+    ForeignKeyWalker,
+    NoForeignKeyWalker,
+    StructuralWalker,
+)
+
+
+@pytest.mark.parametrize("cycles", [True, False])
+def test_generate_models(cycles: bool) -> None:
+    """
+    ARRANGE a model graph
+    ACT generate the models
+    ASSERT the tables, columns and relationships match the graph
+    """
+    # arrange
+    graph = ModelGraph(tables=5, columns=3, fanout=2, cycles=cycles)
+
+    # act
+    actual = generate_models(graph)
+
+    # assert
+    assert [model.__name__ for model in actual] == [f"Table{index}" for index in range(5)]
+
+    mapper = inspect(actual[-1])
+    assert len(mapper.relationships) == 2
+    assert len(mapper.columns) == 1 + 3 + 2
+
+    has_backrefs = any(prop.direction == ONETOMANY for prop in inspect(actual[0]).relationships)
+    assert has_backrefs is cycles
+
+
+def test_generate_models__stable() -> None:
+    graph = ModelGraph(tables=4, columns=5, seed=42)
+
+    first = [str(inspect(model).local_table.c) for model in generate_models(graph)]
+    second = [str(inspect(model).local_table.c) for model in generate_models(graph)]
+
+    assert first == second
+
+
+def test_generate_models__unknown_type() -> None:
+    with pytest.raises(ValueError, match=r"Unknown types: \['unknown'\]"):
+        generate_models(ModelGraph(type_mix=("unknown",)))
+
+
+def test_make_decorated_type() -> None:
+    actual = make_decorated_type(lambda: sa.String(10), 3)
+
+    assert Classifier()[actual][1] == "string"
+
+
+@pytest.mark.parametrize("walker", [StructuralWalker, ForeignKeyWalker, NoForeignKeyWalker])
+def test_generate_models__schema(walker: type[StructuralWalker]) -> None:
+    models = generate_models(ModelGraph(tables=4, decorator_depth=2))
+
+    actual = SchemaFactory(walker)(models[-1], depth=2)
+
+    assert actual["title"] == "Table3"
@@ -0,0 +1,39 @@
+import json
+
+from benchmarks.models import ModelGraph
+from benchmarks.suite import Case, iter_cases, run_suite
+from sqlalchemy_to_json_schema.types import Decision, Layout, Walker
+
+
+def test_iter_cases() -> None:
+    actual = list(iter_cases(list(Walker), [Decision.DEFAULT], [Layout.OPENAPI_3], [None, 1]))
+
+    assert len(actual) == len(Walker) * 2
+    assert actual[0] == Case(Walker.STRUCTURAL, Decision.DEFAULT, Layout.OPENAPI_3, None)
+
+
+def test_run_suite() -> None:
+    """
+    ARRANGE a small model graph
+        AND two cases
+    ACT run the suite
+    ASSERT the report has a timing and a peak memory for each case
+        AND it can be written as JSON
+    """
+    # arrange
+    graph = ModelGraph(tables=3, columns=2)
+    cases = [
+        Case(Walker.STRUCTURAL, Decision.DEFAULT, Layout.OPENAPI_3, 1),
+        Case(Walker.FOREIGNKEY, Decision.USE_FOREIGN_KEY, Layout.SWAGGER_2, None),
+    ]
+
+    # act
+    actual = run_suite(graph, cases, repeat=1)
+
+    # assert
+    assert json.loads(json.dumps(actual))["graph"] == graph.as_dict()
+    assert [result["walker"] for result in actual["results"]] == ["structural", "foreignkey"]
+
+    for result in actual["results"]:
+        assert result["seconds"]["min"] > 0
+        assert result["peak_memory_bytes"] > 0
@@ -9,6 +9,7 @@ from unittest.mock import ANY
 import pytest
 import yaml
 from pytest_mock import MockerFixture
+from pytest_unordered import unordered
 from yaml import Loader
 
 from sqlalchemy_to_json_schema.command.driver import Driver
@@ -17,7 +18,18 @@ from sqlalchemy_to_json_schema.command.main import (
     DEFAULT_LAYOUT,
     DEFAULT_WALKER,
 )
-from sqlalchemy_to_json_schema.types import Decision, Format, Layout, Walker
+from sqlalchemy_to_json_schema.command.transformer import OpenAPI3Transformer
+from sqlalchemy_to_json_schema.profiling import Profiler
+from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.types import (
+    Backend,
+    Decision,
+    Format,
+    Layout,
+    Style,
+    Walker,
+)
+from sqlalchemy_to_json_schema.utils.imports import load_module_or_symbol
 
 
 @pytest.fixture
@@ -151,3 +163,297 @@ class TestDriver:
 
         # assert
         assert json.loads(actual) == expected
+
+    @pytest.mark.parametrize("layout", Layout)
+    @pytest.mark.parametrize("format", Format)
+    @pytest.mark.parametrize(
+        "targets",
+        [
+            ["tests.fixtures.models.user", "tests.fixtures.models.address"],
+            ["tests.fixtures.models.user:Group"],
+        ],
+    )
+    def test_run_cache_dir(
+        self,
+        tmp_path: Path,
+        temp_filename: Path,
+        layout: Layout,
+        format: Format,
+        targets: Sequence[str],
+    ) -> None:
+        """
+        ARRANGE a list of targets
+            AND a cache directory
+        ACT run the driver twice with the cache and once without
+        ASSERT the outputs are the same
+        """
+        # arrange
+        cache_dir = tmp_path / "cache"
+
+        # act
+        Driver(DEFAULT_WALKER, DEFAULT_DECISION, layout).run(
+            targets, filename=temp_filename, format=format
+        )
+        expected = temp_filename.read_bytes()
+
+        outputs = []
+        for _ in range(2):
+            driver = Driver(DEFAULT_WALKER, DEFAULT_DECISION, layout, cache_dir=cache_dir)
+            driver.run(targets, filename=temp_filename, format=format)
+            outputs.append(temp_filename.read_bytes())
+
+        # assert
+        assert outputs == [expected, expected]
+
+    def test_run_cache_dir__not_rebuilt(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        """
+        ARRANGE a driver run with a cache directory
+        ACT run the driver again with the same cache directory
+        ASSERT no schema is rebuilt
+        """
+        # arrange
+        targets = ["tests.fixtures.models.user"]
+        Driver(DEFAULT_WALKER, DEFAULT_DECISION, DEFAULT_LAYOUT, cache_dir=tmp_path).run(
+            targets, filename=tmp_path / "first.json"
+        )
+
+        spy = mocker.spy(SchemaFactory, "_build_schema")
+
+        # act
+        Driver(DEFAULT_WALKER, DEFAULT_DECISION, DEFAULT_LAYOUT, cache_dir=tmp_path).run(
+            targets, filename=tmp_path / "second.json"
+        )
+
+        # assert
+        spy.assert_not_called()
+        assert (tmp_path / "first.json").read_bytes() == (tmp_path / "second.json").read_bytes()
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_run_cache_dir__pruned(
+        self, tmp_path: Path, mocker: MockerFixture, stream: bool
+    ) -> None:
+        """
+        ARRANGE a driver with a cache directory
+        ACT run the driver
+        ASSERT the cache is pruned once, after the schemas are written
+        """
+        # arrange
+        driver = Driver(DEFAULT_WALKER, DEFAULT_DECISION, DEFAULT_LAYOUT, cache_dir=tmp_path)
+        assert driver.cache is not None
+        prune = mocker.spy(driver.cache, "prune")
+        filename = tmp_path / "output.json"
+
+        # act
+        driver.run(["tests.fixtures.models.user"], filename=filename, stream=stream)
+
+        # assert
+        prune.assert_called_once_with()
+        assert filename.exists()
+
+    def test_transformer(self) -> None:
+        """
+        ARRANGE a driver
+        ACT call its transformer
+        ASSERT the transformer is the transform method of the layout's transformer
+        """
+        # arrange
+        driver = Driver(DEFAULT_WALKER, DEFAULT_DECISION, Layout.OPENAPI_3)
+
+        # act
+        actual = driver.transformer([load_module_or_symbol("tests.fixtures.models.user")], None)
+
+        # assert
+        assert isinstance(driver.layout_transformer, OpenAPI3Transformer)
+        assert driver.transformer == driver.layout_transformer.transform
+        assert list(actual["components"]["schemas"]) == unordered(["Group", "User"])
+
+    @pytest.mark.parametrize("layout", Layout)
+    def test_run_jobs(self, tmp_path: Path, layout: Layout) -> None:
+        """
+        ARRANGE a list of targets
+        ACT run the driver serially and with a pool of processes
+        ASSERT the outputs are the same
+        """
+        # arrange
+        targets = ["tests.fixtures.models.user", "tests.fixtures.models.address"]
+
+        # act
+        Driver(DEFAULT_WALKER, DEFAULT_DECISION, layout).run(
+            targets, filename=tmp_path / "serial.json"
+        )
+        Driver(DEFAULT_WALKER, DEFAULT_DECISION, layout, jobs=2).run(
+            targets, filename=tmp_path / "parallel.json"
+        )
+
+        # assert
+        assert (tmp_path / "parallel.json").read_bytes() == (tmp_path / "serial.json").read_bytes()
+
+    @pytest.mark.parametrize("layout", Layout)
+    @pytest.mark.parametrize("format", [None, Format.JSON])
+    @pytest.mark.parametrize(
+        "targets",
+        [
+            ["tests.fixtures.models.user", "tests.fixtures.models.address"],
+            ["tests.fixtures.models.address:Address"],
+            [],
+        ],
+    )
+    def test_run_stream__json(
+        self, tmp_path: Path, layout: Layout, format: Optional[Format], targets: Sequence[str]
+    ) -> None:
+        """
+        ARRANGE a list of targets without duplicated definitions
+        ACT run the driver with and without streaming
+        ASSERT the outputs are the same
+        """
+        # arrange
+        driver = Driver(DEFAULT_WALKER, DEFAULT_DECISION, layout)
+
+        # act
+        driver.run(targets, filename=tmp_path / "bundle.json", format=format)
+        driver.run(targets, filename=tmp_path / "stream.json", format=format, stream=True)
+
+        # assert
+        assert (tmp_path / "stream.json").read_bytes() == (tmp_path / "bundle.json").read_bytes()
+
+    @pytest.mark.parametrize("layout", Layout)
+    @pytest.mark.parametrize(
+        "targets",
+        [
+            ["tests.fixtures.models.user", "tests.fixtures.models.address"],
+            ["tests.fixtures.models.address:Address"],
+            [],
+        ],
+    )
+    def test_run_stream__yaml(
+        self, tmp_path: Path, layout: Layout, targets: Sequence[str]
+    ) -> None:
+        """
+        ARRANGE a list of targets without duplicated definitions
+        ACT run the driver with and without streaming
+        ASSERT the outputs are loaded as the same document
+        """
+        # arrange
+        driver = Driver(DEFAULT_WALKER, DEFAULT_DECISION, layout)
+
+        # act
+        driver.run(targets, filename=tmp_path / "bundle.yaml", format=Format.YAML)
+        driver.run(targets, filename=tmp_path / "stream.yaml", format=Format.YAML, stream=True)
+
+        # assert
+        expected = yaml.load((tmp_path / "bundle.yaml").read_text(), Loader=Loader)
+        actual = yaml.load((tmp_path / "stream.yaml").read_text(), Loader=Loader)
+
+        assert actual == expected
+
+    @pytest.mark.parametrize(
+        "targets",
+        [
+            ["tests.fixtures.models.user:User", "tests.fixtures.models.user"],
+            ["tests.fixtures.models", "tests.fixtures.models.user:User"],
+        ],
+    )
+    @pytest.mark.parametrize(
+        "format, file_loader",
+        [
+            pytest.param(Format.JSON, json.loads, id="json"),
+            pytest.param(Format.YAML, partial(yaml.load, Loader=Loader), id="yaml"),
+        ],
+    )
+    def test_run_stream__duplicated_definitions(
+        self,
+        tmp_path: Path,
+        targets: Sequence[str],
+        format: Format,
+        file_loader: Callable[[str], Any],
+    ) -> None:
+        """
+        ARRANGE a list of targets which defines the same names more than once
+        ACT run the driver with and without streaming
+        ASSERT each name is written once with the same definition as the bundle
+        """
+        # arrange
+        driver = Driver(DEFAULT_WALKER, DEFAULT_DECISION, Layout.OPENAPI_3)
+
+        # act
+        driver.run(targets, filename=tmp_path / "bundle", format=format)
+        driver.run(targets, filename=tmp_path / "stream", format=format, stream=True)
+
+        # assert
+        expected = file_loader((tmp_path / "bundle").read_text())
+        actual = file_loader((tmp_path / "stream").read_text())
+
+        assert actual == expected
+
+    def test_run_stream__json_schema(self, temp_filename: Path) -> None:
+        """
+        ARRANGE a model
+        ACT run the driver with streaming and the JSON Schema layout
+        ASSERT the schema of the model is written at the top of the document
+        """
+        # arrange
+        driver = Driver(DEFAULT_WALKER, DEFAULT_DECISION, Layout.JSON_SCHEMA)
+        targets = ["tests.fixtures.models.user:User"]
+
+        # act
+        driver.run(targets, filename=temp_filename, stream=True)
+
+        # assert
+        actual = json.loads(temp_filename.read_text())
+
+        assert actual["title"] == "User"
+        assert list(actual["definitions"]) == ["Group", "Address"]
+
+    @pytest.mark.parametrize("backend", Backend)
+    @pytest.mark.parametrize("style", Style)
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_run_backend(
+        self, temp_filename: Path, backend: Backend, style: Style, stream: bool
+    ) -> None:
+        """
+        ARRANGE a list of targets
+        ACT run the driver with a serializer backend and style
+        ASSERT the output is loaded as the same document as the default one
+        """
+        # arrange
+        driver = Driver(DEFAULT_WALKER, DEFAULT_DECISION, Layout.OPENAPI_3)
+        targets = ["tests.fixtures.models.user", "tests.fixtures.models.address"]
+
+        driver.run(targets, filename=temp_filename)
+        expected = json.loads(temp_filename.read_text())
+
+        # act
+        driver.run(targets, filename=temp_filename, stream=stream, backend=backend, style=style)
+
+        # assert
+        actual = yaml.load(temp_filename.read_text(), Loader=Loader)
+
+        assert actual == expected
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_run_profiler(self, temp_filename: Path, stream: bool) -> None:
+        """
+        ARRANGE a list of targets
+            AND a profiler
+        ACT run the driver
+        ASSERT every phase is recorded
+            AND each model is recorded
+        """
+        # arrange
+        driver = Driver(DEFAULT_WALKER, DEFAULT_DECISION, Layout.OPENAPI_3)
+        profiler = Profiler()
+
+        # act
+        driver.run(
+            ["tests.fixtures.models.user"],
+            filename=temp_filename,
+            stream=stream,
+            profiler=profiler,
+        )
+
+        # assert
+        expected = ["import", "configure", "build_properties"]
+        expected.extend(["stream"] if stream else ["transform", "dump"])
+
+        assert sorted(profiler.phases) == sorted(expected)
+        assert sorted(profiler.models) == ["Group", "User"]
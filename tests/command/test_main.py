@@ -1,5 +1,8 @@
+import subprocess
+import sys
 from collections.abc import Sequence
 from pathlib import Path
+from typing import Optional
 from unittest.mock import Mock
 
 import pytest
@@ -8,16 +11,26 @@ from pytest_mock import MockerFixture
 
 from sqlalchemy_to_json_schema.command.main import (
     DEFAULT_DECISION,
+    DEFAULT_JOBS,
     DEFAULT_LAYOUT,
+    DEFAULT_STYLE,
     DEFAULT_WALKER,
     main,
 )
-from sqlalchemy_to_json_schema.types import Decision, Format, Layout, Walker
+from sqlalchemy_to_json_schema.profiling import Profiler
+from sqlalchemy_to_json_schema.types import (
+    Backend,
+    Decision,
+    Format,
+    Layout,
+    Style,
+    Walker,
+)
 
 
 @pytest.fixture
 def mock_driver(mocker: MockerFixture) -> Mock:
-    return mocker.patch("sqlalchemy_to_json_schema.command.main.Driver", autospec=True)
+    return mocker.patch("sqlalchemy_to_json_schema.command.driver.Driver", autospec=True)
 
 
 @pytest.mark.parametrize("targets", [["my_module"]])
@@ -37,9 +50,17 @@ def test_main_defaults(mock_driver: Mock, targets: Sequence[str]) -> None:
     # ASSERT
     assert actual.exit_code == 0
 
-    mock_driver.assert_called_once_with(DEFAULT_WALKER, DEFAULT_DECISION, DEFAULT_LAYOUT)
+    mock_driver.assert_called_once_with(
+        DEFAULT_WALKER, DEFAULT_DECISION, DEFAULT_LAYOUT, cache_dir=None, jobs=DEFAULT_JOBS
+    )
     mock_driver.return_value.run.assert_called_once_with(
-        tuple(targets), filename=None, format=None
+        tuple(targets),
+        filename=None,
+        format=None,
+        stream=False,
+        backend=None,
+        style=DEFAULT_STYLE,
+        profiler=None,
     )
 
 
@@ -87,7 +108,264 @@ def test_main(
     # ASSERT
     assert actual.exit_code == 0
 
-    mock_driver.assert_called_once_with(walker, decision, layout)
+    mock_driver.assert_called_once_with(
+        walker, decision, layout, cache_dir=None, jobs=DEFAULT_JOBS
+    )
+    mock_driver.return_value.run.assert_called_once_with(
+        tuple(targets),
+        filename=out,
+        format=format,
+        stream=False,
+        backend=None,
+        style=DEFAULT_STYLE,
+        profiler=None,
+    )
+
+
+@pytest.mark.parametrize("targets", [["my_module"]])
+def test_main_cache_dir(mock_driver: Mock, targets: Sequence[str], tmp_path: Path) -> None:
+    """
+    ARRANGE CLI args
+        AND a cache directory
+    ACT calling the driver's method
+    ASSERT the cache directory is passed to the driver
+    """
+    # ARRANGE
+    runner = CliRunner()
+
+    # ACT
+    actual = runner.invoke(main, ["--cache-dir", tmp_path.as_posix(), *targets])
+
+    # ASSERT
+    assert actual.exit_code == 0
+
+    mock_driver.assert_called_once_with(
+        DEFAULT_WALKER, DEFAULT_DECISION, DEFAULT_LAYOUT, cache_dir=tmp_path, jobs=DEFAULT_JOBS
+    )
+
+
+@pytest.mark.parametrize("targets", [["my_module"]])
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_main_jobs(mock_driver: Mock, targets: Sequence[str], jobs: int) -> None:
+    """
+    ARRANGE CLI args
+        AND a number of jobs
+    ACT calling the driver's method
+    ASSERT the number of jobs is passed to the driver
+    """
+    # ARRANGE
+    runner = CliRunner()
+
+    # ACT
+    actual = runner.invoke(main, ["--jobs", str(jobs), *targets])
+
+    # ASSERT
+    assert actual.exit_code == 0
+
+    mock_driver.assert_called_once_with(
+        DEFAULT_WALKER, DEFAULT_DECISION, DEFAULT_LAYOUT, cache_dir=None, jobs=jobs
+    )
+
+
+def test_main_jobs__invalid(mock_driver: Mock) -> None:
+    """
+    ARRANGE CLI args
+        AND zero jobs
+    ACT calling the CLI
+    ASSERT fails with an usage error
+    """
+    # ARRANGE
+    runner = CliRunner()
+
+    # ACT
+    actual = runner.invoke(main, ["--jobs", "0", "my_module"])
+
+    # ASSERT
+    assert actual.exit_code == 2
+
+    mock_driver.assert_not_called()
+
+
+@pytest.mark.parametrize("targets", [["my_module"]])
+def test_main_stream(mock_driver: Mock, targets: Sequence[str]) -> None:
+    """
+    ARRANGE CLI args
+        AND the stream flag
+    ACT calling the driver's method
+    ASSERT the driver streams the definitions
+    """
+    # ARRANGE
+    runner = CliRunner()
+
+    # ACT
+    actual = runner.invoke(main, ["--stream", *targets])
+
+    # ASSERT
+    assert actual.exit_code == 0
+
     mock_driver.return_value.run.assert_called_once_with(
-        tuple(targets), filename=out, format=format
+        tuple(targets),
+        filename=None,
+        format=None,
+        stream=True,
+        backend=None,
+        style=DEFAULT_STYLE,
+        profiler=None,
     )
+
+
+@pytest.mark.parametrize("targets", [["my_module"]])
+@pytest.mark.parametrize("backend", Backend)
+@pytest.mark.parametrize("style", Style)
+def test_main_backend(
+    mock_driver: Mock, targets: Sequence[str], backend: Backend, style: Style
+) -> None:
+    """
+    ARRANGE CLI args
+        AND a serializer backend and style
+    ACT calling the driver's method
+    ASSERT the backend and the style are passed to the driver
+    """
+    # ARRANGE
+    runner = CliRunner()
+
+    # ACT
+    actual = runner.invoke(main, ["--backend", backend.value, "--style", style.value, *targets])
+
+    # ASSERT
+    assert actual.exit_code == 0
+
+    mock_driver.return_value.run.assert_called_once_with(
+        tuple(targets),
+        filename=None,
+        format=None,
+        stream=False,
+        backend=backend,
+        style=style,
+        profiler=None,
+    )
+
+
+@pytest.mark.parametrize("targets", [["my_module"]])
+@pytest.mark.parametrize(
+    "option, filename, cprofile",
+    [
+        pytest.param(None, None, False, id="profile"),
+        pytest.param("--profile-report", "report.json", False, id="report"),
+        pytest.param("--profile-stats", "profile.pstats", True, id="stats"),
+    ],
+)
+def test_main_profile(
+    mock_driver: Mock,
+    tmp_path: Path,
+    targets: Sequence[str],
+    option: Optional[str],
+    filename: Optional[str],
+    cprofile: bool,
+) -> None:
+    """
+    ARRANGE CLI args
+        AND a profile option
+    ACT calling the driver's method
+    ASSERT a profiler is passed to the driver
+        AND the profile is written
+    """
+    # ARRANGE
+    runner = CliRunner()
+    args = ["--profile"] if option is None else [option, (tmp_path / str(filename)).as_posix()]
+
+    # ACT
+    actual = runner.invoke(main, [*args, *targets])
+
+    # ASSERT
+    assert actual.exit_code == 0, actual.output
+    assert "phase" in actual.stderr
+
+    profiler = mock_driver.return_value.run.call_args.kwargs["profiler"]
+
+    assert isinstance(profiler, Profiler)
+    assert (profiler.cprofile is not None) is cprofile
+    assert [path.name for path in tmp_path.iterdir()] == ([] if filename is None else [filename])
+
+
+def _loaded_modules(code: str, /) -> set[str]:
+    # A fresh interpreter, the test session has already imported everything
+    result = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys\nprint(' '.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # The modules are printed last, after anything written by the CLI
+    return set(result.stdout.splitlines()[-1].split())
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        pytest.param("import sqlalchemy_to_json_schema.command.main", id="import"),
+        pytest.param(
+            "from sqlalchemy_to_json_schema.command.main import main\n"
+            "main(['--help'], standalone_mode=False)",
+            id="help",
+        ),
+    ],
+)
+def test_main_lazy_imports(code: str) -> None:
+    """
+    ARRANGE a fresh interpreter
+    ACT import the CLI or show its help
+    ASSERT none of the heavy dependencies are loaded
+    """
+    # ACT
+    actual = _loaded_modules(code)
+
+    # ASSERT
+    assert actual.isdisjoint({"sqlalchemy", "yaml", "orjson", "loguru", "dateutil", "cProfile"})
+
+
+def test_main_lazy_imports__json() -> None:
+    actual = _loaded_modules(
+        "from sqlalchemy_to_json_schema.command.main import main\n"
+        "main(['--format', 'json', 'tests.fixtures.models.user'], standalone_mode=False)"
+    )
+
+    assert "sqlalchemy" in actual
+    assert "yaml" not in actual
+
+
+@pytest.mark.parametrize(
+    "args, message",
+    [
+        pytest.param(
+            ["--format", "yaml", "--backend", "json"],
+            "Backend json doesn't write the yaml format",
+            id="format",
+        ),
+        pytest.param(["--backend", "orjson"], "Backend orjson is not available", id="unavailable"),
+    ],
+)
+def test_main_backend__invalid(
+    mocker: MockerFixture, tmp_path: Path, args: Sequence[str], message: str
+) -> None:
+    """
+    ARRANGE CLI args
+        AND a backend which can't write the output
+    ACT calling the CLI
+    ASSERT fails with an usage error before building the schemas
+    """
+    # ARRANGE
+    mocker.patch(
+        "sqlalchemy_to_json_schema.command.serializers.ORJSONSerializer.is_available",
+        return_value=False,
+    )
+    runner = CliRunner()
+
+    # ACT
+    actual = runner.invoke(main, [*args, "--out", str(tmp_path / "out"), "my_module"])
+
+    # ASSERT
+    assert actual.exit_code == 2
+    assert message in actual.output
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,107 @@
+import json
+from typing import Any
+
+import pytest
+import yaml
+from pytest_mock import MockerFixture
+
+from sqlalchemy_to_json_schema.command.serializers import (
+    SERIALIZER_MAP,
+    JSONSerializer,
+    LibYAMLSerializer,
+    ORJSONSerializer,
+    PyYAMLSerializer,
+    get_serializer,
+)
+from sqlalchemy_to_json_schema.command.transformer import OpenAPI3Transformer
+from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.types import Backend, Format, Style
+from sqlalchemy_to_json_schema.walkers import StructuralWalker
+from tests.fixtures import models
+
+
+@pytest.fixture(scope="module")
+def bundle() -> dict[str, Any]:
+    transformer = OpenAPI3Transformer(SchemaFactory(StructuralWalker))
+
+    return transformer.transform([models], None)
+
+
+def load(format: Format, content: str, /) -> Any:
+    if format == Format.YAML:
+        return yaml.safe_load(content)
+
+    return json.loads(content)
+
+
+@pytest.mark.parametrize("backend", Backend)
+@pytest.mark.parametrize("style", Style)
+def test_dumps(bundle: dict[str, Any], backend: Backend, style: Style) -> None:
+    """
+    ARRANGE a bundle
+    ACT serialize it with a backend and a style
+    ASSERT the loaded content is the same as the bundle
+    """
+    # arrange
+    serializer = get_serializer(backend=backend, style=style)
+
+    # act
+    actual = serializer.dumps(bundle)
+
+    # assert
+    assert load(serializer.format, actual) == bundle
+
+
+@pytest.mark.parametrize(
+    "backend, expected",
+    [
+        pytest.param(Backend.JSON, json.dumps({"a": [1, 2]})),
+        pytest.param(Backend.PYYAML, yaml.dump({"a": [1, 2]})),
+    ],
+)
+def test_dumps__default_style(backend: Backend, expected: str) -> None:
+    assert get_serializer(backend=backend).dumps({"a": [1, 2]}) == expected
+
+
+@pytest.mark.parametrize(
+    "style, expected",
+    [
+        pytest.param(Style.DEFAULT, '{"a": [1, 2]}'),
+        pytest.param(Style.COMPACT, '{"a":[1,2]}'),
+        pytest.param(Style.PRETTY, '{\n  "a": [\n    1,\n    2\n  ]\n}'),
+    ],
+)
+def test_dumps__json_style(style: Style, expected: str) -> None:
+    assert JSONSerializer(style=style).dumps({"a": [1, 2]}) == expected
+
+
+@pytest.mark.parametrize(
+    "format, backend, expected",
+    [
+        pytest.param(None, None, JSONSerializer),
+        pytest.param(Format.JSON, None, JSONSerializer),
+        pytest.param(Format.YAML, None, PyYAMLSerializer),
+        pytest.param(None, Backend.ORJSON, ORJSONSerializer),
+        pytest.param(Format.YAML, Backend.LIBYAML, LibYAMLSerializer),
+    ],
+)
+def test_get_serializer(format: Format, backend: Backend, expected: type[JSONSerializer]) -> None:
+    assert type(get_serializer(format, backend)) is expected
+
+
+def test_get_serializer__format_mismatch() -> None:
+    with pytest.raises(ValueError, match="Backend orjson doesn't write the yaml format"):
+        get_serializer(Format.YAML, Backend.ORJSON)
+
+
+def test_get_serializer__not_available(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "sqlalchemy_to_json_schema.command.serializers.import_optional",
+        autospec=True,
+        return_value=None,
+    )
+
+    assert not SERIALIZER_MAP[Backend.ORJSON].is_available()
+
+    with pytest.raises(ValueError, match="Backend orjson is not available"):
+        get_serializer(backend=Backend.ORJSON)
@@ -1,20 +1,32 @@
+import json
 from collections.abc import Sequence
 from types import ModuleType
+from typing import Optional, Union
 from unittest.mock import ANY
 
 import pytest
+from pytest_mock import MockerFixture
 from pytest_unordered import unordered
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
 from sqlalchemy_to_json_schema.command.transformer import (
+    AbstractTransformer,
     AsyncAPI2Transformer,
     JSONSchemaTransformer,
+    OpenAPI2Transformer,
+    OpenAPI3Transformer,
+    _build_worker_schema,
     collect_models,
 )
-from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.schema_factory import (
+    COMPONENTS_REFERENCES,
+    DEFINITIONS_REFERENCES,
+    SchemaFactory,
+)
 from sqlalchemy_to_json_schema.walkers import StructuralWalker
 from tests import fixtures
 from tests.fixtures import models
+from tests.fixtures.models import address, user
 from tests.fixtures.models.address import Address
 from tests.fixtures.models.user import Group, User
 
@@ -78,6 +90,30 @@ class TestJSONSchemaTransformer:
             },
         }
 
+    def test_iter_definitions(self, schema_factory: SchemaFactory) -> None:
+        """
+        ARRANGE a model and a module
+        ACT iterate over the definitions of the targets
+        ASSERT the keys of the bundle are iterated at the top of the document
+        """
+        # Arrange
+        transformer = JSONSchemaTransformer(schema_factory)
+
+        # Act
+        actual = list(transformer.iter_definitions([User, models], None))
+
+        # Assert
+        assert [key for key, _ in actual] == [
+            "title",
+            "type",
+            "definitions",
+            "properties",
+            "required",
+            "definitions",
+        ]
+        assert dict(actual) == transformer.transform([User, models], None)
+        assert transformer.definitions_path == ()
+
 
 class TestCollectModels:
     @pytest.mark.parametrize(
@@ -212,3 +248,107 @@ class TestAsyncAPI2Transformer:
                 }
             }
         }
+
+
+@pytest.mark.parametrize(
+    "transformer_factory",
+    [JSONSchemaTransformer, OpenAPI2Transformer, OpenAPI3Transformer, AsyncAPI2Transformer],
+)
+@pytest.mark.parametrize(
+    "targets",
+    [
+        pytest.param([models], id="package"),
+        pytest.param([user, address], id="modules"),
+        pytest.param([user, Group, address, User], id="modules and models"),
+    ],
+)
+@pytest.mark.parametrize("depth", [None, 1])
+def test_transform__jobs(
+    schema_factory: SchemaFactory,
+    transformer_factory: type[AbstractTransformer],
+    targets: Sequence[Union[ModuleType, DeclarativeMeta]],
+    depth: Optional[int],
+) -> None:
+    """
+    ARRANGE a list of targets
+    ACT transform them with a pool of processes
+    ASSERT the result is the same as the serial one, including the order
+    """
+    # Arrange
+    expected = transformer_factory(schema_factory).transform(targets, depth)
+
+    # Act
+    actual = transformer_factory(schema_factory, jobs=2).transform(targets, depth)
+
+    # Assert
+    assert json.dumps(actual) == json.dumps(expected)
+
+
+def test_transform__invalid_jobs(schema_factory: SchemaFactory) -> None:
+    with pytest.raises(ValueError, match="Expected at least 1 job, got 0"):
+        OpenAPI2Transformer(schema_factory, jobs=0)
+
+
+def test_build_worker_schema__not_initialized() -> None:
+    # Only the processes of the pool are initialized with the schema factory
+    with pytest.raises(RuntimeError, match="worker not initialized"):
+        _build_worker_schema(0, None)
+
+
+@pytest.mark.parametrize(
+    "transformer_factory, path",
+    [
+        pytest.param(OpenAPI2Transformer, ("definitions",)),
+        pytest.param(OpenAPI3Transformer, ("components", "schemas")),
+        pytest.param(AsyncAPI2Transformer, ("components", "schemas")),
+    ],
+)
+def test_iter_definitions(
+    schema_factory: SchemaFactory,
+    mocker: MockerFixture,
+    transformer_factory: type[AbstractTransformer],
+    path: tuple[str, ...],
+) -> None:
+    """
+    ARRANGE a transformer
+    ACT iterate over the definitions of a module
+    ASSERT the schemas are built while iterating
+        AND the definitions are under the transformer's path
+    """
+    # Arrange
+    spy = mocker.spy(schema_factory, "_build_schema")
+    transformer = transformer_factory(schema_factory)
+
+    # Act
+    definitions = transformer.iter_definitions([user], None)
+
+    # Assert
+    assert spy.call_count == 0
+    assert next(definitions)[0] == "Group"
+    assert spy.call_count == 1
+    assert [name for name, _ in definitions] == ["User"]
+    assert transformer.definitions_path == path
+
+
+@pytest.mark.parametrize("transformer_factory", [OpenAPI3Transformer, AsyncAPI2Transformer])
+def test_transform__components_references(
+    schema_factory: SchemaFactory, transformer_factory: type[AbstractTransformer]
+) -> None:
+    """
+    ARRANGE a schema factory with the default references
+    ACT transform a model with an OpenAPI 3 layout
+    ASSERT the references point to the components
+        AND the given schema factory is not changed
+    """
+    # Arrange
+    transformer = transformer_factory(schema_factory)
+
+    # Act
+    actual = transformer.transform([User], None)
+
+    # Assert
+    assert actual["components"]["schemas"]["User"]["properties"]["group"] == {
+        "$ref": "#/components/schemas/Group"
+    }
+    assert transformer.schema_factory.references == COMPONENTS_REFERENCES
+    assert schema_factory.references == DEFINITIONS_REFERENCES
@@ -0,0 +1,247 @@
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from pytest_mock import MockerFixture
+from sqlalchemy.orm import declarative_base
+
+from sqlalchemy_to_json_schema.cache import SchemaCache
+from sqlalchemy_to_json_schema.schema_factory import (
+    COMPONENTS_REFERENCES,
+    SchemaFactory,
+    pop_marker,
+)
+from sqlalchemy_to_json_schema.walkers import ForeignKeyWalker, StructuralWalker
+from tests.fixtures.models.user import Group, User
+
+
+def _makeModel(nullable: bool) -> Any:
+    Base = declarative_base()
+
+    class Model(Base):
+        __tablename__ = "model"
+
+        pk = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.String(255), nullable=nullable)
+
+    return Model
+
+
+@pytest.fixture
+def schema_factory() -> SchemaFactory:
+    return SchemaFactory(StructuralWalker, cache=SchemaCache())
+
+
+class TestSchemaCache:
+    def test_hit(self, schema_factory: SchemaFactory, mocker: MockerFixture) -> None:
+        """
+        ARRANGE a schema factory with a cache
+        ACT generate the same schema twice
+        ASSERT the schema is built once and the same schema is returned
+        """
+        # arrange
+        spy = mocker.spy(schema_factory, "_build_schema")
+
+        # act
+        first = schema_factory(User)
+        second = schema_factory(User)
+
+        # assert
+        assert first == second
+        assert spy.call_count == 1
+
+    def test_hit__copy_on_read(self, schema_factory: SchemaFactory) -> None:
+        first = schema_factory(User)
+        first["properties"].clear()
+
+        second = schema_factory(User)
+
+        assert second["properties"]
+        assert second == SchemaFactory(StructuralWalker)(User)
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            pytest.param({"depth": 1}, id="depth"),
+            pytest.param({"includes": ["pk"]}, id="includes"),
+            pytest.param({"excludes": ["pk"]}, id="excludes"),
+            pytest.param({"overrides": {"name": {"maxLength": 10}}}, id="overrides"),
+            pytest.param({"overrides": {"name": {"maxLength": pop_marker}}}, id="pop_marker"),
+        ],
+    )
+    def test_fingerprint__options(self, kwargs: dict[str, Any]) -> None:
+        cache = SchemaCache()
+        schema_factory = SchemaFactory(StructuralWalker)
+
+        assert cache.fingerprint(schema_factory, User) != cache.fingerprint(
+            schema_factory, User, **kwargs
+        )
+
+    def test_fingerprint__stable(self) -> None:
+        overrides = {"name": {"maxLength": pop_marker}}
+
+        first = SchemaCache().fingerprint(
+            SchemaFactory(StructuralWalker), User, overrides=overrides
+        )
+        second = SchemaCache().fingerprint(
+            SchemaFactory(StructuralWalker), User, overrides=overrides
+        )
+
+        assert first == second
+
+    def test_fingerprint__walker(self) -> None:
+        cache = SchemaCache()
+
+        assert cache.fingerprint(SchemaFactory(StructuralWalker), User) != cache.fingerprint(
+            SchemaFactory(ForeignKeyWalker), User
+        )
+
+    def test_fingerprint__model_changed(self) -> None:
+        """
+        ARRANGE two models with the same name and a different nullability
+        ACT generate their schemas with the same cache
+        ASSERT each schema matches its own model
+        """
+        # arrange
+        schema_factory = SchemaFactory(ForeignKeyWalker, cache=SchemaCache())
+
+        # act
+        nullable = schema_factory(_makeModel(nullable=True))
+        not_nullable = schema_factory(_makeModel(nullable=False))
+
+        # assert
+        assert nullable["required"] == ["pk"]
+        assert not_nullable["required"] == ["name", "pk"]
+
+    def test_fingerprint__related_model(self) -> None:
+        cache = SchemaCache()
+        schema_factory = SchemaFactory(StructuralWalker)
+
+        actual = cache.fingerprint(schema_factory, Group)
+
+        assert actual != cache.fingerprint(schema_factory, User)
+
+    def test_maxsize(self, mocker: MockerFixture) -> None:
+        schema_factory = SchemaFactory(StructuralWalker, cache=SchemaCache(maxsize=1))
+        spy = mocker.spy(schema_factory, "_build_schema")
+
+        schema_factory(User)
+        schema_factory(Group)
+        schema_factory(User)
+
+        assert spy.call_count == 3
+
+    def test_adjust_required__not_cached(
+        self, schema_factory: SchemaFactory, mocker: MockerFixture
+    ) -> None:
+        spy = mocker.spy(schema_factory, "_build_schema")
+
+        schema_factory(User, adjust_required=lambda prop, required: required)
+        schema_factory(User, adjust_required=lambda prop, required: required)
+
+        assert spy.call_count == 2
+
+    def test_directory(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        """
+        ARRANGE a schema generated with an on-disk cache
+        ACT generate the same schema with a new cache on the same directory
+        ASSERT the schema is read from the disk
+        """
+        # arrange
+        expected = SchemaFactory(StructuralWalker, cache=SchemaCache(directory=tmp_path))(User)
+
+        schema_factory = SchemaFactory(StructuralWalker, cache=SchemaCache(directory=tmp_path))
+        spy = mocker.spy(schema_factory, "_build_schema")
+
+        # act
+        actual = schema_factory(User)
+
+        # assert
+        assert actual == expected
+        spy.assert_not_called()
+
+    def test_directory__corrupted(self, tmp_path: Path) -> None:
+        cache = SchemaCache(directory=tmp_path)
+        key = cache.fingerprint(SchemaFactory(StructuralWalker), User)
+        (tmp_path / f"{key}.json").write_text("{")
+
+        assert cache.get(key) is None
+
+    def test_clear(self, tmp_path: Path) -> None:
+        cache = SchemaCache(directory=tmp_path)
+        cache.set("key", {"type": "object"})
+
+        cache.clear()
+
+        assert cache.get("key") is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_directory__max_files(self, tmp_path: Path) -> None:
+        """
+        ARRANGE a full on-disk cache with an old entry read again by another cache
+            AND a new entry written by that cache
+        ACT prune the files of the cache
+        ASSERT only the file not used by that cache is removed
+        """
+        # arrange
+        previous = SchemaCache(directory=tmp_path)
+        previous.set("a", {"type": "object"})
+        previous.set("b", {"type": "object"})
+        os.utime(tmp_path / "a.json", (1, 1))
+        os.utime(tmp_path / "b.json", (2, 2))
+        cache = SchemaCache(directory=tmp_path, max_files=2)
+        cache.get("a")
+        cache.set("c", {"type": "object"})
+
+        # act
+        cache.prune()
+
+        # assert
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["a.json", "c.json"]
+
+    def test_directory__more_files_than_max_files(self, tmp_path: Path) -> None:
+        """
+        ARRANGE runs using more schemas than the maximum number of files
+        ACT run again with the same schemas
+        ASSERT all of them are read from the disk
+        """
+        # arrange
+        keys = ["a", "b", "c", "d", "e"]
+        for _ in range(2):
+            cache = SchemaCache(directory=tmp_path, max_files=4)
+            for key in keys:
+                if cache.get(key) is None:
+                    cache.set(key, {"type": "object"})
+            cache.prune()
+
+        # act
+        cache = SchemaCache(directory=tmp_path, max_files=4)
+        actual = [cache.get(key) for key in keys]
+
+        # assert
+        assert actual == [{"type": "object"}] * len(keys)
+
+    def test_prune(self, tmp_path: Path) -> None:
+        previous = SchemaCache(directory=tmp_path)
+        for key in ["a", "b", "c"]:
+            previous.set(key, {"type": "object"})
+            os.utime(tmp_path / f"{key}.json", (ord(key), ord(key)))
+
+        SchemaCache(directory=tmp_path, max_files=None).prune(max_files=1)
+
+        assert [path.name for path in tmp_path.iterdir()] == ["c.json"]
+
+    def test_directory__not_json_round_trip(self, tmp_path: Path) -> None:
+        SchemaCache(directory=tmp_path).set("key", {"enum": ("a", "b")})
+
+        assert SchemaCache(directory=tmp_path).get("key") is None
+
+    def test_fingerprint__references(self) -> None:
+        cache = SchemaCache()
+        schema_factory = SchemaFactory(StructuralWalker)
+
+        assert cache.fingerprint(schema_factory, User) != cache.fingerprint(
+            schema_factory.with_references(COMPONENTS_REFERENCES), User
+        )
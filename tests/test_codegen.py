@@ -0,0 +1,193 @@
+import importlib.util
+from pathlib import Path
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from jsonschema import Draft7Validator
+from jsonschema.exceptions import ValidationError
+from sqlalchemy.orm import Session
+
+from sqlalchemy_to_json_schema.codegen import (
+    CompiledValidator,
+    CompiledValidatorRegistry,
+    compile_validators,
+    generate_source,
+)
+from sqlalchemy_to_json_schema.command.transformer import OpenAPI3Transformer
+from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.validation import make_format_checker
+from sqlalchemy_to_json_schema.walkers import ForeignKeyWalker, StructuralWalker
+from tests.fixtures.models import address, user
+from tests.fixtures.models.user import Group, User
+
+
+def _errors(validator: Any, payload: Any) -> set[tuple[tuple[Any, ...], str]]:
+    return {(tuple(error.path), str(error.validator)) for error in validator.iter_errors(payload)}
+
+
+def _compiled(schema: dict[str, Any], **kwargs: Any) -> CompiledValidator:
+    return CompiledValidator(schema, compile_validators({"schema": schema}, **kwargs)["schema"])
+
+
+PAYLOADS = [
+    pytest.param({"pk": 1, "name": "ravenclaw", "color": "blue"}, id="valid"),
+    pytest.param({"pk": 1.0, "name": "a", "color": "black"}, id="enum"),
+    pytest.param({"pk": True, "name": 1, "color": 1}, id="types"),
+    pytest.param({"name": "a" * 256}, id="required"),
+    pytest.param({"pk": 1, "name": "a", "created_at": "yesterday"}, id="format"),
+    pytest.param([], id="not_an_object"),
+    pytest.param(
+        {
+            "pk": 1,
+            "name": "a",
+            "users": [
+                {"pk": 1, "name": "b", "address": {"pk": "1", "street": "x"}},
+                {"name": None, "created_at": "2021-01-01T12:34:56"},
+                "not a user",
+            ],
+        },
+        id="references",
+    ),
+    pytest.param({"pk": 1, "name": "a", "users": {"pk": 1}}, id="not_an_array"),
+]
+
+
+class TestCompiledValidator:
+    @pytest.mark.parametrize("payload", PAYLOADS)
+    def test_same_as_jsonschema(self, payload: Any) -> None:
+        """
+        ARRANGE a schema with references
+        ACT validate a payload with the compiled validator and jsonschema
+        ASSERT the same errors are found at the same paths
+        """
+        # arrange
+        schema = SchemaFactory(StructuralWalker)(Group)
+        expected = Draft7Validator(schema, format_checker=make_format_checker())
+
+        # act
+        actual = _errors(_compiled(schema), payload)
+
+        # assert
+        assert actual == _errors(expected, payload)
+
+    @pytest.mark.parametrize("payload", PAYLOADS)
+    def test_components(self, payload: Any) -> None:
+        bundle = OpenAPI3Transformer(SchemaFactory(StructuralWalker)).transform(
+            [user, address], None
+        )
+        schema = bundle["components"]["schemas"]["Group"]
+        expected = Draft7Validator({**bundle, **schema}, format_checker=make_format_checker())
+
+        actual = _errors(_compiled(schema, root=bundle), payload)
+
+        assert actual == _errors(expected, payload)
+
+    @pytest.mark.parametrize(
+        "enum, value, expected",
+        [
+            pytest.param([1, "a"], 1, True, id="int"),
+            pytest.param([1, "a"], 1.0, True, id="float"),
+            pytest.param([1, "a"], True, False, id="bool"),
+            pytest.param([True, None], 1, False, id="int_bool"),
+            pytest.param([True, None], None, True, id="none"),
+            pytest.param([1, "a"], [1], False, id="unhashable"),
+        ],
+    )
+    def test_enum__not_strings(self, enum: list[Any], value: Any, expected: bool) -> None:
+        schema = {"properties": {"value": {"enum": enum}}}
+
+        actual = _errors(_compiled(schema), {"value": value})
+
+        assert (not actual) is expected
+        assert actual == _errors(Draft7Validator(schema), {"value": value})
+
+    def test_recursive_reference(self) -> None:
+        schema = {
+            "definitions": {
+                "Node": {
+                    "type": "object",
+                    "properties": {
+                        "children": {"type": "array", "items": {"$ref": "#/definitions/Node"}}
+                    },
+                }
+            },
+            "$ref": "#/definitions/Node",
+        }
+        payload = {"children": [{"children": [{"children": 1}]}]}
+
+        actual = _errors(_compiled(schema), payload)
+
+        assert actual == {(("children", 0, "children", 0, "children"), "type")}
+
+    def test_unsupported_keyword(self) -> None:
+        with pytest.raises(ValueError, match=r"Unsupported keywords \['minimum'\]"):
+            generate_source({"schema": {"properties": {"pk": {"minimum": 1}}}})
+
+    def test_unknown_keyword(self) -> None:
+        schema = SchemaFactory(ForeignKeyWalker)(Group)
+
+        assert _errors(_compiled({**schema, "relation": "x"}), {"pk": 1, "name": "a"}) == set()
+
+    def test_unresolvable_reference(self) -> None:
+        with pytest.raises(ValueError, match="Unresolvable reference #/definitions/Group"):
+            generate_source({"schema": {"$ref": "#/definitions/Group"}})
+
+    def test_validate(self) -> None:
+        validator = _compiled(SchemaFactory(ForeignKeyWalker)(Group))
+
+        with pytest.raises(ValidationError, match="'black' is not one of"):
+            validator.validate({"pk": 1, "name": "a", "color": "black"})
+
+
+class TestCompiledValidatorRegistry:
+    def test_get_validator(self) -> None:
+        registry = CompiledValidatorRegistry(SchemaFactory(StructuralWalker))
+
+        actual = registry.get_validator(Group)
+
+        assert isinstance(actual, CompiledValidator)
+        assert registry.get_validator(Group) is actual
+
+    def test_iter_violations(self) -> None:
+        engine = sa.create_engine("sqlite://")
+        with engine.begin() as connection:
+            connection.execute(
+                sa.text(
+                    'CREATE TABLE "Group"'
+                    " (pk INTEGER PRIMARY KEY, name TEXT, color TEXT, created_at DATETIME)"
+                )
+            )
+            connection.execute(
+                sa.text("""INSERT INTO "Group" (pk, name) VALUES (1, 'a'), (2, NULL)""")
+            )
+        registry = CompiledValidatorRegistry(SchemaFactory(ForeignKeyWalker))
+
+        with Session(engine) as session:
+            actual = list(registry.iter_violations(Group, sa.select(Group), session=session))
+
+        assert [violation.identity for violation in actual] == [(2,)]
+        assert [error.validator for error in actual[0].errors] == ["required"]
+
+    def test_write_module(self, tmp_path: Path) -> None:
+        """
+        ARRANGE a registry
+        ACT write the validators of two models to a module
+        ASSERT the module can be imported
+            AND has one validator for each model
+        """
+        # arrange
+        registry = CompiledValidatorRegistry(SchemaFactory(StructuralWalker))
+        filename = tmp_path / "validators.py"
+
+        # act
+        registry.write_module(filename, [Group, User])
+
+        # assert
+        spec = importlib.util.spec_from_file_location("validators", filename)
+        assert spec is not None and spec.loader is not None
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        assert module.validate_Group({"pk": 1, "name": "a"}) == []
+        assert [error[:2] for error in module.validate_User({"pk": 1})] == [((), "required")]
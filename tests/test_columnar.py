@@ -0,0 +1,191 @@
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from jsonschema import Draft7Validator
+from sqlalchemy.orm import declarative_base
+
+from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.validation import make_format_checker
+from sqlalchemy_to_json_schema.walkers import ForeignKeyWalker, StructuralWalker
+from tests.fixtures.models.user import User
+
+np = pytest.importorskip("numpy")
+
+from sqlalchemy_to_json_schema.columnar import (  # noqa: E402 isort: skip
+    Batch,
+    ColumnarValidator,
+    iter_batch_rows,
+    map_unique,
+)
+
+Base = declarative_base()
+
+
+class Measure(Base):
+    __tablename__ = "measure"
+
+    pk = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(5), nullable=False)
+    unit = sa.Column(sa.Enum("m", "s"))
+    value = sa.Column(sa.Float)
+    valid = sa.Column(sa.Boolean)
+    day = sa.Column(sa.Date)
+    measured_at = sa.Column(sa.DateTime)
+    starts_at = sa.Column(sa.Time)
+
+
+@pytest.fixture(scope="module")
+def schema() -> dict[str, Any]:
+    return SchemaFactory(ForeignKeyWalker)(Measure)
+
+
+def _rowwise_errors(schema: dict[str, Any], batch: Batch) -> set[tuple[int, str, str]]:
+    validator = Draft7Validator(schema, format_checker=make_format_checker())
+    errors = set()
+
+    for index, row in enumerate(iter_batch_rows(batch)):
+        for error in validator.iter_errors(row):
+            # The required errors are reported on the object, not the property
+            name = error.path[0] if error.path else error.message.split("'")[1]
+            errors.add((index, name, str(error.validator)))
+
+    return errors
+
+
+def _columnar_errors(schema: dict[str, Any], batch: Batch) -> set[tuple[int, str, str]]:
+    return {
+        (int(index), name, keyword)
+        for (name, keyword), indexes in ColumnarValidator(schema).validate(batch).items()
+        for index in indexes
+    }
+
+
+CORPUS = [
+    pytest.param(
+        {
+            "pk": np.array([1, 2, 3]),
+            "name": np.array(["a", "abcde", "abcdef"]),
+            "unit": np.array(["m", "s", "h"]),
+            "value": np.array([1.5, np.nan, 3.0]),
+            "valid": np.array([True, False, True]),
+        },
+        id="typed",
+    ),
+    pytest.param(
+        {
+            "pk": [1, "2", None, 4.0, True, 6.5],
+            "name": ["a", None, 3, "abcdef", "é" * 5, ""],
+            "unit": ["m", None, 1, True, "s", "x"],
+            "value": [1, 2.5, "3", None, False, float("nan")],
+            "valid": [True, 1, "true", None, False, 0.0],
+        },
+        id="objects",
+    ),
+    pytest.param(
+        {
+            "pk": np.array([1, 2, 3, 4]),
+            "name": np.array(["a", "b", "c", "d"]),
+            "day": ["2021-01-01", "2021-02-29", None, 20210101],
+            "measured_at": ["2021-01-01T12:34:56", "2021-01-01T25:00", None, "yesterday"],
+            "starts_at": np.array(["12:34", "12:34:56Z", "noon", "25:00"]),
+        },
+        id="formats",
+    ),
+    pytest.param(
+        {
+            "pk": np.array([1, 2, 3]),
+            "name": np.array(["a", "b", "c"]),
+            "day": np.array(["2021-01-01", "NaT", "2021-12-31"], dtype="datetime64[D]"),
+            "measured_at": np.array(["2021-01-01T12:34", "NaT", "NaT"], dtype="datetime64[s]"),
+        },
+        id="datetime64",
+    ),
+    pytest.param({"pk": np.array([1, 2]), "value": np.array([1.0, 2.0])}, id="missing_column"),
+    pytest.param({"pk": np.array([], dtype=int), "name": np.array([], dtype=str)}, id="empty"),
+]
+
+
+class TestColumnarValidator:
+    @pytest.mark.parametrize("batch", CORPUS)
+    def test_same_as_rowwise(self, schema: dict[str, Any], batch: Batch) -> None:
+        """
+        ARRANGE a batch of columns
+        ACT validate it with the columnar validator and each row with jsonschema
+        ASSERT the same rows fail the same rules
+        """
+        # act
+        actual = _columnar_errors(schema, batch)
+
+        # assert
+        assert actual == _rowwise_errors(schema, batch)
+
+    def test_validate(self, schema: dict[str, Any]) -> None:
+        batch = {
+            "pk": np.array([1, 2, 3]),
+            "name": np.array(["a", "abcdef", "abcdefg"]),
+            "unit": np.array(["m", "s", "h"]),
+        }
+
+        actual = ColumnarValidator(schema).validate(batch)
+
+        assert actual.keys() == {("name", "maxLength"), ("unit", "enum")}
+        assert actual["name", "maxLength"].tolist() == [1, 2]
+        assert actual["unit", "enum"].tolist() == [2]
+
+    def test_validate__different_lengths(self, schema: dict[str, Any]) -> None:
+        with pytest.raises(ValueError, match="same length"):
+            ColumnarValidator(schema).validate({"pk": [1, 2], "name": ["a"]})
+
+    def test_unsupported_keyword(self, schema: dict[str, Any]) -> None:
+        schema = {**schema, "properties": {**schema["properties"], "pk": {"minimum": 1}}}
+
+        with pytest.raises(ValueError, match=r"Unsupported keywords for pk: \['minimum'\]"):
+            ColumnarValidator(schema)
+
+    def test_unknown_keyword(self, schema: dict[str, Any]) -> None:
+        schema = {**schema, "properties": {**schema["properties"], "pk": {"relation": "group"}}}
+
+        assert ColumnarValidator(schema).properties["pk"] == {"relation": "group"}
+
+    def test_relationships__skipped(self) -> None:
+        validator = ColumnarValidator(SchemaFactory(StructuralWalker)(User))
+
+        assert "group" not in validator.properties
+        assert "name" in validator.properties
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        pytest.param(np.array(["a", "b", "a", "a"]), id="strings"),
+        pytest.param(np.array(["a", "b", "a", "a"], dtype=object), id="objects"),
+    ],
+)
+def test_map_unique(values: Any) -> None:
+    """
+    ARRANGE an array with repeated values
+    ACT map a predicate over it
+    ASSERT the predicate is called once for each distinct value
+    """
+    # arrange
+    calls = []
+
+    def predicate(value: Any) -> bool:
+        calls.append(value)
+        return bool(value == "a")
+
+    # act
+    actual = map_unique(values, predicate)
+
+    # assert
+    assert actual.tolist() == [True, False, True, True]
+    assert sorted(calls) == ["a", "b"]
+
+
+def test_map_unique__objects() -> None:
+    values = np.array([1, True, 1.0, [1], [1], 1], dtype=object)
+
+    actual = map_unique(values, lambda value: type(value) is int)
+
+    assert actual.tolist() == [True, False, False, False, False, True]
@@ -0,0 +1,90 @@
+from sqlalchemy_to_json_schema.paths import PathTrie, as_path_trie, freeze
+
+
+def test_from_paths() -> None:
+    trie = PathTrie.from_paths(["pk", "group", "group.name", "group.users.pk"])
+
+    assert list(trie) == ["pk", "group", "group.name", "group.users.pk"]
+    assert "pk" in trie
+    assert "group" in trie
+    assert "name" not in trie
+    assert list(trie.child("group")) == ["name", "users.pk"]
+    assert "users" not in trie.child("group")
+
+
+def test_child__missing() -> None:
+    trie = PathTrie.from_paths(["pk"])
+
+    actual = trie.child("group")
+
+    assert not actual
+    assert list(actual) == []
+
+
+def test_from_mapping() -> None:
+    trie = PathTrie.from_mapping({"name": {"maxLength": 10}, "group.name": {"maxLength": 20}})
+
+    assert dict(trie.items()) == {"name": {"maxLength": 10}, "group.name": {"maxLength": 20}}
+    assert dict(trie.child("group").items()) == {"name": {"maxLength": 20}}
+
+
+def test_splitter() -> None:
+    trie = PathTrie.from_paths(["group/name"], splitter="/")
+
+    assert list(trie.child("group")) == ["name"]
+
+
+def test_extended() -> None:
+    """
+    ARRANGE a trie with a nested path
+    ACT extend it with top-level names
+    ASSERT the new trie has the names and the original one is unchanged
+    """
+    # arrange
+    trie = PathTrie.from_paths(["users.name"])
+
+    # act
+    actual = trie.extended(["users", "group"])
+
+    # assert
+    assert list(actual) == ["users", "users.name", "group"]
+    assert list(trie) == ["users.name"]
+
+
+def test_extended__nothing_new() -> None:
+    trie = PathTrie.from_paths(["users"])
+
+    assert trie.extended(["users"]) is trie
+
+
+def test_used_paths() -> None:
+    """
+    ARRANGE a trie of overrides
+    ACT mark some paths as used from a sub-trie
+    ASSERT the used and not used paths are reported from the root
+    """
+    # arrange
+    trie = PathTrie.from_mapping({"name": {}, "group.name": {}, "group.pk": {}})
+
+    # act
+    trie.child("group").mark_used(["name"])
+
+    # assert
+    assert trie.used_paths() == frozenset(["group.name"])
+    assert trie.not_used_paths() == {"name", "group.pk"}
+    assert trie.child("group").used_paths() == frozenset(["name"])
+
+
+def test_freeze() -> None:
+    first = PathTrie.from_mapping({"a.b": {"maxLength": 1}, "c": {}})
+    second = PathTrie.from_mapping({"c": {}, "a.b": {"maxLength": 1}})
+
+    assert freeze(first) == freeze(second)
+    assert freeze(first) != freeze(PathTrie.from_mapping({"a.b": {"maxLength": 2}, "c": {}}))
+
+
+def test_as_path_trie() -> None:
+    trie = PathTrie.from_paths(["pk"])
+
+    assert as_path_trie(trie) is trie
+    assert list(as_path_trie(["pk", "group.pk"])) == ["pk", "group.pk"]
@@ -0,0 +1,102 @@
+import sqlalchemy as sa
+import sqlalchemy.orm as orm
+from sqlalchemy.orm import MANYTOONE, ONETOMANY, declarative_base
+
+from sqlalchemy_to_json_schema.plans import MapperPlan, MapperPlanCache, get_mapper_plan
+
+Base = declarative_base()
+
+
+class Parent(Base):
+    __tablename__ = "plan_parent"
+
+    pk = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(255))
+
+
+class Child(Base):
+    __tablename__ = "plan_child"
+
+    pk = sa.Column(sa.Integer, primary_key=True)
+    _parent_id = sa.Column("parent_id", sa.Integer, sa.ForeignKey(Parent.pk))
+    parent = orm.relationship(Parent, backref="children")
+
+
+def test_from_mapper() -> None:
+    """
+    ARRANGE a mapper with a foreign key and a relationship
+    ACT build the plan
+    ASSERT the properties, index, foreign keys and directions are collected
+    """
+    # arrange
+    mapper = sa.inspect(Child)
+
+    # act
+    actual = MapperPlan.from_mapper(mapper)
+
+    # assert
+    assert actual.mapper is mapper
+    assert actual.column_properties == (mapper.attrs["pk"], mapper.attrs["_parent_id"])
+    assert actual.relationships == (mapper.attrs["parent"],)
+    assert actual.properties == actual.column_properties + actual.relationships
+    assert dict(actual.column_index) == {
+        "pk": mapper.attrs["pk"],
+        "parent_id": mapper.attrs["_parent_id"],
+    }
+    assert actual.foreign_key_properties == frozenset([mapper.attrs["_parent_id"]])
+    assert dict(actual.directions) == {mapper.attrs["parent"]: MANYTOONE}
+
+
+def test_from_mapper__backref() -> None:
+    mapper = sa.inspect(Parent)
+
+    actual = MapperPlan.from_mapper(mapper)
+
+    assert dict(actual.directions) == {mapper.attrs["children"]: ONETOMANY}
+
+
+def test_get_mapper_plan__cached() -> None:
+    mapper = sa.inspect(Parent)
+
+    assert get_mapper_plan(mapper) is get_mapper_plan(mapper)
+
+
+def test_get_mapper_plan__invalidated_on_new_property() -> None:
+    """
+    ARRANGE a planned mapper
+    ACT add a model with a backref to the planned mapper
+    ASSERT a new plan including the backref is built
+    """
+    # arrange
+    local_base = declarative_base()
+
+    class Target(local_base):
+        __tablename__ = "plan_target"
+
+        pk = sa.Column(sa.Integer, primary_key=True)
+
+    mapper = sa.inspect(Target)
+    plan = get_mapper_plan(mapper)
+
+    # act
+    class Source(local_base):
+        __tablename__ = "plan_source"
+
+        pk = sa.Column(sa.Integer, primary_key=True)
+        target_id = sa.Column(sa.Integer, sa.ForeignKey(Target.pk))
+        target = orm.relationship(Target, backref="sources")
+
+    actual = get_mapper_plan(mapper)
+
+    # assert
+    assert actual is not plan
+    assert [prop.key for prop in actual.relationships] == ["sources"]
+
+
+def test_mapper_plan_cache__bounded() -> None:
+    cache = MapperPlanCache(maxsize=1)
+
+    cache[sa.inspect(Parent)]
+    cache[sa.inspect(Child)]
+
+    assert list(cache._plans) == [sa.inspect(Child)]
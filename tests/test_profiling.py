@@ -0,0 +1,127 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from sqlalchemy_to_json_schema.profiling import NullProfiler, Profiler, get_profiler
+from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.walkers import StructuralWalker
+from tests.fixtures.models.user import Group, User
+
+
+class TestProfiler:
+    def test_phase(self) -> None:
+        """
+        ARRANGE a profiler
+        ACT record the same phase twice, once for a model
+        ASSERT the phase is recorded twice
+            AND the model once
+        """
+        # arrange
+        profiler = Profiler()
+
+        # act
+        with profiler.phase("build"):
+            pass
+        with profiler.phase("build", model="User"):
+            pass
+
+        # assert
+        assert profiler.phases["build"].calls == 2
+        assert profiler.phases["build"].seconds > 0
+        assert list(profiler.models) == ["User"]
+        assert profiler.models["User"]["build"].calls == 1
+
+    def test_phase__exception(self) -> None:
+        profiler = Profiler()
+
+        with pytest.raises(RuntimeError):
+            with profiler.phase("build", model="User"):
+                raise RuntimeError()
+
+        assert profiler.models["User"]["build"].calls == 1
+
+    def test_activate(self) -> None:
+        """
+        ARRANGE a profiler
+        ACT activate the profiler
+        ASSERT the profiler is the active one only while it's activated
+        """
+        # arrange
+        profiler = Profiler()
+
+        # act
+        with profiler.activate():
+            active = get_profiler()
+
+        # assert
+        assert active is profiler
+        assert isinstance(get_profiler(), NullProfiler)
+
+    def test_activate__schema_factory(self) -> None:
+        """
+        ARRANGE an activated profiler
+        ACT generate the schemas of two models
+        ASSERT the properties are timed for each model
+        """
+        # arrange
+        profiler = Profiler()
+        schema_factory = SchemaFactory(StructuralWalker)
+
+        # act
+        with profiler.activate():
+            schema_factory(User)
+            schema_factory(Group)
+
+        # assert
+        assert set(profiler.models) == {"User", "Group"}
+        assert profiler.phases["build_properties"].calls == 2
+
+    def test_top_models(self) -> None:
+        profiler = Profiler()
+        profiler.models["fast"]["build"].add(0.1, 10)
+        profiler.models["slow"]["build"].add(0.2, 10)
+        profiler.models["slow"]["dump"].add(0.2, 10)
+        profiler.models["slowest"]["build"].add(1, 10)
+
+        assert profiler.top_models(2) == ["slowest", "slow"]
+        assert "slowest" in profiler.format_top(1)
+        assert "fast " not in profiler.format_top(1)
+
+    def test_dump_report(self, tmp_path: Path) -> None:
+        profiler = Profiler()
+        profiler.models["User"]["build"].add(0.5, 10)
+        profiler.phases["build"].add(0.5, 10)
+
+        profiler.dump_report(tmp_path / "report.json")
+
+        assert json.loads((tmp_path / "report.json").read_text()) == {
+            "version": 1,
+            "phases": {"build": {"calls": 1, "seconds": 0.5, "allocated_blocks": 10}},
+            "models": {
+                "User": {
+                    "seconds": 0.5,
+                    "phases": {"build": {"calls": 1, "seconds": 0.5, "allocated_blocks": 10}},
+                }
+            },
+        }
+
+    def test_dump_stats(self, tmp_path: Path) -> None:
+        profiler = Profiler(cprofile=True)
+
+        with profiler.activate():
+            SchemaFactory(StructuralWalker)(User)
+
+        profiler.dump_stats(tmp_path / "profile.pstats")
+
+        assert (tmp_path / "profile.pstats").stat().st_size > 0
+
+    def test_dump_stats__without_cprofile(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="The profiler was created without cProfile"):
+            Profiler().dump_stats(tmp_path / "profile.pstats")
+
+
+def test_null_profiler() -> None:
+    profiler = NullProfiler()
+
+    assert profiler.phase("build") is profiler.phase("dump", model="User")
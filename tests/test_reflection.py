@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from pytest_mock import MockerFixture
+from sqlalchemy.engine.reflection import Inspector
+from sqlalchemy.ext.automap import automap_base
+
+from sqlalchemy_to_json_schema.reflection import reflect_schemas, reflect_tables
+from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.tables import (
+    ForeignKeyTableWalker,
+    StructuralTableWalker,
+    TableSchemaFactory,
+)
+from sqlalchemy_to_json_schema.walkers import StructuralWalker
+
+
+@pytest.fixture
+def engine() -> sa.Engine:
+    engine = sa.create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE country (code CHAR(2) PRIMARY KEY, name VARCHAR(64) NOT NULL)"
+        )
+        connection.exec_driver_sql(
+            "CREATE TABLE city (country_code CHAR(2) REFERENCES country (code),"
+            " name VARCHAR(64), founded_on DATE, PRIMARY KEY (country_code, name))"
+        )
+        connection.exec_driver_sql(
+            "CREATE TABLE street (id INTEGER PRIMARY KEY, country_code CHAR(2), city_name"
+            " VARCHAR(64), FOREIGN KEY (country_code, city_name) REFERENCES city"
+            " (country_code, name))"
+        )
+
+    return engine
+
+
+def test_reflect_tables(engine: sa.Engine) -> None:
+    """
+    ARRANGE a database with composite primary and foreign keys
+    ACT reflect its tables in bulk
+    ASSERT the tables have the same schemas as the ones reflected one by one
+    """
+    # arrange
+    expected = sa.MetaData()
+    expected.reflect(engine)
+    target = TableSchemaFactory(ForeignKeyTableWalker)
+
+    # act
+    actual = reflect_tables(engine)
+
+    # assert
+    assert target.schemas(actual) == target.schemas(expected)
+    assert [column.name for column in actual.tables["city"].primary_key] == [
+        "country_code",
+        "name",
+    ]
+    assert {
+        (fk.parent.name, fk.target_fullname) for fk in actual.tables["street"].foreign_keys
+    } == {("country_code", "city.country_code"), ("city_name", "city.name")}
+
+
+def test_reflect_tables__filter_names(engine: sa.Engine) -> None:
+    actual = reflect_tables(engine, filter_names=["city", "street"])
+
+    # The foreign key to the country table is not reflected, it can't be resolved
+    assert list(actual.tables) == ["city", "street"]
+    assert not actual.tables["city"].foreign_keys
+    assert len(actual.tables["street"].foreign_keys) == 2
+
+
+def test_reflect_tables__bulk(engine: sa.Engine, mocker: MockerFixture) -> None:
+    reflect_table = mocker.spy(Inspector, "reflect_table")
+    get_multi_columns = mocker.spy(Inspector, "get_multi_columns")
+
+    reflect_tables(engine)
+
+    reflect_table.assert_not_called()
+    get_multi_columns.assert_called_once()
+
+
+def test_reflect_schemas() -> None:
+    """
+    ARRANGE a SQLite database
+    ACT build the schemas of its tables from the bulk reflection
+    ASSERT they are the same as the schemas of the automapped classes
+    """
+    # arrange
+    dbname = Path(__file__).parent.resolve() / "reflection.db"
+    engine = sa.create_engine(f"sqlite:///{dbname}")
+    Base = automap_base()
+    Base.prepare(autoload_with=engine)
+    schema_factory = SchemaFactory(StructuralWalker)
+
+    # act
+    actual = reflect_schemas(
+        engine, TableSchemaFactory(StructuralTableWalker, schema_factory=schema_factory)
+    )
+
+    # assert
+    assert actual == {model.__table__.name: schema_factory(model) for model in Base.classes}
@@ -3,12 +3,19 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import Any
 
+import pytest
 import sqlalchemy as sa
 import sqlalchemy.orm as orm
+from pytest_mock import MockerFixture
 from pytest_unordered import unordered
 from sqlalchemy.orm import Mapped, declarative_base
 
-from sqlalchemy_to_json_schema.decisions import UseForeignKeyIfPossibleDecision
+from benchmarks.models import ModelGraph, generate_models
+from sqlalchemy_to_json_schema.decisions import (
+    AbstractDecision,
+    UseForeignKeyIfPossibleDecision,
+)
+from sqlalchemy_to_json_schema.exceptions import InvalidStatus
 from sqlalchemy_to_json_schema.schema_factory import RelationDecision, SchemaFactory
 from sqlalchemy_to_json_schema.walkers import (
     AbstractWalker,
@@ -223,3 +230,170 @@ def test_properties__infinite_loop2() -> None:
     assert list(result["properties"]) == unordered(["id", "y_id"])
 
     assert result["properties"]["y_id"] == {"type": "integer", "relation": "ys"}
+
+
+# shared definitions
+# Root.left -> Left.leaf -> Leaf, Root.right -> Right.leaf -> Leaf
+
+
+class Leaf(Base):
+    __tablename__ = "leaf"
+    id = sa.Column(sa.Integer, primary_key=True)
+
+
+class Left(Base):
+    __tablename__ = "left"
+    id = sa.Column(sa.Integer, primary_key=True)
+    leaf_id = sa.Column(sa.Integer, sa.ForeignKey(Leaf.id))
+    leaf = orm.relationship(Leaf)
+
+
+class Right(Base):
+    __tablename__ = "right"
+    id = sa.Column(sa.Integer, primary_key=True)
+    leaf_id = sa.Column(sa.Integer, sa.ForeignKey(Leaf.id))
+    leaf = orm.relationship(Leaf)
+
+
+class Root(Base):
+    __tablename__ = "root"
+    id = sa.Column(sa.Integer, primary_key=True)
+    left_id = sa.Column(sa.Integer, sa.ForeignKey(Left.id))
+    right_id = sa.Column(sa.Integer, sa.ForeignKey(Right.id))
+    left = orm.relationship(Left)
+    right = orm.relationship(Right)
+
+
+class Node(Base):
+    __tablename__ = "node"
+    id = sa.Column(sa.Integer, primary_key=True)
+    parent_id = sa.Column(sa.Integer, sa.ForeignKey("node.id"))
+    first_id = sa.Column(sa.Integer, sa.ForeignKey("node.id"))
+    children = orm.relationship("Node", foreign_keys=[parent_id])
+    parent = orm.relationship(
+        "Node", foreign_keys=[parent_id], remote_side=[id], overlaps="children"
+    )
+    first = orm.relationship("Node", foreign_keys=[first_id], remote_side=[id])
+
+
+def test_properties__shared_definition_built_once(mocker: MockerFixture) -> None:
+    target = _makeOne(StructuralWalker)
+    spy = mocker.spy(target.child_factory, "child_schema")
+
+    result = target(Root)
+
+    assert [str(call.args[0]) for call in spy.call_args_list] == [
+        "Root.left",
+        "Left.leaf",
+        "Root.right",
+    ]
+    assert result["properties"]["left"] == {"$ref": "#/definitions/Left"}
+    assert result["properties"]["right"] == {"$ref": "#/definitions/Right"}
+    assert get_reference(result["properties"]["right"], result)["properties"]["leaf"] == {
+        "$ref": "#/definitions/Leaf"
+    }
+    assert result["definitions"]["Leaf"] == {
+        "properties": {"id": {"type": "integer"}},
+        "required": ["id"],
+        "type": "object",
+    }
+
+
+def test_properties__self_referential(mocker: MockerFixture) -> None:
+    target = _makeOne(StructuralWalker)
+    spy = mocker.spy(target.child_factory, "child_schema")
+
+    result = target(Node)
+
+    assert spy.call_count <= 3
+    assert list(result["properties"]) == unordered(["id", "children", "parent", "first"])
+    assert result["properties"]["children"] == {
+        "type": "array",
+        "items": {"$ref": "#/definitions/Node"},
+    }
+    assert result["definitions"]["Node"]["required"] == ["id"]
+
+
+# dotted paths
+
+
+def test_properties__nested_includes() -> None:
+    target = _makeOne(StructuralWalker)
+
+    result = target(User, includes=["pk", "group", "group.name"])
+
+    assert list(result["properties"]) == unordered(["group", "pk"])
+    assert result["definitions"]["Group"]["properties"] == {
+        "name": {"maxLength": 255, "type": "string"}
+    }
+
+
+def test_properties__nested_excludes() -> None:
+    target = _makeOne(StructuralWalker)
+
+    result = target(User, excludes=["group.name"])
+
+    assert list(result["properties"]) == unordered(["group", "name", "pk"])
+    assert list(result["definitions"]["Group"]["properties"]) == ["pk"]
+
+
+def test_properties__nested_overrides() -> None:
+    target = _makeOne(StructuralWalker)
+
+    result = target(User, overrides={"name": {"maxLength": 10}, "group.name": {"maxLength": 20}})
+
+    assert result["properties"]["name"] == {"maxLength": 10, "type": "string"}
+    assert result["definitions"]["Group"]["properties"]["name"] == {
+        "maxLength": 20,
+        "type": "string",
+    }
+
+
+def test_properties__nested_overrides__not_used() -> None:
+    target = _makeOne(StructuralWalker)
+
+    with pytest.raises(InvalidStatus, match="group.missing"):
+        target(User, overrides={"group.missing": {"maxLength": 20}})
+
+
+def test_properties__nested_overrides__shared_definition() -> None:
+    target = _makeOne(StructuralWalker)
+
+    result = target(
+        Root, overrides={"left.leaf.id": {"minimum": 1}, "right.leaf.id": {"minimum": 1}}
+    )
+
+    assert result["definitions"]["Leaf"]["properties"]["id"] == {"minimum": 1, "type": "integer"}
+
+
+@pytest.mark.parametrize("depth", [4, 6])
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+@pytest.mark.parametrize(
+    "decision",
+    [
+        pytest.param(RelationDecision(), id="relation"),
+        pytest.param(UseForeignKeyIfPossibleDecision(), id="foreign_key"),
+    ],
+)
+def test_properties__built_once_per_key(
+    mocker: MockerFixture, seed: int, decision: AbstractDecision, depth: int
+) -> None:
+    """
+    ARRANGE cyclic models
+    ACT build the schemas of the models
+    ASSERT each definition is built once per related mapper, excluded back reference and depth
+    """
+    # arrange
+    models = generate_models(ModelGraph(tables=5, columns=2, fanout=3, seed=seed))
+    relationships = sum(len(sa.inspect(model).relationships) for model in models)
+    target = _makeOne(StructuralWalker, relation_decision=decision)
+    spy = mocker.spy(target.child_factory, "child_schema")
+
+    for model in models:
+        spy.reset_mock()
+
+        # act
+        target(model, depth=depth)
+
+        # assert
+        assert spy.call_count <= relationships * depth
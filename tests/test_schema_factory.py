@@ -1,9 +1,11 @@
+import pickle
 from collections.abc import Sequence
 from datetime import datetime
 from typing import Any, Callable, Optional, Union
 
 import pytest
 import sqlalchemy as sa
+from pytest_mock import MockerFixture
 from sqlalchemy import BigInteger, FetchedValue, Integer, String, func
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -12,7 +14,24 @@ from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.sql.expression import ColumnElement
 from sqlalchemy.sql.type_api import TypeEngine
 
-from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.exceptions import InvalidStatus
+from sqlalchemy_to_json_schema.schema_factory import (
+    COMPONENTS_REFERENCES,
+    DEFINITIONS_REFERENCES,
+    Classifier,
+    CollectionForOverrides,
+    DefinitionsMemo,
+    References,
+    RestrictionTable,
+    SchemaFactory,
+    default_restriction_dict,
+    enum_one_of,
+    get_children,
+    get_class_mapping,
+    pop_marker,
+    string_max_length,
+    uuid_format,
+)
 from sqlalchemy_to_json_schema.walkers import (
     AbstractWalker,
     ForeignKeyWalker,
@@ -20,6 +39,7 @@ from sqlalchemy_to_json_schema.walkers import (
     StructuralWalker,
 )
 from tests.fixtures.models.base import Base
+from tests.fixtures.models.user import Group, User
 
 WALKER_CLASSES: Sequence[type[AbstractWalker]] = [
     ForeignKeyWalker,
@@ -47,11 +67,10 @@ class TestSchemaFactory:
             )
 
         target = SchemaFactory(walker_cls)
-        walker = target.walker(Model)
 
-        result = target._detect_required(walker)
+        result = target(Model)
 
-        assert result == ["pk"]
+        assert result["required"] == ["pk"]
 
     @pytest.mark.parametrize("server_default", [None, func.sysdate()])
     @pytest.mark.parametrize("default", [None, datetime.now])
@@ -71,13 +90,12 @@ class TestSchemaFactory:
             )
 
         target = SchemaFactory(walker_cls)
-        walker = target.walker(Model)
 
-        result = target._detect_required(walker)
+        result = target(Model)
 
         expected = sorted(["pk", "created_at"])
 
-        assert result == expected
+        assert result["required"] == expected
 
     @pytest.mark.parametrize("walker_cls", WALKER_CLASSES)
     def test_detect__adjust_required(self, walker_cls: type[AbstractWalker]) -> None:
@@ -87,14 +105,13 @@ class TestSchemaFactory:
             pk = sa.Column(sa.Integer, primary_key=True, doc="primary key")
 
         target = SchemaFactory(walker_cls)
-        walker = target.walker(Model)
 
-        result = target._detect_required(
-            walker,
+        result = target(
+            Model,
             adjust_required=lambda prop, default: False if prop.key == "pk" else default,
         )
 
-        assert result == []
+        assert "required" not in result
 
     @pytest.mark.parametrize("walker_cls", WALKER_CLASSES)
     @pytest.mark.parametrize(
@@ -357,3 +374,352 @@ class TestSchemaFactory:
             "title": "Model",
             "type": "object",
         }
+
+    def test_call__walks_each_model_once(self, mocker: MockerFixture) -> None:
+        """
+        ARRANGE a model with nested relationships
+        ACT generate the schema
+        ASSERT each walker is walked once, including the required detection
+        """
+        # arrange
+        target = SchemaFactory(StructuralWalker)
+        spy = mocker.spy(StructuralWalker, "walk")
+        m_from_child = mocker.spy(StructuralWalker, "from_child")
+
+        # act
+        actual = target(Group)
+
+        # assert
+        assert spy.call_count == 3  # Group, User and Address
+        m_from_child.assert_not_called()
+        assert actual["required"] == ["name", "pk"]
+        assert actual["definitions"]["User"]["required"] == ["name", "pk"]
+        assert actual["definitions"]["Address"]["required"] == ["pk", "street", "town"]
+
+    @pytest.mark.parametrize("walker_cls", WALKER_CLASSES)
+    def test_call__adjust_required(self, walker_cls: type[AbstractWalker]) -> None:
+        target = SchemaFactory(walker_cls)
+
+        actual = target(
+            Group, adjust_required=lambda prop, default: False if prop.key == "pk" else default
+        )
+
+        assert actual["required"] == ["name"]
+
+    @pytest.mark.parametrize("walker_cls", WALKER_CLASSES)
+    def test_call__depth_exhausted__required(self, walker_cls: type[AbstractWalker]) -> None:
+        target = SchemaFactory(walker_cls)
+
+        actual = target(Group, depth=0)
+
+        assert actual["properties"] == {}
+        assert actual["required"] == ["name", "pk"]
+
+
+class TestClassifier:
+    def test_pickle(self) -> None:
+        """
+        ARRANGE a classifier with a resolved type
+        ACT pickle and unpickle the classifier
+        ASSERT the copy resolves the types with a cache of the same size
+        """
+        # arrange
+        classifier = Classifier(cache_size=16)
+        classifier[String(10)]
+
+        # act
+        actual = pickle.loads(pickle.dumps(classifier))
+
+        # assert
+        assert actual[String(10)] == (String, "string")
+        assert actual._resolve.cache_info().maxsize == 16
+
+    def test_getitem__cached(self, mocker: MockerFixture) -> None:
+        """
+        ARRANGE a classifier
+        ACT resolve two columns with the same type class
+        ASSERT the type mapping is resolved only once
+        """
+        # arrange
+        classifier = Classifier()
+        m_get_class_mapping = mocker.patch(
+            "sqlalchemy_to_json_schema.schema_factory.get_class_mapping",
+            wraps=get_class_mapping,
+        )
+
+        # act
+        first = classifier[String(10)]
+        second = classifier[String(20)]
+
+        # assert
+        assert first == second == (String, "string")
+        m_get_class_mapping.assert_called_once()
+
+    def test_getitem__not_found_is_cached(self, mocker: MockerFixture) -> None:
+        """
+        ARRANGE a classifier with an empty mapping
+        ACT resolve an unknown type twice
+        ASSERT both lookups fail but the type mapping is resolved only once
+        """
+        # arrange
+        classifier = Classifier({})
+        m_get_class_mapping = mocker.patch(
+            "sqlalchemy_to_json_schema.schema_factory.get_class_mapping",
+            wraps=get_class_mapping,
+        )
+
+        # act & assert
+        for _ in range(2):
+            with pytest.raises(InvalidStatus):
+                classifier[Integer()]
+
+        m_get_class_mapping.assert_called_once()
+
+    def test_clear(self, mocker: MockerFixture) -> None:
+        """
+        ARRANGE a classifier with a resolved type
+        ACT clear the cache
+        ASSERT the type mapping is resolved again
+        """
+        # arrange
+        classifier = Classifier()
+        classifier[Integer()]
+
+        m_get_class_mapping = mocker.patch(
+            "sqlalchemy_to_json_schema.schema_factory.get_class_mapping",
+            wraps=get_class_mapping,
+        )
+
+        # act
+        classifier.clear()
+        classifier[Integer()]
+
+        # assert
+        m_get_class_mapping.assert_called_once()
+
+    def test_cache_size__bounded(self) -> None:
+        classifier = Classifier(cache_size=2)
+
+        for type_ in (Integer(), String(), BigInteger()):
+            classifier[type_]
+
+        assert classifier._resolve.cache_info().currsize == 2
+
+    def test_preload(self, mocker: MockerFixture) -> None:
+        """
+        ARRANGE a classifier built with preload
+        ACT resolve a builtin type
+        ASSERT the type mapping was already resolved
+        """
+        # arrange
+        classifier = Classifier(cache_size=None, preload=True)
+        m_get_class_mapping = mocker.patch(
+            "sqlalchemy_to_json_schema.schema_factory.get_class_mapping",
+            wraps=get_class_mapping,
+        )
+
+        # act
+        actual = classifier[postgresql.UUID()]
+
+        # assert
+        assert actual == (postgresql.UUID, "string")
+        m_get_class_mapping.assert_not_called()
+
+
+class TestRestrictionTable:
+    @pytest.mark.parametrize(
+        "type_, expected",
+        [
+            pytest.param(String, (string_max_length,), id="exact"),
+            pytest.param(sa.Unicode, (string_max_length,), id="mro"),
+            pytest.param(sa.Enum, (string_max_length, enum_one_of), id="multiple"),
+            pytest.param(Integer, (), id="none"),
+        ],
+    )
+    def test_getitem(self, type_: type[TypeEngine], expected: tuple[Any, ...]) -> None:
+        """
+        ARRANGE a restriction table with the default restrictions
+        ACT get the restrictions for a type class
+        ASSERT returns the restrictions in the declaration order
+        """
+        # arrange
+        restrictions = RestrictionTable(default_restriction_dict)
+
+        # act
+        actual = restrictions[type_]
+
+        # assert
+        assert actual == expected
+
+    def test_getitem__impl(self) -> None:
+        class Choice(sa.TypeDecorator):
+            impl = String
+            cache_ok = True
+
+        restrictions = RestrictionTable(default_restriction_dict)
+
+        assert restrictions[Choice] == (string_max_length,)
+
+    def test_getitem__sequence_of_restrictions(self) -> None:
+        restrictions = RestrictionTable(
+            {String: (string_max_length, uuid_format)}  # type: ignore[dict-item]
+        )
+
+        assert restrictions[String] == (string_max_length, uuid_format)
+
+    def test_getitem__compiled_once(self, mocker: MockerFixture) -> None:
+        """
+        ARRANGE a restriction table
+        ACT get the restrictions for the same type class twice
+        ASSERT the restrictions are resolved only on the first lookup
+        """
+        # arrange
+        restrictions = RestrictionTable(default_restriction_dict)
+        m_get_class_mapping = mocker.patch(
+            "sqlalchemy_to_json_schema.schema_factory.get_class_mapping",
+            wraps=get_class_mapping,
+        )
+
+        # act
+        restrictions[String]
+        restrictions[String]
+
+        # assert
+        assert m_get_class_mapping.call_count == len(default_restriction_dict)
+
+
+class TestReferences:
+    @pytest.mark.parametrize(
+        "references, expected",
+        [
+            pytest.param(DEFINITIONS_REFERENCES, "#/definitions/Group", id="definitions"),
+            pytest.param(COMPONENTS_REFERENCES, "#/components/schemas/Group", id="components"),
+        ],
+    )
+    def test_ref(self, references: References, expected: str) -> None:
+        """
+        ARRANGE a schema factory with a references strategy
+        ACT generate the schema of a model with relationships
+        ASSERT the references use the strategy's prefix
+        """
+        # arrange
+        schema_factory = SchemaFactory(StructuralWalker, references=references)
+
+        # act
+        actual = schema_factory(User)
+
+        # assert
+        assert actual["properties"]["group"] == {"$ref": expected}
+        assert "Group" in actual["definitions"]
+
+    def test_container(self) -> None:
+        references = References(prefix="#/$defs/", container="$defs")
+
+        actual = SchemaFactory(StructuralWalker, references=references)(User)
+
+        assert actual["properties"]["address"] == {"$ref": "#/$defs/Address"}
+        assert "definitions" not in actual
+        assert set(actual["$defs"]) == {"Address", "Group"}
+
+    def test_with_references(self) -> None:
+        schema_factory = SchemaFactory(StructuralWalker)
+
+        actual = schema_factory.with_references(COMPONENTS_REFERENCES)
+
+        assert actual is not schema_factory
+        assert actual.references == COMPONENTS_REFERENCES
+        assert schema_factory.references == DEFINITIONS_REFERENCES
+        assert actual.classifier is schema_factory.classifier
+
+    def test_with_references__same(self) -> None:
+        schema_factory = SchemaFactory(StructuralWalker)
+
+        assert schema_factory.with_references(References()) is schema_factory
+
+
+@pytest.mark.parametrize(
+    "params, default, expected",
+    [
+        pytest.param(
+            {"group": 1, "group.name": 2, "group.users.pk": 3, "name": 4},
+            None,
+            {"name": 2, "users.pk": 3},
+            id="dict",
+        ),
+        pytest.param(["group", "group.name", "name"], None, ["name"], id="list"),
+        pytest.param(("group.pk",), None, ["pk"], id="tuple"),
+        pytest.param(None, [], [], id="default"),
+    ],
+)
+def test_get_children(params: Any, default: Optional[list[str]], expected: Any) -> None:
+    """
+    ARRANGE dotted overrides, includes or excludes
+    ACT get the children of a name
+    ASSERT the paths under the name are returned without its prefix
+    """
+    # act
+    actual = get_children("group", params, default=default)
+
+    # assert
+    assert actual == expected
+
+
+class TestCollectionForOverrides:
+    def test_overrides(self) -> None:
+        overrides = CollectionForOverrides({"name": {"maxLength": 10}, "pk": {"type": "string"}})
+        basedict: dict[str, Any] = {"type": "string"}
+
+        overrides.overrides(basedict, "name")
+
+        assert basedict == {"type": "string", "maxLength": 10}
+        assert overrides.not_used_keys == {"pk"}
+
+    def test_overrides__without_key(self) -> None:
+        overrides = CollectionForOverrides({"title": "Name", "format": pop_marker})
+        basedict: dict[str, Any] = {"type": "string", "format": "email"}
+
+        overrides.overrides(basedict)
+
+        assert basedict == {"type": "string", "title": "Name"}
+        assert not overrides.not_used_keys
+
+
+class TestDefinitionsMemo:
+    def test_definition(self, mocker: MockerFixture) -> None:
+        """
+        ARRANGE a memo and a build writing two definitions
+        ACT get the definition of the same key for two root schemas
+        ASSERT the definition is built once
+            AND the definitions written while building it are written in both root schemas
+        """
+        # arrange
+        memo = DefinitionsMemo()
+        overrides = CollectionForOverrides({"name": {"maxLength": 10}})
+        first: dict[str, Any] = {}
+        second: dict[str, Any] = {}
+
+        def build_group() -> dict[str, Any]:
+            definition = {"type": "object"}
+            first.setdefault("definitions", {})["Group"] = definition
+            return definition
+
+        def build() -> dict[str, Any]:
+            overrides.overrides({}, "name")
+            memo.definition((Group,), "Group", first, "definitions", overrides, build_group)
+            definition = {"type": "object"}
+            first["definitions"]["User"] = definition
+            return definition
+
+        spy = mocker.Mock(side_effect=build)
+        key = (User,)
+
+        # act
+        memo.definition(key, "User", first, "definitions", overrides, spy)
+        overrides = CollectionForOverrides({"name": {"maxLength": 10}})
+        actual = memo.definition(key, "User", second, "definitions", overrides, spy)
+
+        # assert
+        assert spy.call_count == 1
+        assert actual == {"type": "object"}
+        assert second == first
+        assert not overrides.not_used_keys
@@ -0,0 +1,243 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+import pytest
+import sqlalchemy as sa
+import sqlalchemy.orm as orm
+from sqlalchemy.orm import declarative_base
+
+from benchmarks.models import ModelGraph, generate_models
+from sqlalchemy_to_json_schema.decisions import UseForeignKeyIfPossibleDecision
+from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.serialization import InstanceSerializer, SerializerPlan
+from sqlalchemy_to_json_schema.validation import ValidatorRegistry
+from sqlalchemy_to_json_schema.walkers import ForeignKeyWalker, StructuralWalker
+from tests.fixtures.models.address import Address
+from tests.fixtures.models.user import Group, User
+
+Base = declarative_base()
+
+tag_post = sa.Table(
+    "tag_post",
+    Base.metadata,
+    sa.Column("tag_id", sa.ForeignKey("tag.id"), primary_key=True),
+    sa.Column("post_id", sa.ForeignKey("post.id"), primary_key=True),
+)
+
+
+class Tag(Base):
+    __tablename__ = "tag"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    label = sa.Column("name", sa.String(16), nullable=False)
+
+
+class Post(Base):
+    __tablename__ = "post"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    tags = orm.relationship(Tag, secondary=tag_post)
+
+
+class DecoratedDate(sa.types.TypeDecorator):
+    impl = sa.Date
+    cache_ok = True
+
+
+class Holiday(Base):
+    __tablename__ = "holiday"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    day = sa.Column(DecoratedDate)
+
+
+class Price(Base):
+    __tablename__ = "price"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    big = sa.Column(sa.BigInteger)
+    price = sa.Column(sa.Numeric(10, 2))
+
+
+def _group() -> Group:
+    address = Address(pk=1, street="4 Privet Drive", town="Little Whinging")
+    group = Group(pk=1, name="gryffindor", color="red", created_at=datetime(2021, 1, 1, 12, 34))
+    group.users = [
+        User(pk=1, name="harry", address=address),
+        User(pk=2, name="ron", address=address, created_at=datetime(2021, 1, 2)),
+    ]
+
+    return group
+
+
+@pytest.mark.parametrize(
+    "walker, options",
+    [
+        pytest.param(StructuralWalker, {}, id="structural"),
+        pytest.param(StructuralWalker, {"depth": 3}, id="depth_3"),
+        pytest.param(StructuralWalker, {"excludes": ["users.address"]}, id="excludes"),
+        pytest.param(StructuralWalker, {"includes": ["name", "users"]}, id="includes"),
+        pytest.param(ForeignKeyWalker, {}, id="foreign_keys"),
+    ],
+)
+def test_serialize__valid(walker: Any, options: dict[str, Any]) -> None:
+    """
+    ARRANGE a group with users and their addresses
+    ACT serialize the group
+    ASSERT the payload has the properties of the schema in the same order
+        AND is valid against the schema
+    """
+    # arrange
+    schema_factory = SchemaFactory(walker)
+    schema = ValidatorRegistry(schema_factory).get_validator(Group, **options).schema
+
+    # act
+    actual = InstanceSerializer(schema_factory).serialize(_group(), **options)
+
+    # assert
+    assert list(actual) == [name for name in schema["properties"] if name in actual]
+    ValidatorRegistry(schema_factory).validate(Group, actual, **options)
+
+
+def test_serialize() -> None:
+    actual = InstanceSerializer(SchemaFactory(StructuralWalker)).serialize(_group(), depth=3)
+
+    assert actual == {
+        "pk": 1,
+        "name": "gryffindor",
+        "color": "red",
+        "created_at": "2021-01-01T12:34:00",
+        "users": [
+            {
+                "pk": 1,
+                "name": "harry",
+                "address": {"pk": 1, "street": "4 Privet Drive", "town": "Little Whinging"},
+            },
+            {
+                "pk": 2,
+                "name": "ron",
+                "created_at": "2021-01-02T00:00:00",
+                "address": {"pk": 1, "street": "4 Privet Drive", "town": "Little Whinging"},
+            },
+        ],
+    }
+
+
+def test_serialize__depth() -> None:
+    serializer = InstanceSerializer(SchemaFactory(StructuralWalker))
+
+    actual = serializer.serialize(_group(), depth=1)
+
+    # The properties of the users are not walked at this depth, like in the schema
+    assert actual["users"] == [{}, {}]
+    assert serializer.get_plan(Group, depth=1)(_group()).keys() == actual.keys()
+
+
+def test_serialize__column_name() -> None:
+    actual = InstanceSerializer(SchemaFactory(StructuralWalker)).serialize(Tag(id=1, label="a"))
+
+    assert actual == {"id": 1, "name": "a"}
+
+
+def test_serialize__decorated_date() -> None:
+    actual = InstanceSerializer(SchemaFactory(StructuralWalker)).serialize(
+        Holiday(id=1, day=date(2024, 1, 1))
+    )
+
+    assert actual == {"id": 1, "day": "2024-01-01"}
+    json.dumps(actual)
+
+
+def test_serialize__schema_types() -> None:
+    schema_factory = SchemaFactory(StructuralWalker)
+
+    actual = InstanceSerializer(schema_factory).serialize(
+        Price(id=1, big=5, price=Decimal("1.50"))
+    )
+
+    # The values follow the types of the schema, not the ones of the columns
+    assert actual == {"id": 1, "big": "5", "price": 1}
+    ValidatorRegistry(schema_factory).validate(Price, actual)
+
+
+@pytest.mark.parametrize(
+    "depth, expected",
+    [
+        pytest.param(
+            None,
+            {
+                "pk": 1,
+                "table1_set": [],
+                "table2_set": [{"pk": 2}],
+                "table3_set": [],
+            },
+            id="unbounded",
+        ),
+        pytest.param(
+            4,
+            {"pk": 1, "table1_set": [], "table2_set": [{}], "table3_set": []},
+            id="depth_4",
+        ),
+    ],
+)
+def test_serialize__cyclic_instances(depth: Optional[int], expected: dict[str, Any]) -> None:
+    """
+    ARRANGE models whose definitions reference each other
+        AND instances referencing each other
+    ACT serialize one of the instances
+    ASSERT the instances are not serialized inside themselves
+    """
+    # arrange
+    table0, _, table2, *_ = generate_models(ModelGraph(tables=5, columns=2, fanout=3, seed=3))
+    instance = table0(pk=1)
+    table2(pk=2, table0=instance)
+
+    # act
+    actual = InstanceSerializer(SchemaFactory(StructuralWalker)).serialize(instance, depth=depth)
+
+    # assert
+    assert actual == expected
+
+
+def test_serialize__many_to_many_foreign_keys() -> None:
+    schema_factory = SchemaFactory(
+        StructuralWalker, relation_decision=UseForeignKeyIfPossibleDecision()
+    )
+    post = Post(id=1, tags=[Tag(id=1, label="a"), Tag(id=2, label="b")])
+
+    actual = InstanceSerializer(schema_factory).serialize(post)
+
+    assert actual == {"id": 1, "tags": ["1", "2"]}
+    ValidatorRegistry(schema_factory).validate(Post, actual)
+
+
+def test_serialize_many() -> None:
+    serializer = InstanceSerializer(SchemaFactory(ForeignKeyWalker))
+    group = _group()
+
+    actual = serializer.serialize_many([group, *group.users])
+
+    assert [sorted(payload) for payload in actual] == [
+        ["color", "created_at", "name", "pk"],
+        ["name", "pk"],
+        ["created_at", "name", "pk"],
+    ]
+
+
+def test_get_plan__cached() -> None:
+    serializer = InstanceSerializer(SchemaFactory(StructuralWalker), maxsize=1)
+
+    actual = serializer.get_plan(Group)
+
+    assert serializer.get_plan(Group) is actual
+    assert serializer.get_plan(User) is not actual
+    assert serializer.get_plan(Group) is not actual
+
+
+def test_from_schema__unknown_property() -> None:
+    schema = {"properties": {"pk": {"type": "integer"}, "nickname": {"type": "string"}}}
+
+    with pytest.raises(ValueError, match="No attribute of Group for nickname"):
+        SerializerPlan.from_schema(sa.inspect(Group), schema)
@@ -0,0 +1,269 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from pytest_mock import MockerFixture
+
+from benchmarks.models import ModelGraph, generate_models
+from sqlalchemy_to_json_schema.exceptions import InvalidStatus
+from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.tables import (
+    AbstractTableWalker,
+    ForeignKeyTableWalker,
+    NoForeignKeyTableWalker,
+    StructuralTableWalker,
+    TableSchemaFactory,
+    get_table_plan,
+)
+from sqlalchemy_to_json_schema.walkers import (
+    AbstractWalker,
+    ForeignKeyWalker,
+    NoForeignKeyWalker,
+)
+from tests.fixtures.models.address import Address
+from tests.fixtures.models.user import Group, User
+
+
+@pytest.fixture(scope="module")
+def metadata() -> sa.MetaData:
+    dbname = Path(__file__).parent.resolve() / "reflection.db"
+    metadata = sa.MetaData()
+    metadata.reflect(sa.create_engine(f"sqlite:///{dbname}"))
+
+    return metadata
+
+
+@pytest.mark.parametrize(
+    "walker, table_walker",
+    [
+        pytest.param(ForeignKeyWalker, ForeignKeyTableWalker, id="foreign_key"),
+        pytest.param(NoForeignKeyWalker, NoForeignKeyTableWalker, id="no_foreign_key"),
+    ],
+)
+@pytest.mark.parametrize("model", [Group, User, Address])
+@pytest.mark.parametrize(
+    "options",
+    [
+        pytest.param({}, id="default"),
+        pytest.param({"excludes": ["pk"]}, id="excludes"),
+        pytest.param({"includes": ["name", "group_id"]}, id="includes"),
+        pytest.param({"overrides": {"name": {"maxLength": 1}}}, id="overrides"),
+    ],
+)
+def test_same_as_orm(
+    walker: type[AbstractWalker],
+    table_walker: type[AbstractTableWalker],
+    model: Any,
+    options: dict[str, Any],
+) -> None:
+    """
+    ARRANGE a mapped model
+    ACT build the schemas of the model and of its table
+    ASSERT they are the same
+    """
+    # arrange
+    schema_factory = SchemaFactory(walker)
+    if "name" not in model.__table__.columns:
+        options = {key: value for key, value in options.items() if key != "overrides"}
+
+    # act
+    actual = TableSchemaFactory(table_walker, schema_factory=schema_factory)(
+        model.__table__, **options
+    )
+
+    # assert
+    assert actual == schema_factory(model, **options)
+
+
+def test_structural(metadata: sa.MetaData) -> None:
+    """
+    ARRANGE the tables of a reflected database
+    ACT build the schemas of the tables
+    ASSERT the foreign keys are references named like the relationships of automap
+    """
+    # arrange
+    target = TableSchemaFactory(StructuralTableWalker)
+
+    # act
+    actual = target.schemas(metadata)
+
+    # assert
+    assert actual == {
+        # Same schemas as the automapped classes in `test_it_reflection`
+        "artist": {
+            "title": "artist",
+            "properties": {
+                "artistid": {"type": "integer"},
+                "artistname": {"type": "string"},
+                "track_collection": {"items": {"$ref": "#/definitions/track"}, "type": "array"},
+            },
+            "definitions": {
+                "track": {
+                    "properties": {
+                        "trackid": {"type": "integer"},
+                        "trackname": {"type": "string"},
+                    },
+                    "required": ["trackid"],
+                    "type": "object",
+                }
+            },
+            "type": "object",
+            "required": ["artistid", "artistname"],
+        },
+        "track": {
+            "title": "track",
+            "properties": {
+                "trackid": {"type": "integer"},
+                "trackname": {"type": "string"},
+                "artist": {"$ref": "#/definitions/artist"},
+            },
+            "definitions": {
+                "artist": {
+                    "properties": {
+                        "artistid": {"type": "integer"},
+                        "artistname": {"type": "string"},
+                    },
+                    "required": ["artistid", "artistname"],
+                    "type": "object",
+                }
+            },
+            "type": "object",
+            "required": ["trackid"],
+        },
+    }
+
+
+def test_structural__depth(metadata: sa.MetaData) -> None:
+    target = TableSchemaFactory(StructuralTableWalker)
+
+    actual = target(metadata.tables["track"], depth=1)
+
+    # The definitions past the depth have no properties but still their required ones
+    assert actual["properties"]["artist"] == {"$ref": "#/definitions/artist"}
+    assert actual["definitions"]["artist"] == {
+        "type": "object",
+        "properties": {},
+        "required": ["artistid", "artistname"],
+    }
+    assert target(metadata.tables["track"], depth=0) == {
+        "title": "track",
+        "type": "object",
+        "properties": {},
+        "required": ["trackid"],
+    }
+
+
+def test_structural__nested_options(metadata: sa.MetaData) -> None:
+    target = TableSchemaFactory(StructuralTableWalker)
+
+    actual = target(
+        metadata.tables["artist"],
+        excludes=["track_collection.trackname"],
+        overrides={"track_collection.trackid": {"type": "string"}},
+    )
+
+    assert actual["definitions"]["track"]["properties"] == {"trackid": {"type": "string"}}
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_structural__built_once_per_key(mocker: MockerFixture, seed: int) -> None:
+    """
+    ARRANGE cyclic tables
+    ACT build the schemas of the tables
+    ASSERT each definition is built once per target, excluded back reference and depth
+    """
+    # arrange
+    models = generate_models(ModelGraph(tables=5, columns=2, fanout=3, seed=seed))
+    metadata = models[0].__table__.metadata
+    references = sum(len(get_table_plan(table).references) for table in metadata.tables.values())
+    target = TableSchemaFactory(StructuralTableWalker)
+    spy = mocker.spy(target, "_build_properties")
+
+    for table in metadata.tables.values():
+        spy.reset_mock()
+
+        # act
+        target(table, depth=6)
+
+        # assert
+        assert spy.call_count <= 1 + references * 6
+
+
+def test_invalid_overrides(metadata: sa.MetaData) -> None:
+    with pytest.raises(InvalidStatus, match="invalid overrides"):
+        TableSchemaFactory(StructuralTableWalker)(
+            metadata.tables["artist"], overrides={"nickname": {"type": "string"}}
+        )
+
+
+def test_table_plan__table_added() -> None:
+    metadata = sa.MetaData()
+    parent = sa.Table("parent", metadata, sa.Column("id", sa.Integer, primary_key=True))
+    assert get_table_plan(parent).references == ()
+
+    sa.Table(
+        "child",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("parent_id", sa.ForeignKey("parent.id")),
+    )
+
+    assert [reference.key for reference in get_table_plan(parent).references] == [
+        "child_collection"
+    ]
+
+
+def test_structural__foreign_keys_to_same_table() -> None:
+    """
+    ARRANGE a table with two foreign keys to the same table
+    ACT build the schemas of the tables
+    ASSERT the references are named after the columns of their foreign keys
+    """
+    # arrange
+    metadata = sa.MetaData()
+    sa.Table("user", metadata, sa.Column("id", sa.Integer, primary_key=True))
+    sa.Table(
+        "doc",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("created_by", sa.ForeignKey("user.id")),
+        sa.Column("updated_by", sa.ForeignKey("user.id")),
+    )
+    target = TableSchemaFactory(StructuralTableWalker)
+
+    # act
+    actual = target.schemas(metadata, depth=1)
+
+    # assert
+    assert actual["doc"]["properties"] == {
+        "id": {"type": "integer"},
+        "created_by_user": {"$ref": "#/definitions/user"},
+        "updated_by_user": {"$ref": "#/definitions/user"},
+    }
+    assert actual["user"]["properties"] == {
+        "id": {"type": "integer"},
+        "doc_created_by_collection": {"type": "array", "items": {"$ref": "#/definitions/doc"}},
+        "doc_updated_by_collection": {"type": "array", "items": {"$ref": "#/definitions/doc"}},
+    }
+
+
+def test_table_plan__conflicting_references() -> None:
+    metadata = sa.MetaData()
+    sa.Table("b_collection", metadata, sa.Column("id", sa.Integer, primary_key=True))
+    # The reference of `a` to `b_collection` is named like the one of `b` to `a`
+    a = sa.Table(
+        "a",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("b_collection_id", sa.ForeignKey("b_collection.id")),
+    )
+    sa.Table(
+        "b",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("a_id", sa.ForeignKey("a.id")),
+    )
+
+    with pytest.raises(InvalidStatus, match="Conflict references"):
+        get_table_plan(a)
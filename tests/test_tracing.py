@@ -0,0 +1,75 @@
+import importlib
+from collections.abc import Iterator
+
+import pytest
+from loguru import logger
+
+from sqlalchemy_to_json_schema import tracing
+from sqlalchemy_to_json_schema.command.transformer import collect_models
+from sqlalchemy_to_json_schema.schema_factory import SchemaFactory
+from sqlalchemy_to_json_schema.walkers import StructuralWalker
+from tests.fixtures.models import user
+from tests.fixtures.models.user import User
+
+
+@pytest.fixture
+def messages() -> Iterator[list[str]]:
+    messages: list[str] = []
+    handler_id = logger.add(lambda message: messages.append(message.record["message"]))
+
+    yield messages
+
+    logger.remove(handler_id)
+
+
+class TestTracing:
+    def test_disabled(self, messages: list[str]) -> None:
+        """
+        ARRANGE tracing disabled
+        ACT generate a schema and collect the models of a module
+        ASSERT nothing is logged from the hot paths
+        """
+        # arrange
+        assert not tracing.enabled
+
+        # act
+        SchemaFactory(StructuralWalker)(User)
+        list(collect_models(user))
+
+        # assert
+        assert not [message for message in messages if "Walking model" in message]
+        assert not [message for message in messages if "is a SQLAlchemy model" in message]
+
+    def test_traced(self, messages: list[str]) -> None:
+        """
+        ARRANGE tracing enabled
+        ACT generate a schema and collect the models of a module
+        ASSERT the hot paths are logged
+            AND tracing is disabled again afterwards
+        """
+        # act
+        with tracing.traced():
+            SchemaFactory(StructuralWalker)(User)
+            list(collect_models(user))
+
+        # assert
+        assert [message for message in messages if "Walking model" in message]
+        assert [message for message in messages if "is a SQLAlchemy model" in message]
+        assert not tracing.enabled
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            pytest.param("1", True, id="enabled"),
+            pytest.param("0", False, id="zero"),
+            pytest.param("", False, id="empty"),
+        ],
+    )
+    def test_env_var(self, monkeypatch: pytest.MonkeyPatch, value: str, expected: bool) -> None:
+        monkeypatch.setenv(tracing.TRACING_ENV_VAR, value)
+
+        try:
+            assert importlib.reload(tracing).enabled is expected
+        finally:
+            monkeypatch.delenv(tracing.TRACING_ENV_VAR)
+            importlib.reload(tracing)
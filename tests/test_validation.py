@@ -0,0 +1,409 @@
+import enum
+from collections.abc import Iterator
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+import pytest
+import sqlalchemy as sa
+import sqlalchemy.orm as orm
+from jsonschema.exceptions import ValidationError
+from pytest_mock import MockerFixture
+from sqlalchemy.orm import Session, declarative_base
+
+from sqlalchemy_to_json_schema.schema_factory import (
+    COMPONENTS_REFERENCES,
+    SchemaFactory,
+)
+from sqlalchemy_to_json_schema.validation import (
+    RowConverter,
+    ValidatorRegistry,
+    get_converter,
+    make_format_checker,
+)
+from sqlalchemy_to_json_schema.walkers import ForeignKeyWalker, StructuralWalker
+from tests.fixtures.models.user import Group, User
+
+Base = declarative_base()
+
+
+class Event(Base):
+    __tablename__ = "event"
+
+    pk = sa.Column(sa.Integer, primary_key=True)
+    day = sa.Column(sa.Date, nullable=False)
+    starts_at = sa.Column(sa.Time)
+
+
+@pytest.fixture
+def registry() -> ValidatorRegistry:
+    return ValidatorRegistry(SchemaFactory(ForeignKeyWalker))
+
+
+class TestValidatorRegistry:
+    def test_get_validator__cached(
+        self, registry: ValidatorRegistry, mocker: MockerFixture
+    ) -> None:
+        """
+        ARRANGE a validator registry
+        ACT get the validator of the same model and options twice
+        ASSERT the schema is built once
+            AND the same validator is returned
+        """
+        # arrange
+        spy = mocker.spy(registry.schema_factory, "_build_schema")
+
+        # act
+        first = registry.get_validator(Group, excludes=["pk"])
+        second = registry.get_validator(Group, excludes=["pk"])
+
+        # assert
+        assert first is second
+        assert spy.call_count == 1
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            pytest.param({"depth": 1}, id="depth"),
+            pytest.param({"includes": ["pk"]}, id="includes"),
+            pytest.param({"excludes": ["pk"]}, id="excludes"),
+            pytest.param({"overrides": {"name": {"maxLength": 10}}}, id="overrides"),
+        ],
+    )
+    def test_get_validator__options(
+        self, registry: ValidatorRegistry, kwargs: dict[str, Any]
+    ) -> None:
+        assert registry.get_validator(Group) is not registry.get_validator(Group, **kwargs)
+
+    def test_get_validator__maxsize(self) -> None:
+        registry = ValidatorRegistry(SchemaFactory(ForeignKeyWalker), maxsize=1)
+
+        first = registry.get_validator(Group)
+        registry.get_validator(User)
+
+        assert registry.get_validator(Group) is not first
+
+    def test_clear(self, registry: ValidatorRegistry) -> None:
+        first = registry.get_validator(Group)
+
+        registry.clear()
+
+        assert registry.get_validator(Group) is not first
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            pytest.param({"pk": 1, "name": "ravenclaw", "color": "blue"}, id="all"),
+            pytest.param({"pk": 1, "name": "ravenclaw"}, id="required"),
+        ],
+    )
+    def test_validate(self, registry: ValidatorRegistry, payload: dict[str, Any]) -> None:
+        registry.validate(Group, payload)
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            pytest.param({"pk": 1, "name": "blackmage", "color": "black"}, id="enum"),
+            pytest.param({"pk": 1}, id="required"),
+            pytest.param({"pk": "1", "name": "ravenclaw"}, id="type"),
+        ],
+    )
+    def test_validate__invalid(self, registry: ValidatorRegistry, payload: dict[str, Any]) -> None:
+        with pytest.raises(ValidationError):
+            registry.validate(Group, payload)
+
+    def test_iter_errors(self, registry: ValidatorRegistry) -> None:
+        errors = list(registry.iter_errors(Group, {"name": 1, "color": "black"}))
+
+        assert sorted(str(error.validator) for error in errors) == ["enum", "required", "type"]
+
+    @pytest.mark.parametrize(
+        "payload, expected",
+        [
+            pytest.param({"pk": 1, "day": "2021-01-01", "starts_at": "12:34"}, [], id="valid"),
+            pytest.param({"pk": 1, "day": "2021-02-29"}, ["format"], id="date"),
+            pytest.param(
+                {"pk": 1, "day": "2021-01-01", "starts_at": "noon"}, ["format"], id="time"
+            ),
+            pytest.param({"pk": 1, "day": 20210101}, ["type"], id="not_a_string"),
+        ],
+    )
+    def test_iter_errors__format(
+        self, registry: ValidatorRegistry, payload: dict[str, Any], expected: list[str]
+    ) -> None:
+        """
+        ARRANGE a model with date and time columns
+        ACT validate a payload
+        ASSERT the dates and times are checked with the package's validators
+        """
+        # act
+        errors = list(registry.iter_errors(Event, payload))
+
+        # assert
+        assert [error.validator for error in errors] == expected
+
+    def test_validate__references(self) -> None:
+        """
+        ARRANGE a registry on a schema factory generating the OpenAPI 3 references
+        ACT validate a payload with a related model
+        ASSERT the references are resolved in the schema itself
+        """
+        # arrange
+        schema_factory = SchemaFactory(StructuralWalker, references=COMPONENTS_REFERENCES)
+        registry = ValidatorRegistry(schema_factory)
+
+        # act / assert
+        with pytest.raises(ValidationError):
+            registry.validate(User, {"pk": 1, "name": "foo", "group": {"pk": "1", "name": "g"}})
+
+
+@pytest.mark.parametrize(
+    "format, instance, expected",
+    [
+        pytest.param("date", "2021-01-01", True, id="date"),
+        pytest.param("date", "2021-13-01", False, id="date_invalid"),
+        pytest.param("date", 1, True, id="date_not_a_string"),
+        pytest.param("time", "12:34:56Z", True, id="time"),
+        pytest.param("time", "noon", False, id="time_invalid"),
+        pytest.param("time", None, True, id="time_not_a_string"),
+    ],
+)
+def test_make_format_checker(format: str, instance: Any, expected: bool) -> None:
+    assert make_format_checker().conforms(instance, format) is expected
+
+
+class Color(enum.Enum):
+    red = 1
+    blue = 2
+
+
+class Item(Base):
+    __tablename__ = "item"
+
+    pk = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(5), nullable=False)
+    color = sa.Column(sa.Enum(Color))
+    size = sa.Column(sa.Enum("small", "large"))
+    day = sa.Column(sa.Date)
+    group_id = sa.Column(sa.Integer, sa.ForeignKey("item_group.pk"))
+    group = orm.relationship("ItemGroup", backref="items")
+
+
+class ItemGroup(Base):
+    __tablename__ = "item_group"
+
+    pk = sa.Column(sa.Integer, primary_key=True)
+
+
+class DecoratedDate(sa.types.TypeDecorator):
+    impl = sa.Date
+    cache_ok = True
+
+
+class Member(Base):
+    __tablename__ = "member"
+
+    pk = sa.Column(sa.Integer, primary_key=True)
+    member_name = sa.Column("name", sa.String(5), nullable=False)
+    joined = sa.Column(DecoratedDate)
+
+
+class Price(Base):
+    __tablename__ = "price"
+
+    pk = sa.Column(sa.Integer, primary_key=True)
+    big = sa.Column(sa.BigInteger)
+    price = sa.Column(sa.Numeric(10, 2))
+    rate = sa.Column(sa.Float)
+
+
+@pytest.fixture
+def session() -> Iterator[Session]:
+    engine = sa.create_engine("sqlite://")
+
+    with engine.begin() as connection:
+        # Without the NOT NULL and CHECK constraints of the model, like a drifted table
+        connection.execute(sa.text("CREATE TABLE item_group (pk INTEGER PRIMARY KEY)"))
+        connection.execute(
+            sa.text(
+                "CREATE TABLE item (pk INTEGER PRIMARY KEY, name VARCHAR, color VARCHAR,"
+                " size VARCHAR, day DATE, group_id INTEGER)"
+            )
+        )
+        connection.execute(
+            sa.text("INSERT INTO item VALUES (:pk, :name, :color, :size, :day, NULL)"),
+            [
+                {"pk": 1, "name": "ok", "color": "red", "size": "small", "day": "2021-01-01"},
+                {"pk": 2, "name": "too long", "color": None, "size": None, "day": None},
+                {"pk": 3, "name": None, "color": "blue", "size": "large", "day": None},
+                {"pk": 4, "name": "nok", "color": None, "size": None, "day": None},
+                {"pk": 5, "name": "ok", "color": "blue", "size": None, "day": "2021-12-31"},
+            ],
+        )
+
+    with Session(engine) as session:
+        yield session
+
+
+class TestIterViolations:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+    def test_select(self, registry: ValidatorRegistry, session: Session, chunk_size: int) -> None:
+        """
+        ARRANGE a table with rows not matching the model
+        ACT validate a select of the model in chunks
+        ASSERT only the invalid rows are yielded with their errors
+        """
+        # act
+        actual = list(
+            registry.iter_violations(
+                Item, sa.select(Item).order_by(Item.pk), session=session, chunk_size=chunk_size
+            )
+        )
+
+        # assert
+        assert [(violation.identity, violation.payload) for violation in actual] == [
+            ((2,), {"pk": 2, "name": "too long"}),
+            ((3,), {"pk": 3, "color": "blue", "size": "large"}),
+        ]
+        assert [[error.validator for error in violation.errors] for violation in actual] == [
+            ["maxLength"],
+            ["required"],
+        ]
+
+    def test_select__overrides(self, registry: ValidatorRegistry, session: Session) -> None:
+        actual = list(
+            registry.iter_violations(
+                Item,
+                sa.select(Item).where(Item.name.is_not(None)),
+                session=session,
+                overrides={"name": {"enum": ["ok", "too long"]}},
+            )
+        )
+
+        assert [violation.identity for violation in actual] == [(2,), (4,)]
+
+    def test_result(self, registry: ValidatorRegistry, session: Session) -> None:
+        result = session.execute(
+            sa.select(Item).where(Item.__table__.c.pk >= 3).execution_options(yield_per=1)
+        )
+
+        actual = list(registry.iter_violations(Item, result))
+
+        assert [violation.identity for violation in actual] == [(3,)]
+
+    def test_select__without_session(self, registry: ValidatorRegistry) -> None:
+        with pytest.raises(ValueError, match="A session is required"):
+            list(registry.iter_violations(Item, sa.select(Item)))
+
+    def test_attribute_keys(self, registry: ValidatorRegistry, session: Session) -> None:
+        """
+        ARRANGE rows of a model whose attributes aren't named like their columns
+            AND a column of a decorated date type
+        ACT validate a select of the model
+        ASSERT the payloads are keyed by the columns with the dates converted
+        """
+        # arrange
+        Member.__table__.create(session.connection())
+        session.add_all(
+            [
+                Member(pk=1, member_name="ok", joined=date(2024, 1, 1)),
+                Member(pk=2, member_name="too long"),
+            ]
+        )
+        session.flush()
+
+        # act
+        actual = list(registry.iter_violations(Member, sa.select(Member), session=session))
+
+        # assert
+        assert [(violation.identity, violation.payload) for violation in actual] == [
+            ((2,), {"pk": 2, "name": "too long"}),
+        ]
+        assert [error.validator for error in actual[0].errors] == ["maxLength"]
+
+    def test_schema_types(self, registry: ValidatorRegistry, session: Session) -> None:
+        """
+        ARRANGE a row of columns whose values aren't of the JSON type of their schema
+        ACT validate a select of the model
+        ASSERT the values are converted to the schema's types and the row is valid
+        """
+        # arrange
+        Price.__table__.create(session.connection())
+        session.add(Price(pk=1, big=5, price=Decimal("1.50"), rate=0.5))
+        session.flush()
+        session.expunge_all()
+
+        # act
+        actual = list(registry.iter_violations(Price, sa.select(Price), session=session))
+
+        # assert
+        assert actual == []
+        assert RowConverter.from_schema(sa.inspect(Price), registry.schema_factory(Price))(
+            session.get(Price, 1)
+        ) == {"pk": 1, "big": "5", "price": 1, "rate": 0.5}
+
+    def test_relationships__not_loaded(self, session: Session) -> None:
+        registry = ValidatorRegistry(SchemaFactory(StructuralWalker))
+
+        actual = list(registry.iter_violations(Item, sa.select(Item), session=session))
+
+        assert all("group" not in violation.payload for violation in actual)
+        assert all("group" not in vars(instance) for instance in session.identity_map.values())
+
+
+@pytest.mark.parametrize(
+    "column_type, value, expected",
+    [
+        pytest.param(sa.Date(), date(2021, 1, 1), "2021-01-01", id="date"),
+        pytest.param(
+            sa.DateTime(), datetime(2021, 1, 1, 12), "2021-01-01T12:00:00", id="datetime"
+        ),
+        pytest.param(sa.Time(), time(12, 34), "12:34:00", id="time"),
+        pytest.param(DecoratedDate(), date(2021, 1, 1), "2021-01-01", id="decorated_date"),
+        pytest.param(sa.Enum(Color), Color.red, "red", id="enum"),
+        pytest.param(sa.Enum("a", "b"), "a", "a", id="enum_strings"),
+        pytest.param(sa.Uuid(), UUID(int=1), "00000000-0000-0000-0000-000000000001", id="uuid"),
+    ],
+)
+def test_get_converter(column_type: sa.types.TypeEngine, value: Any, expected: Any) -> None:
+    converter = get_converter(column_type)
+
+    assert converter is not None
+    assert converter(value) == expected
+
+
+def test_get_converter__none() -> None:
+    assert get_converter(sa.Integer()) is None
+
+
+@pytest.mark.parametrize(
+    "column_type, schema_type, value, expected",
+    [
+        pytest.param(sa.BigInteger(), "string", 5, "5", id="biginteger"),
+        pytest.param(sa.Numeric(10, 2), "integer", Decimal("1.50"), 1, id="numeric_integer"),
+        pytest.param(sa.Numeric(10, 2), "number", Decimal("1.50"), 1.5, id="numeric_number"),
+        pytest.param(sa.Date(), "string", date(2021, 1, 1), "2021-01-01", id="date"),
+    ],
+)
+def test_get_converter__schema_type(
+    column_type: sa.types.TypeEngine, schema_type: str, value: Any, expected: Any
+) -> None:
+    converter = get_converter(column_type, schema_type=schema_type)
+
+    assert converter is not None
+    assert converter(value) == expected
+
+
+@pytest.mark.parametrize(
+    "column_type, schema_type",
+    [
+        pytest.param(sa.String(), "string", id="string"),
+        pytest.param(sa.Integer(), "integer", id="integer"),
+        pytest.param(sa.Float(), "object", id="overridden"),
+    ],
+)
+def test_get_converter__schema_type_none(
+    column_type: sa.types.TypeEngine, schema_type: str
+) -> None:
+    assert get_converter(column_type, schema_type=schema_type) is None
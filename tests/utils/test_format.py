@@ -1,12 +1,15 @@
 from datetime import date, time
-from typing import Optional
+from typing import Callable, Optional
 
 import pytest
 from dateutil import tz
+from pytest_mock import MockerFixture
 
 from sqlalchemy_to_json_schema.utils.format import (
     parse_date,
+    parse_date_with_dateutil,
     parse_time,
+    parse_time_with_dateutil,
     validate_date,
     validate_time,
 )
@@ -128,3 +131,66 @@ def test_validate_time(time_string: str, expected: bool) -> None:
 
     # assert
     assert actual == expected
+
+
+@pytest.mark.parametrize(
+    "date_string",
+    [
+        "2021-01-01",
+        "20210101",
+        "2021-02-29",
+        "2021-0101",
+        "202101-01",
+        "0000-01-01",
+        "2021-01-01T12:34",
+    ],
+)
+def test_parse_date__same_as_dateutil(date_string: str) -> None:
+    assert parse_date(date_string) == parse_date_with_dateutil(date_string)
+
+
+@pytest.mark.parametrize(
+    "time_string",
+    [
+        "12:34",
+        "12:34:56.1",
+        "12:34:56.123456",
+        "12:34:56+0330",
+        "12:34:56-03:30",
+        "12:34:56.789Z-03",
+        "24:00",
+        "12:60",
+        "12:34:60",
+        "12:34 PM",
+    ],
+)
+def test_parse_time__same_as_dateutil(time_string: str) -> None:
+    assert parse_time(time_string) == parse_time_with_dateutil(time_string)
+
+
+@pytest.mark.parametrize(
+    "function, fallback, value",
+    [
+        pytest.param(parse_date, "parse_date_with_dateutil", "2021-01-01", id="date"),
+        pytest.param(parse_date, "parse_date_with_dateutil", "20210101", id="date_basic"),
+        pytest.param(parse_time, "parse_time_with_dateutil", "12:34:56.789Z", id="time"),
+        pytest.param(parse_time, "parse_time_with_dateutil", "12:34:56-03:00", id="time_offset"),
+    ],
+)
+def test_fast_path(
+    mocker: MockerFixture, function: Callable[[str], object], fallback: str, value: str
+) -> None:
+    """
+    ARRANGE a strict ISO 8601 date or time
+    ACT parse it
+    ASSERT dateutil is not used
+    """
+    # arrange
+    mock_fallback = mocker.patch(f"sqlalchemy_to_json_schema.utils.format.{fallback}")
+
+    # act
+    actual = function(value)
+
+    # assert
+    assert actual is not None
+    mock_fallback.assert_not_called()